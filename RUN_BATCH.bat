@@ -0,0 +1,16 @@
+@echo off
+REM APS Batch Runner - every CSV in input\test_feeds (or the folder/glob given as %1)
+setlocal
+set ENGINE_DIR=%~dp0engine
+set TARGET=%~1
+if "%TARGET%"=="" set TARGET=%~dp0input\test_feeds
+
+where py >nul 2>nul
+if %errorlevel%==0 (
+  py "%ENGINE_DIR%\aps_batch.py" "%TARGET%"
+) else (
+  python "%ENGINE_DIR%\aps_batch.py" "%TARGET%"
+)
+echo.
+echo ===== Reports and batch_manifest_*.json are in APS_Market_Intelligence_Live\ =====
+pause
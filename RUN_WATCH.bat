@@ -0,0 +1,12 @@
+@echo off
+REM APS Watch-Folder Runner - processes CSVs as they are dropped into input\
+setlocal
+set ENGINE_DIR=%~dp0engine
+
+where py >nul 2>nul
+if %errorlevel%==0 (
+  py "%ENGINE_DIR%\aps_watch.py" %*
+) else (
+  python "%ENGINE_DIR%\aps_watch.py" %*
+)
+pause
@@ -1,147 +1,352 @@
 # api.py - Zapier Webhook Endpoint for APS Pipeline
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Blueprint, Response, current_app, request, jsonify, send_file
 from pathlib import Path
-import pandas as pd
+import re
 import sys
-import os
 from datetime import datetime
-import tempfile
 
 # Add engine directory to path
 ENGINE_DIR = Path(__file__).parent / "engine"
 sys.path.insert(0, str(ENGINE_DIR))
 
-from aps_normalize import normalize_and_score
-from aps_healthcheck import health_check
-from aps_render import render_pdf
-
-app = Flask(__name__)
+from aps_pipeline import plan_report
+from aps_normalize import SCORING_VERSION
+from aps_feed_config import FEED_TYPES
+from aps_config import RESULT_CACHE_INDEX, RESULT_CACHE_MAX_BYTES
+from aps_config import JOB_WORKERS, JOB_QUEUE_DEPTH, JOB_STATE_DIR
+from aps_config import SCORE_MAX_RECORDS, SCORE_BLOCK_ROWS
+from aps_cache import ResultCache, file_digest, cache_key
+from aps_jobs import JobQueue, QueueFullError, EmptyCSVError, process_job, render_job
+from aps_upload import UploadError, open_upload, score_upload
+from aps_records import RecordsError, parse_records, stream_scores
+from aps_trace import tracing
 
 # Configuration
 OUTPUT_DIR = Path(__file__).parent / "APS_Market_Intelligence_Live"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-TEMP_DIR = Path(tempfile.gettempdir()) / "aps_temp"
-TEMP_DIR.mkdir(parents=True, exist_ok=True)
+api = Blueprint('aps_api', __name__)
+
+def create_app(job_workers=JOB_WORKERS, shared_jobs=False):
+    """
+    Build the API app with its own result cache and job queue (whose worker
+    processes start on the first job, so the app can be created before a
+    server forks). shared_jobs publishes job records to JOB_STATE_DIR so any
+    process of a multi-worker server can answer for any job.
+    """
+    app = Flask(__name__)
+    # Content-addressed cache of finished runs (duplicate uploads / Zapier retries)
+    app.extensions['aps_result_cache'] = ResultCache(RESULT_CACHE_INDEX, RESULT_CACHE_MAX_BYTES)
+    # Local worker pool - processing runs off the request thread
+    app.extensions['aps_job_queue'] = JobQueue(job_workers, JOB_QUEUE_DEPTH,
+                                               state_dir=JOB_STATE_DIR if shared_jobs else None)
+    app.register_blueprint(api)
+    return app
+
+def result_cache():
+    return current_app.extensions['aps_result_cache']
+
+def job_queue():
+    return current_app.extensions['aps_job_queue']
+
+def artifact_files(safe_name, pdfs):
+    """
+    Response 'files' block for one run: 'pdf' is the (first) feed's PDF,
+    'feeds' every PDF by feed type (several when the upload mixes feeds)
+    """
+    feeds = {
+        feed: {
+            "filename": Path(path).name,
+            "path": str(path),
+            "download_url": f"/api/v1/download/pdf/{Path(path).name}"
+        }
+        for feed, path in pdfs.items()
+    }
+    return {
+        "pdf": next(iter(feeds.values())),
+        "feeds": feeds,
+        "scored_csv": {
+            "filename": f"{safe_name}_scored.csv",
+            "path": str(OUTPUT_DIR / f"{safe_name}_scored.csv"),
+            "download_url": f"/api/v1/download/csv/{safe_name}_scored.csv"
+        }
+    }
+
+def run_paths(base_name):
+    """Output names for a new run: (safe_name, scored CSV path, PDF path)"""
+    # Generate unique filename based on timestamp
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    safe_name = f"{base_name}_{timestamp}"
+    return safe_name, OUTPUT_DIR / f"{safe_name}_scored.csv", OUTPUT_DIR / f"{safe_name}_DEMO.pdf"
+
+def cache_result(cache, key, safe_name, scored_csv_path, cleanup=None):
+    """
+    on_done hook for a run's job: cleanup() (if given), then swap the job's
+    PDF paths for download links and cache the result under key
+    """
+    def on_done(job):
+        if cleanup:
+            cleanup()
+        if job['status'] == 'done':
+            result = dict(job['result'])
+            pdfs = result.pop('pdfs')
+            job['result'] = {**result, "files": artifact_files(safe_name, pdfs)}
+            # Timings describe this run only; a cache hit reports none
+            cached = {k: v for k, v in job['result'].items() if k != 'timings'}
+            cache.put(key, cached, [*pdfs.values(), scored_csv_path])
+    return on_done
+
+def start_pipeline(csv_path, base_name, feed_type=None, remove_input=False):
+    """
+    Return a previous run's result when the same bytes were already processed
+    under the same scoring version and feed type; otherwise queue a job that
+    scores, health checks and renders csv_path.
+    
+    Returns:
+    - (cached result dict, None) or (None, job id)
+    """
+    cache = result_cache()  # on_done runs on a pool thread, outside the app context
+    key = cache_key(file_digest(csv_path), SCORING_VERSION, feed_type)
+    cached = cache.get(key)
+    if cached is not None:
+        if remove_input:
+            Path(csv_path).unlink(missing_ok=True)
+        return cached, None
+    
+    safe_name, scored_csv_path, pdf_path = run_paths(base_name)
+    cleanup = (lambda: Path(csv_path).unlink(missing_ok=True)) if remove_input else None
+    
+    try:
+        job_id = job_queue().submit(process_job, csv_path, scored_csv_path, pdf_path, feed_type,
+                                  on_done=cache_result(cache, key, safe_name, scored_csv_path, cleanup))
+    except QueueFullError:
+        if cleanup:
+            cleanup()
+        raise
+    return None, job_id
+
+def start_upload(upload, base_name, feed_type=None, content_hash=None):
+    """
+    Score an upload on the request thread while its body streams in, then
+    return a previous run's result for the same bytes (as start_pipeline) or
+    queue a job that renders its PDFs.
+    
+    With content_hash (the client's SHA-256 of the CSV bytes) a repeat upload
+    is answered from the cache before its body is read. Without it the hash
+    is only known once the whole upload has been read, so a duplicate still
+    costs a full scoring pass. A content_hash that doesn't match the bytes
+    read is rejected before anything is cached under it.
+    
+    Returns:
+    - (cached result dict, None) or (None, job id)
+    """
+    cache = result_cache()
+    if content_hash:
+        cached = cache.get(cache_key(content_hash, SCORING_VERSION, feed_type))
+        if cached is not None:
+            return cached, None
+    
+    safe_name, scored_csv_path, pdf_path = run_paths(base_name)
+    
+    try:
+        with tracing() as trace:
+            hc, report = score_upload(upload, scored_csv_path, plan_report(feed_type=feed_type))
+        late_fields = upload.finish()
+        if 'feed_type' in late_fields:
+            # The file was already split by its feed_type column
+            raise UploadError("Send the 'feed_type' field before the file (or use ?feed_type=)")
+        if report.total_records == 0:
+            raise EmptyCSVError("The uploaded CSV file contains no data")
+        if content_hash and content_hash != upload.hexdigest():
+            raise UploadError(f"sha256 {content_hash} doesn't match the uploaded CSV ({upload.hexdigest()})")
+    except BaseException:
+        scored_csv_path.unlink(missing_ok=True)
+        raise
+    
+    # Another request may have finished the same bytes while this one was scored
+    key = cache_key(upload.hexdigest(), SCORING_VERSION, feed_type)
+    cached = cache.get(key)
+    if cached is not None:
+        scored_csv_path.unlink(missing_ok=True)
+        return cached, None
+    
+    try:
+        job_id = job_queue().submit(render_job, hc, report, pdf_path, feed_type, None, trace.to_dict(),
+                                  on_done=cache_result(cache, key, safe_name, scored_csv_path),
+                                  stages=['render'])
+    except QueueFullError:
+        scored_csv_path.unlink(missing_ok=True)
+        raise
+    return None, job_id
+
+def success_response(result, cached, job_id=None):
+    return jsonify({
+        "status": "success",
+        "message": "CSV processed successfully",
+        "job_id": job_id,
+        **result,
+        "cached": cached,
+        "timestamp": datetime.now().isoformat()
+    }), 200
+
+def failed_response(job):
+    if job['empty_input']:
+        return jsonify({
+            "error": "Empty CSV file",
+            "message": job['error'],
+            "job_id": job['id']
+        }), 400
+    return jsonify({
+        "error": "Processing failed",
+        "message": job['error'],
+        "job_id": job['id'],
+        "timestamp": datetime.now().isoformat()
+    }), 500
+
+def pipeline_response(result, job_id):
+    """
+    Response for start_pipeline(): the cached result, the finished job when
+    the caller asked to wait (?wait=1), or 202 with the job's polling URLs
+    """
+    if result is not None:
+        return success_response(result, cached=True)
+    
+    if request.args.get('wait', '').lower() in ('1', 'true', 'yes'):
+        job = job_queue().wait(job_id)
+        if job['status'] == 'failed':
+            return failed_response(job)
+        return success_response(job['result'], cached=False, job_id=job_id)
+    
+    return jsonify({
+        "status": "queued",
+        "message": "CSV accepted for processing",
+        "job_id": job_id,
+        "status_url": f"/api/v1/jobs/{job_id}",
+        "result_url": f"/api/v1/jobs/{job_id}/result",
+        "timestamp": datetime.now().isoformat()
+    }), 202
+
+def queue_full_response(error):
+    return jsonify({
+        "error": "Queue full",
+        "message": str(error)
+    }), 503
+
+def invalid_upload_response(error):
+    return jsonify({
+        "error": "Invalid upload",
+        "message": str(error)
+    }), 400
+
+def invalid_feed_type(feed_type):
+    """400 response for an unknown feed_type override, else None"""
+    if feed_type and feed_type not in FEED_TYPES:
+        return jsonify({
+            "error": "Invalid feed type",
+            "message": f"feed_type must be one of: {', '.join(FEED_TYPES)}"
+        }), 400
+    return None
+
+def invalid_content_hash(content_hash):
+    """400 response for a sha256 that isn't 64 hex digits, else None"""
+    if content_hash and not re.fullmatch(r'[0-9a-f]{64}', content_hash):
+        return jsonify({
+            "error": "Invalid sha256",
+            "message": "sha256 must be the hex SHA-256 of the CSV bytes (64 hex digits)"
+        }), 400
+    return None
 
 # Health check endpoint
-@app.route('/health', methods=['GET'])
+@api.route('/health', methods=['GET'])
 def health_endpoint():
     """Simple health check"""
     return jsonify({
         "status": "healthy",
         "service": "APS Pipeline API",
+        "result_cache": result_cache().stats(),
+        "jobs": job_queue().stats(),
         "timestamp": datetime.now().isoformat()
     })
 
+# Result cache statistics
+@api.route('/api/v1/cache/stats', methods=['GET'])
+def cache_stats():
+    """Result cache size, hit/miss counters and evictions"""
+    return jsonify(result_cache().stats())
+
 # Main processing endpoint
-@app.route('/api/v1/process', methods=['POST'])
+@api.route('/api/v1/process', methods=['POST'])
 def process_csv():
     """
-    Process uploaded CSV file and return PDF + scored CSV
+    Score an uploaded CSV as it streams in, then queue its PDF render
     
     Expected input:
     - Method: POST
-    - Content-Type: multipart/form-data
-    - Field: 'file' (CSV file)
+    - Content-Type: multipart/form-data with field 'file' (CSV file), or a
+      raw text/csv body (optional query: ?filename=name.csv)
+    - Optional Content-Encoding: gzip
+    - Optional field (before 'file') or query: feed_type; optional query: ?wait=1 to block until done
+    - Optional field (before 'file') or query: sha256 of the CSV bytes (after gzip
+      decoding); a repeat upload is then answered from the cache without scoring it
     
     Returns:
-    - JSON with download links for PDF and CSV
+    - 202 JSON with job id and polling URLs (200 with download links if cached or waited)
     """
     
+    try:
+        # Read the body incrementally (never request.files, which buffers the whole upload)
+        upload = open_upload(request.stream, request.mimetype, request.mimetype_params.get('boundary'),
+                             request.headers.get('Content-Encoding'),
+                             filename=request.args.get('filename', 'upload.csv'))
+    except UploadError as e:
+        return invalid_upload_response(e)
+    
     try:
         # Check if file is present
-        if 'file' not in request.files:
+        if upload.filename is None:
             return jsonify({
                 "error": "No file provided",
                 "message": "Please upload a CSV file using 'file' field"
             }), 400
         
-        file = request.files['file']
-        
         # Check if filename is empty
-        if file.filename == '':
+        if upload.filename == '':
             return jsonify({
                 "error": "No file selected",
                 "message": "Please select a file to upload"
             }), 400
         
         # Check if file is CSV
-        if not file.filename.lower().endswith('.csv'):
+        if not upload.filename.lower().endswith('.csv'):
             return jsonify({
                 "error": "Invalid file type",
                 "message": "Only CSV files are supported"
             }), 400
         
-        # Generate unique filename based on timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        base_name = Path(file.filename).stem
-        safe_name = f"{base_name}_{timestamp}"
-        
-        # Save uploaded file temporarily
-        temp_csv_path = TEMP_DIR / f"{safe_name}.csv"
-        file.save(temp_csv_path)
-        
-        # Read and process CSV
-        df = pd.read_csv(temp_csv_path, dtype=str, keep_default_na=False)
-        
-        if len(df) == 0:
-            return jsonify({
-                "error": "Empty CSV file",
-                "message": "The uploaded CSV file contains no data"
-            }), 400
-        
-        # Normalize and score
-        df = normalize_and_score(df)
-        
-        # Health check
-        hc = health_check(df)
+        feed_type = request.args.get('feed_type') or upload.fields.get('feed_type')
+        error = invalid_feed_type(feed_type)
+        if error:
+            return error
         
-        # Calculate overall quality
-        quality_check = hc.get('18_Overall_Quality', {})
-        quality_status = quality_check.get('status', 'UNKNOWN')
-        quality_score = quality_check.get('value', 'N/A')
+        content_hash = (request.args.get('sha256') or upload.fields.get('sha256') or '').strip().lower() or None
+        error = invalid_content_hash(content_hash)
+        if error:
+            return error
         
-        # Save scored CSV
-        scored_csv_path = OUTPUT_DIR / f"{safe_name}_scored.csv"
-        df.to_csv(scored_csv_path, index=False, encoding='utf-8')
-        
-        # Generate PDF
-        pdf_path = OUTPUT_DIR / f"{safe_name}_DEMO.pdf"
-        render_pdf(df, pdf_path)
-        
-        # Clean up temporary file
-        temp_csv_path.unlink(missing_ok=True)
-        
-        # Prepare response
-        response = {
-            "status": "success",
-            "message": "CSV processed successfully",
-            "input_records": len(df),
-            "quality_status": quality_status,
-            "quality_score": quality_score,
-            "files": {
-                "pdf": {
-                    "filename": f"{safe_name}_DEMO.pdf",
-                    "path": str(pdf_path),
-                    "download_url": f"/api/v1/download/pdf/{safe_name}_DEMO.pdf"
-                },
-                "scored_csv": {
-                    "filename": f"{safe_name}_scored.csv",
-                    "path": str(scored_csv_path),
-                    "download_url": f"/api/v1/download/csv/{safe_name}_scored.csv"
-                }
-            },
-            "health_check_summary": {
-                "total_checks": len(hc),
-                "passed": sum(1 for c in hc.values() if c.get('status') == 'PASS'),
-                "warnings": sum(1 for c in hc.values() if c.get('status') == 'WARN'),
-                "failed": sum(1 for c in hc.values() if c.get('status') == 'FAIL')
-            },
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        return jsonify(response), 200
+        result, job_id = start_upload(upload, Path(upload.filename).stem, feed_type, content_hash)
+        return pipeline_response(result, job_id)
+    
+    except UploadError as e:
+        return invalid_upload_response(e)
+    
+    except EmptyCSVError as e:
+        return jsonify({
+            "error": "Empty CSV file",
+            "message": str(e)
+        }), 400
+    
+    except QueueFullError as e:
+        return queue_full_response(e)
     
     except Exception as e:
         return jsonify({
@@ -149,9 +354,45 @@ def process_csv():
             "message": str(e),
             "timestamp": datetime.now().isoformat()
         }), 500
+    
+    finally:
+        upload.close()
+
+# Record scoring endpoint (no report)
+@api.route('/api/v1/score', methods=['POST'])
+def score_records_endpoint():
+    """
+    Score JSON records: APS score, tier and CCI only (no health check, scored
+    CSV or PDF)
+    
+    Expected input:
+    - Method: POST
+    - Content-Type: application/json (a list of records, or {"records": [...]})
+      or application/x-ndjson (one record per line)
+    - Record keys: vendor column names, resolved through the alias map as for CSVs
+    
+    Returns:
+    - 200 NDJSON: {"row", "aps_score", "aps_tier", "cci"} per record, in input order
+    """
+    try:
+        records = parse_records(request.get_data(cache=False), request.mimetype)
+    except RecordsError as e:
+        return jsonify({
+            "error": "Invalid records",
+            "message": str(e)
+        }), 400
+    
+    if len(records) > SCORE_MAX_RECORDS:
+        return jsonify({
+            "error": "Too many records",
+            "message": f"At most {SCORE_MAX_RECORDS:,} records per request"
+        }), 413
+    
+    return Response(stream_scores(records, SCORE_BLOCK_ROWS), mimetype='application/x-ndjson',
+                    headers={"X-Scoring-Version": SCORING_VERSION})
 
 # Download PDF endpoint
-@app.route('/api/v1/download/pdf/<filename>', methods=['GET'])
+@api.route('/api/v1/download/pdf/<filename>', methods=['GET'])
 def download_pdf(filename):
     """Download generated PDF file"""
     try:
@@ -177,7 +418,7 @@ def download_pdf(filename):
         }), 500
 
 # Download CSV endpoint
-@app.route('/api/v1/download/csv/<filename>', methods=['GET'])
+@api.route('/api/v1/download/csv/<filename>', methods=['GET'])
 def download_csv(filename):
     """Download scored CSV file"""
     try:
@@ -203,7 +444,7 @@ def download_csv(filename):
         }), 500
 
 # Process by file path (for Zapier file path trigger)
-@app.route('/api/v1/process-path', methods=['POST'])
+@api.route('/api/v1/process-path', methods=['POST'])
 def process_by_path():
     """
     Process CSV file by providing file path
@@ -211,10 +452,10 @@ def process_by_path():
     Expected input:
     - Method: POST
     - Content-Type: application/json
-    - Body: {"csv_path": "/path/to/file.csv"}
+    - Body: {"csv_path": "/path/to/file.csv", "feed_type": optional}
     
     Returns:
-    - JSON with download links
+    - 202 JSON with job id (200 with download links if cached or ?wait=1)
     """
     
     try:
@@ -234,44 +475,17 @@ def process_by_path():
                 "message": f"CSV file not found at: {csv_path}"
             }), 404
         
-        # Process CSV
-        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
-        df = normalize_and_score(df)
-        hc = health_check(df)
-        
-        # Generate output files
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        base_name = csv_path.stem
-        safe_name = f"{base_name}_{timestamp}"
-        
-        scored_csv_path = OUTPUT_DIR / f"{safe_name}_scored.csv"
-        df.to_csv(scored_csv_path, index=False, encoding='utf-8')
+        feed_type = data.get('feed_type')
+        error = invalid_feed_type(feed_type)
+        if error:
+            return error
         
-        pdf_path = OUTPUT_DIR / f"{safe_name}_DEMO.pdf"
-        render_pdf(df, pdf_path)
-        
-        quality_check = hc.get('18_Overall_Quality', {})
-        
-        return jsonify({
-            "status": "success",
-            "message": "CSV processed successfully",
-            "input_records": len(df),
-            "quality_status": quality_check.get('status', 'UNKNOWN'),
-            "quality_score": quality_check.get('value', 'N/A'),
-            "files": {
-                "pdf": {
-                    "filename": f"{safe_name}_DEMO.pdf",
-                    "path": str(pdf_path),
-                    "download_url": f"/api/v1/download/pdf/{safe_name}_DEMO.pdf"
-                },
-                "scored_csv": {
-                    "filename": f"{safe_name}_scored.csv",
-                    "path": str(scored_csv_path),
-                    "download_url": f"/api/v1/download/csv/{safe_name}_scored.csv"
-                }
-            },
-            "timestamp": datetime.now().isoformat()
-        }), 200
+        # Process CSV in the background (identical content is served from cache)
+        result, job_id = start_pipeline(csv_path, csv_path.stem, feed_type)
+        return pipeline_response(result, job_id)
+    
+    except QueueFullError as e:
+        return queue_full_response(e)
     
     except Exception as e:
         return jsonify({
@@ -279,21 +493,55 @@ def process_by_path():
             "message": str(e)
         }), 500
 
+# Job status endpoint
+@api.route('/api/v1/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Job state (queued/running/done/failed) with per-stage progress"""
+    status = job_queue().status(job_id)
+    if status is None:
+        return jsonify({
+            "error": "Job not found",
+            "message": f"No job with id '{job_id}'"
+        }), 404
+    return jsonify(status), 200
+
+# Job result endpoint
+@api.route('/api/v1/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """Download links and health check summary once a job is done"""
+    status = job_queue().status(job_id)
+    if status is None:
+        return jsonify({
+            "error": "Job not found",
+            "message": f"No job with id '{job_id}'"
+        }), 404
+    
+    if status['status'] == 'failed':
+        return failed_response(job_queue().get(job_id))
+    
+    if status['status'] != 'done':
+        return jsonify(status), 202
+    
+    return success_response(job_queue().get(job_id)['result'], cached=False, job_id=job_id)
+
 # Error handlers
-@app.errorhandler(404)
+@api.app_errorhandler(404)
 def not_found(error):
     return jsonify({
         "error": "Not found",
         "message": "The requested endpoint does not exist"
     }), 404
 
-@app.errorhandler(500)
+@api.app_errorhandler(500)
 def internal_error(error):
     return jsonify({
         "error": "Internal server error",
         "message": "An unexpected error occurred"
     }), 500
 
+# Default app (development server below, Flask test client); serve.py builds its own
+app = create_app()
+
 # Run server
 if __name__ == '__main__':
     print("=" * 60)
@@ -301,11 +549,16 @@ if __name__ == '__main__':
     print("=" * 60)
     print("\nAvailable Endpoints:")
     print("  GET  /health                    - Health check")
+    print("  GET  /api/v1/cache/stats        - Result cache statistics")
     print("  POST /api/v1/process            - Upload & process CSV")
     print("  POST /api/v1/process-path       - Process CSV by file path")
+    print("  POST /api/v1/score              - Score JSON/NDJSON records (no PDF)")
+    print("  GET  /api/v1/jobs/<id>          - Job status and stage progress")
+    print("  GET  /api/v1/jobs/<id>/result   - Job result (download links)")
     print("  GET  /api/v1/download/pdf/<fn>  - Download PDF")
     print("  GET  /api/v1/download/csv/<fn>  - Download CSV")
     print("\nServer running on: http://localhost:5000")
+    print("Development server - for production use: python serve.py")
     print("=" * 60)
     
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
@@ -0,0 +1,21 @@
+# benchmarks - Synthetic feed generator and stage benchmarks
+"""
+APS Market Intelligence - Benchmarks
+- benchmarks.generate: vectorized synthetic vendor feeds (10K-10M rows, every feed type)
+- benchmarks.bench: repeatable per-stage / API benchmarks with JSON results
+
+Run from the repository root, e.g.
+    python -m benchmarks.generate --rows 1000000 --feed core_equity
+    python -m benchmarks.bench run --rows 100000
+    python -m benchmarks.bench compare old.json new.json
+"""
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BENCH_DIR = Path(__file__).resolve().parent
+DATA_DIR = BENCH_DIR / "data"
+RESULTS_DIR = BENCH_DIR / "results"
+
+# Engine modules import each other by bare name, as in api.py
+sys.path.insert(0, str(ROOT_DIR / "engine"))
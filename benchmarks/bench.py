@@ -0,0 +1,261 @@
+# bench.py - Repeatable per-stage and API benchmarks
+"""
+Times each pipeline stage on generated feeds and writes the results as JSON
+so runs can be compared across commits:
+
+    python -m benchmarks.bench run --rows 10000 100000 [--feed core_equity] [--repeat 5]
+    python -m benchmarks.bench compare results/old.json results/new.json
+
+Every benchmark gets one untimed warm-up call, then --repeat timed calls.
+Set-up (copying the input frame, clearing the in-memory figure cache) is not
+timed. API benchmarks go through Flask's test client, so they include request
+parsing, the job queue and the worker process but no network.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from benchmarks import ROOT_DIR, RESULTS_DIR
+from benchmarks.generate import write_feed
+from aps_feed_config import FEED_TYPES
+from aps_ingest import read_projected
+from aps_normalize import normalize_batch, SCORING_VERSION
+from aps_healthcheck import health_check
+from aps_aggregate import ReportAccumulator
+from aps_render import render_pdf
+from aps_charts import figure_cache
+from aps_config import SCORE_MAX_RECORDS
+
+STAGES = ['read_csv', 'normalize_and_score', 'health_check', 'aggregate', 'render_pdf']
+API_BENCHMARKS = ['api_health', 'api_process', 'api_process_cached', 'api_score']
+
+class Benchmark:
+    """run(state) is timed; setup(state) runs untimed before each call and returns the argument"""
+
+    def __init__(self, name, run, setup=None):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda state: state)
+
+    def measure(self, state, repeat):
+        seconds = []
+        for i in range(repeat + 1):
+            arg = self.setup(state)
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                self.run(arg)
+                elapsed = time.perf_counter() - start
+            if i:  # first call is the warm-up
+                seconds.append(elapsed)
+        return seconds
+
+def stage_benchmarks(out_dir):
+    def render(state):
+        render_pdf(None, out_dir / "bench_DEMO.pdf", report=state['report'], feed_type=state['feed_type'])
+
+    def cold_figures(state):
+        figure_cache.clear()
+        return state
+
+    return [
+        Benchmark('read_csv', lambda state: read_projected(state['csv_path'])),
+        # normalize adds columns to its input, so each call gets a fresh copy
+        Benchmark('normalize_and_score', normalize_batch, setup=lambda state: state['frame'].copy()),
+        Benchmark('health_check', lambda state: health_check(state['batch'])),
+        Benchmark('aggregate', lambda state: ReportAccumulator.from_frame(state['batch'])),
+        Benchmark('render_pdf', render, setup=cold_figures),
+    ]
+
+class ApiClient:
+    """Flask test client over api.py; removes the artifacts each request produced"""
+
+    def __init__(self):
+        import api
+        self.client = api.app.test_client()
+        self.produced = []
+
+    def health(self, _):
+        assert self.client.get('/health').status_code == 200
+
+    def process(self, body, expect_cached=None):
+        response = self.client.post('/api/v1/process?wait=1',
+                                    data={'file': (io.BytesIO(body), 'bench_feed.csv')})
+        result = response.get_json()
+        if response.status_code != 200:
+            raise RuntimeError(f"API returned {response.status_code}: {result}")
+        if expect_cached is not None and result['cached'] != expect_cached:
+            raise RuntimeError(f"Expected cached={expect_cached}, got {result['cached']}")
+        files = result['files']
+        self.produced.extend(Path(f['path']) for f in [files['scored_csv'], *files['feeds'].values()])
+
+    def score(self, body):
+        response = self.client.post('/api/v1/score', data=body, content_type='application/x-ndjson')
+        if response.status_code != 200:
+            raise RuntimeError(f"API returned {response.status_code}: {response.get_json()}")
+        response.get_data()  # drain the NDJSON stream
+    
+    def cleanup(self):
+        for path in self.produced:
+            path.unlink(missing_ok=True)
+        self.produced = []
+
+def api_benchmarks(client):
+    counter = iter(range(1, 1_000_000))
+    primed = []
+
+    def fresh_upload(state):
+        # Trailing blank lines change the content hash (no result cache hit) but not the data
+        return state['body'] + b"\n" * next(counter)
+
+    def cached_upload(state):
+        if not primed:
+            client.process(state['body'])
+            primed.append(True)
+        return state['body']
+
+    def score_body(state):
+        # The feed's records as NDJSON, built once (untimed)
+        if 'ndjson' not in state:
+            frame = pd.read_csv(state['csv_path'], dtype=str, keep_default_na=False, nrows=SCORE_MAX_RECORDS)
+            state['ndjson'] = frame.to_json(orient='records', lines=True).encode()
+        return state['ndjson']
+
+    return [
+        Benchmark('api_health', client.health),
+        Benchmark('api_process', lambda body: client.process(body, expect_cached=False), setup=fresh_upload),
+        Benchmark('api_process_cached', lambda body: client.process(body, expect_cached=True),
+                  setup=cached_upload),
+        Benchmark('api_score', client.score, setup=score_body),
+    ]
+
+def summarize(name, feed_type, rows, seconds):
+    median = statistics.median(seconds)
+    return {
+        "benchmark": name,
+        "feed_type": feed_type,
+        "rows": rows,
+        "repeat": len(seconds),
+        "seconds": {
+            "min": round(min(seconds), 6),
+            "median": round(median, 6),
+            "mean": round(statistics.fmean(seconds), 6),
+            "stdev": round(statistics.stdev(seconds), 6) if len(seconds) > 1 else 0.0
+        },
+        "rows_per_s": round(rows / median) if median > 0 else None
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(rows_list, feeds, repeat, seed=0, only=None, with_api=True):
+    """Run the benchmarks and return the results document"""
+    results = []
+    client = ApiClient() if with_api else None
+    with tempfile.TemporaryDirectory() as tmp:
+        stages = stage_benchmarks(Path(tmp))
+        try:
+            for rows in rows_list:
+                for feed_type in feeds:
+                    csv_path = write_feed(rows, feed_type, seed)
+                    frame = read_projected(csv_path)
+                    batch = normalize_batch(frame.copy())
+                    state = {
+                        'csv_path': csv_path,
+                        'frame': frame,
+                        'batch': batch,
+                        'report': ReportAccumulator.from_frame(batch),
+                        'feed_type': feed_type,
+                        'body': csv_path.read_bytes()
+                    }
+                    benchmarks = stages + (api_benchmarks(client) if client else [])
+                    for bench in benchmarks:
+                        if only and bench.name not in only:
+                            continue
+                        entry = summarize(bench.name, feed_type, rows, bench.measure(state, repeat))
+                        results.append(entry)
+                        print(f" {bench.name:<22} {feed_type:<24} {rows:>10,}  "
+                              f"median {entry['seconds']['median']:>9.4f}s  {entry['rows_per_s'] or 0:>12,} rows/s")
+                    if client:
+                        client.cleanup()
+        finally:
+            if client:
+                client.cleanup()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "scoring_version": SCORING_VERSION,
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__
+        },
+        "params": {"rows": rows_list, "feeds": feeds, "repeat": repeat, "seed": seed},
+        "results": results
+    }
+
+def compare(old_path, new_path):
+    """Print median time old -> new per benchmark/feed/rows"""
+    with open(old_path, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)
+
+    key = lambda r: (r['benchmark'], r['feed_type'], r['rows'])
+    before = {key(r): r for r in old['results']}
+    print(f" {old.get('commit', '?')[:10]} -> {new.get('commit', '?')[:10]}")
+    for r in new['results']:
+        prior = before.get(key(r))
+        if prior is None:
+            continue
+        a, b = prior['seconds']['median'], r['seconds']['median']
+        change = f"{b / a:>6.2f}x" if a else "   n/a"
+        print(f" {r['benchmark']:<22} {r['feed_type']:<24} {r['rows']:>10,}  {a:>9.4f}s -> {b:>9.4f}s  {change}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="APS pipeline benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Run benchmarks and write a JSON results file")
+    run_parser.add_argument("--rows", type=int, nargs='+', default=[10_000])
+    run_parser.add_argument("--feed", nargs='+', default=list(FEED_TYPES), choices=list(FEED_TYPES))
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--only", nargs='+', choices=STAGES + API_BENCHMARKS,
+                            help="Run just these benchmarks")
+    run_parser.add_argument("--no-api", dest="with_api", action="store_false",
+                            help="Skip the API benchmarks")
+    run_parser.add_argument("--output", default=None,
+                            help="Results path (default: benchmarks/results/<timestamp>_<commit>.json)")
+
+    compare_parser = sub.add_parser("compare", help="Compare two results files")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        compare(args.old, args.new)
+    else:
+        document = run(args.rows, args.feed, args.repeat, args.seed, args.only, args.with_api)
+        commit = (document['commit'] or 'nocommit')[:10]
+        output = Path(args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"✓ Wrote results -> {output}")
@@ -0,0 +1,186 @@
+# generate.py - Vectorized synthetic vendor feeds for load testing
+"""
+Builds feeds column-wise with NumPy instead of row by row, so 10M rows take
+seconds per block rather than hours. Feeds look like real vendor drops:
+- ZIP codes are 5-digit strings (leading zeros included) with a skewed,
+  Zipf-like density; each ZIP belongs to one city and each city to one state
+- values are a mix of plain numbers, "$1,234,567" and "123456.00", with a few blanks
+- loan dates use one dominant layout per file plus every other layout the
+  date parser knows, with a few blanks
+- each feed type gets its own loan-age / LTV profile; lender_engagement
+  feeds carry Servicer_Name
+
+Large files are written in BLOCK_ROWS blocks, each from its own seed, so the
+same (rows, feed, seed) always gives byte-identical output.
+"""
+import argparse
+import numpy as np
+import pandas as pd
+from benchmarks import DATA_DIR
+from aps_feed_config import FEED_TYPES
+from aps_normalize import DATE_FORMATS
+
+BLOCK_ROWS = 1_000_000
+MESSY_SHARE = 0.3      # values written as "$1,234" or "1234.00" instead of plain digits
+BLANK_SHARE = 0.01     # blank value / date cells
+OTHER_DATE_SHARE = 0.15  # dates not in the file's dominant layout
+# Loan dates count back from a fixed day so a seed always gives the same bytes
+ANCHOR_DATE = pd.Timestamp('2025-10-01')
+
+# Loan age (months) and LTV ranges per feed type, so each exercises its own tiers and pages
+FEED_PROFILES = {
+    'core_equity': {'age': (18, 72), 'ltv': (0.25, 0.80)},
+    'transactional_momentum': {'age': (1, 36), 'ltv': (0.40, 0.95)},
+    'predictive_churn': {'age': (12, 180), 'ltv': (0.10, 0.90)},
+    'market_activity': {'age': (1, 120), 'ltv': (0.20, 0.95)},
+    'lender_engagement': {'age': (6, 96), 'ltv': (0.30, 0.90)},
+}
+DEFAULT_PROFILE = {'age': (1, 240), 'ltv': (0.05, 0.95)}
+
+STATES = ['NC', 'SC', 'VA', 'GA', 'FL', 'TX', 'CA', 'NY', 'OH', 'PA', 'IL', 'AZ', 'CO', 'WA', 'TN']
+CITY_STEMS = ['Oak', 'Cedar', 'Maple', 'Pine', 'Spring', 'River', 'Lake', 'Fair',
+              'Green', 'Clear', 'Rock', 'Elm', 'Glen', 'Bay', 'Ash', 'High']
+CITY_ENDINGS = ['field', 'ville', 'ton', 'wood', 'dale', 'port', 'brook', 'view',
+                'mont', 'ridge', 'burg', 'haven']
+STREETS = ['Main St', 'Oak Ave', 'Pine Rd', 'Maple Dr', 'Cedar Ln', 'Park Blvd', 'Lake Way',
+           'Hill Ct', 'Church St', 'Mill Rd', 'Elm St', 'Spring St', 'River Rd', 'Sunset Dr']
+SERVICERS = ['Rocket Mortgage', 'Wells Fargo', 'Chase', 'Bank of America', 'PennyMac',
+             'Mr. Cooper', 'Freedom Mortgage', 'loanDepot', 'U.S. Bank', 'Truist']
+
+def feed_filename(feed_type, rows, seed):
+    return f"{feed_type}_{rows}_s{seed}.csv"
+
+def build_geography(rows, rng):
+    """
+    ZIP table for a file of this size: roughly 2*sqrt(rows) ZIPs (25 - 40,000),
+    about four per city, with Zipf-like row weights
+    """
+    n_zips = int(np.clip(2 * np.sqrt(rows), 25, 40_000))
+    n_cities = max(5, n_zips // 4)
+
+    names = [f"{a}{b}" for b in CITY_ENDINGS for a in CITY_STEMS]
+    cities = np.array([names[k % len(names)] + ('' if k < len(names) else f" {k // len(names) + 1}")
+                       for k in range(n_cities)], dtype=object)
+    city_states = rng.choice(np.array(STATES, dtype=object), n_cities)
+
+    zips = pd.Series(rng.choice(np.arange(1_000, 100_000), n_zips, replace=False)).astype(str).str.zfill(5)
+    zip_city = rng.integers(0, n_cities, n_zips)
+    weights = 1.0 / np.arange(1, n_zips + 1) ** 0.8
+    return {
+        'zip': zips.to_numpy(dtype=object),
+        'city': cities[zip_city],
+        'state': city_states[zip_city],
+        'weights': weights / weights.sum(),
+    }
+
+def messy_amounts(values, rng):
+    """Whole-dollar amounts as strings: mostly plain, some "$1,234,567" / "1234567.00", a few blank"""
+    out = pd.Series(values).astype(str)
+    style = rng.random(len(values))
+
+    dollars = style < MESSY_SHARE / 2
+    if dollars.any():
+        v = values[dollars]
+        millions, rest = np.divmod(v, 1_000_000)
+        thousands, units = np.divmod(rest, 1_000)
+        units = pd.Series(units).astype(str).str.zfill(3)
+        small = pd.Series(thousands).astype(str) + ',' + units
+        large = (pd.Series(millions).astype(str) + ',' +
+                 pd.Series(thousands).astype(str).str.zfill(3) + ',' + units)
+        text = np.where(millions > 0, large, np.where(thousands > 0, small, pd.Series(v).astype(str)))
+        out[dollars] = ('$' + pd.Series(text)).to_numpy()
+
+    decimals = (style >= MESSY_SHARE / 2) & (style < MESSY_SHARE)
+    out[decimals] = out[decimals] + '.00'
+    out[style > 1 - BLANK_SHARE] = ''
+    return out.to_numpy(dtype=object)
+
+def loan_dates(n, profile, dominant, rng, today):
+    """Date strings: dominant layout for most rows, any other known layout for the rest"""
+    lo, hi = profile['age']
+    days = rng.integers(int(lo * 30.44), int(hi * 30.44) + 1, n)
+    unique_days, inverse = np.unique(days, return_inverse=True)
+    dates = pd.DatetimeIndex(today - pd.to_timedelta(unique_days, unit='D'))
+
+    # Each distinct date formatted once per layout, then gathered per row
+    table = np.array([dates.strftime(fmt).to_numpy(dtype=object) for fmt in DATE_FORMATS], dtype=object)
+    layout = np.full(n, DATE_FORMATS.index(dominant))
+    other = rng.random(n) < OTHER_DATE_SHARE
+    layout[other] = rng.integers(0, len(DATE_FORMATS), int(other.sum()))
+    out = table[layout, inverse]
+    out[rng.random(n) < BLANK_SHARE] = ''
+    return out
+
+def generate_block(start, n, feed_type, geography, rng, today=None, dominant='%m/%d/%Y'):
+    """Rows start .. start+n-1 of a feed as a DataFrame of strings (vendor column names)"""
+    today = today or ANCHOR_DATE
+    profile = FEED_PROFILES.get(feed_type, DEFAULT_PROFILE)
+    ids = np.arange(start, start + n)
+
+    where = rng.choice(len(geography['zip']), n, p=geography['weights'])
+    house = rng.integers(1, 9_999, n).astype(str).astype(object)
+    streets = np.array(STREETS, dtype=object)
+    address = house + ' ' + streets[rng.integers(0, len(streets), n)]
+    # About one in five owners is absentee and gets mail elsewhere
+    absentee = rng.random(n) < 0.2
+    mail = address.copy()
+    mail[absentee] = (rng.integers(1, 9_999, int(absentee.sum())).astype(str).astype(object) + ' '
+                      + streets[rng.integers(0, len(streets), int(absentee.sum()))])
+
+    value = np.round(rng.lognormal(np.log(350_000), 0.45, n), -3).astype('int64')
+    ltv_lo, ltv_hi = profile['ltv']
+    balance = (value * rng.uniform(ltv_lo, ltv_hi, n)).astype('int64')
+
+    frame = pd.DataFrame({
+        'Owner Name': 'Owner ' + pd.Series(ids + 1).astype(str),
+        'Mail Address': mail,
+        'Property Address': address,
+        'City': geography['city'][where],
+        'State': geography['state'][where],
+        'ZIP': geography['zip'][where],
+        'EstValue': messy_amounts(value, rng),
+        'TotalLoanBal': messy_amounts(balance, rng),
+        'LastLoanDate': loan_dates(n, profile, dominant, rng, today),
+    })
+    if feed_type == 'lender_engagement':
+        frame['Servicer_Name'] = np.array(SERVICERS, dtype=object)[rng.integers(0, len(SERVICERS), n)]
+    frame['feed_type'] = feed_type
+    return frame
+
+def generate_feed(rows, feed_type, seed=0, today=None):
+    """Whole feed in memory (use write_feed for large files)"""
+    return pd.concat(list(iter_blocks(rows, feed_type, seed, today)), ignore_index=True)
+
+def iter_blocks(rows, feed_type, seed=0, today=None, block_rows=BLOCK_ROWS):
+    seeds = np.random.SeedSequence([seed, rows, sorted(FEED_TYPES).index(feed_type) if feed_type in FEED_TYPES else 99])
+    geo_seed, date_seed, *block_seeds = seeds.spawn(2 + -(-rows // block_rows))
+    geography = build_geography(rows, np.random.default_rng(geo_seed))
+    dominant = np.random.default_rng(date_seed).choice(DATE_FORMATS[:3])  # files are mostly US or ISO dated
+    for i, start in enumerate(range(0, rows, block_rows)):
+        n = min(block_rows, rows - start)
+        yield generate_block(start, n, feed_type, geography, np.random.default_rng(block_seeds[i]), today, dominant)
+
+def write_feed(rows, feed_type, seed=0, path=None, today=None):
+    """Write a feed block by block (bounded memory) and return its path; existing files are reused"""
+    path = path or DATA_DIR / feed_filename(feed_type, rows, seed)
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    for i, block in enumerate(iter_blocks(rows, feed_type, seed, today)):
+        block.to_csv(tmp_path, mode='a' if i else 'w', header=not i, index=False, encoding='utf-8')
+    tmp_path.replace(path)
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic APS vendor feeds")
+    parser.add_argument("--rows", type=int, nargs='+', default=[10_000],
+                        help="Row counts to generate (default: 10000)")
+    parser.add_argument("--feed", nargs='+', default=list(FEED_TYPES), choices=list(FEED_TYPES),
+                        help="Feed types (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        for feed_type in args.feed:
+            print(f"✓ {write_feed(rows, feed_type, args.seed)}")
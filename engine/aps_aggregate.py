@@ -0,0 +1,558 @@
+# aps_aggregate.py - Mergeable aggregates for chunked (streaming) runs
+"""
+APS Market Intelligence - Mergeable Aggregates
+Every accumulator here supports update(chunk) and merge(other), so a report
+can be built from one in-memory frame, from CSV chunks, or from partial
+results computed in parallel - with memory bounded by the aggregates, not rows.
+"""
+import numpy as np
+import pandas as pd
+from aps_normalize import as_record_batch, TIER_LABELS, TIER_DEFAULT
+
+# ==================== COUNT HELPERS ====================
+
+def merge_counts(left, right):
+    """
+    Add two value->count Series (or value->columns of counts DataFrames),
+    keeping first-appearance order (the order value_counts(sort=False)
+    would give on the concatenated data)
+    """
+    if left is None:
+        return None if right is None else right.copy()
+    if right is None or len(right) == 0:
+        return left
+
+    new_keys = right.index[~right.index.isin(left.index)]
+    merged = left.reindex(left.index.append(new_keys), fill_value=0)
+    merged.loc[right.index] = merged.loc[right.index].to_numpy() + right.to_numpy()
+    return merged
+
+def plain_index(series):
+    """Drop a CategoricalIndex to plain values so partial results from chunks merge cleanly"""
+    if isinstance(series.index, pd.CategoricalIndex):
+        series.index = series.index.astype(object)
+    return series
+
+def category_counts(values):
+    """
+    value_counts(sort=False) of a categorical in first-appearance order, as an
+    object column would give it, counted on the codes (unobserved categories dropped)
+    """
+    codes = values.cat.codes.to_numpy()
+    codes = codes[codes >= 0]
+    order = pd.unique(codes)
+    counts = np.bincount(codes, minlength=len(values.cat.categories))[order]
+    return pd.Series(counts, index=values.cat.categories.take(order).astype(object), name='count')
+
+def top_value(counts):
+    """Most frequent value, smallest value on ties (same as Series.mode()[0])"""
+    if counts is None or len(counts) == 0:
+        return None
+    winners = counts[counts == counts.max()].index
+    return sorted(winners)[0]
+
+# ==================== QUANTILE SKETCH ====================
+
+class QuantileSketch:
+    """
+    Mergeable median/quantile sketch.
+    Holds exact value counts (so medians match pandas exactly) until more than
+    max_distinct values are tracked, then compacts onto log-spaced bins with
+    relative error <= relative_accuracy. Optionally tracks one sketch per group.
+    """
+
+    def __init__(self, max_distinct=100_000, relative_accuracy=0.001):
+        self.max_distinct = max_distinct
+        self.relative_accuracy = relative_accuracy
+        self.exact = True
+        self.counts = None
+
+    def _bin(self, values):
+        """Snap values onto log-spaced bin centers (zero stays zero)"""
+        gamma = (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+        magnitude = np.abs(values)
+        with np.errstate(divide='ignore'):
+            exponent = np.round(np.log(magnitude) / np.log(gamma))
+        binned = np.sign(values) * np.power(gamma, exponent) * 2 / (gamma + 1)
+        return np.where(magnitude == 0, 0.0, binned)
+
+    def _compact(self):
+        if self.counts is None:
+            return
+        index = self.counts.index
+        if isinstance(index, pd.MultiIndex):
+            values = self._bin(index.get_level_values(1).to_numpy(dtype='float64'))
+            keys = [index.get_level_values(0), values]
+        else:
+            keys = self._bin(index.to_numpy(dtype='float64'))
+        self.counts = self.counts.groupby(keys, sort=False).sum()
+        self.exact = False
+
+    def update(self, values, groups=None):
+        """Add a chunk of values (NaN ignored), optionally keyed by group"""
+        values = pd.to_numeric(pd.Series(values).reset_index(drop=True), errors='coerce')
+        valid = values.notna().to_numpy()
+        values = values.to_numpy(dtype='float64')[valid]
+        if not self.exact:
+            values = self._bin(values)
+
+        if groups is None:
+            counts = pd.Series(values).value_counts(sort=False)
+        else:
+            groups = pd.Series(groups).reset_index(drop=True)[valid]
+            if isinstance(groups.dtype, pd.CategoricalDtype):
+                # Count (group code, value code) pairs packed into one int64, then
+                # index the counts by those codes - no per-row labels are built
+                codes = groups.cat.codes.to_numpy()
+                keep = codes >= 0
+                value_codes, uniques = pd.factorize(values[keep])
+                width = max(len(uniques), 1)
+                pairs, counts = np.unique(codes[keep].astype('int64') * width + value_codes, return_counts=True)
+                index = pd.MultiIndex(levels=[groups.cat.categories.astype(object), uniques],
+                                      codes=[pairs // width, pairs % width], verify_integrity=False)
+                counts = pd.Series(counts, index=index)
+            else:
+                counts = pd.DataFrame({'g': groups.to_numpy(), 'v': values}).groupby(
+                    ['g', 'v'], sort=False, observed=True).size()
+
+        self.counts = merge_counts(self.counts, counts)
+        if self.exact and len(self.counts) > self.max_distinct:
+            self._compact()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch into this one"""
+        if other.counts is None:
+            return self
+        if self.exact and not other.exact:
+            self._compact()
+        other_counts = other.counts
+        if other.exact and not self.exact:
+            other_counts = QuantileSketch(other.max_distinct, self.relative_accuracy)
+            other_counts.counts = other.counts.copy()
+            other_counts._compact()
+            other_counts = other_counts.counts
+        self.counts = merge_counts(self.counts, other_counts)
+        if self.exact and len(self.counts) > self.max_distinct:
+            self._compact()
+        return self
+
+    @property
+    def count(self):
+        return 0 if self.counts is None else int(self.counts.sum())
+
+    def median(self):
+        """Median with pandas semantics (mean of the two middle values)"""
+        if self.count == 0:
+            return np.nan
+        ordered = self.counts.sort_index()
+        cumulative = ordered.to_numpy().cumsum()
+        values = ordered.index.to_numpy(dtype='float64')
+        n = cumulative[-1]
+        low = values[np.searchsorted(cumulative, (n - 1) // 2, side='right')]
+        high = values[np.searchsorted(cumulative, n // 2, side='right')]
+        return (low + high) / 2
+
+    def grouped_median(self):
+        """Per-group medians (for sketches updated with groups), indexed by sorted group"""
+        if self.counts is None or len(self.counts) == 0:
+            return pd.Series(dtype='float64')
+        frame = self.counts.rename('c').reset_index()
+        frame.columns = ['g', 'v', 'c']
+        frame = frame.sort_values(['g', 'v'], kind='mergesort')
+        cumulative = frame.groupby('g', sort=False)['c'].cumsum()
+        n = frame.groupby('g', sort=False)['c'].transform('sum')
+
+        low = frame.loc[cumulative > (n - 1) // 2].groupby('g')['v'].first()
+        high = frame.loc[cumulative > n // 2].groupby('g')['v'].first()
+        return (low + high) / 2
+
+# ==================== GROUP CUBE ====================
+
+TIER1_LABELS = ('Platinum', 'Gold')
+TIER_COLUMNS = TIER_LABELS + [TIER_DEFAULT]
+
+def refi_eligible(ltv_pct, loan_age):
+    """Refi opportunity: LTV <= 80% and loan age >= 18 months"""
+    return (ltv_pct <= 80) & (loan_age >= 18)
+
+class GroupCube:
+    """
+    Per-group summary (one row per ZIP or City) built in one grouped pass per
+    chunk over the categorical codes: record, tier and refi-eligible counts are
+    bincounts of the codes, score / equity sums one group-by over both columns,
+    and median equity / median LTV come from grouped quantile sketches.
+    Mergeable like the rest.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.sums = None
+        self.equity = QuantileSketch(max_distinct=250_000)
+        self.ltv = QuantileSketch(max_distinct=250_000)
+
+    def update(self, typed):
+        groups = typed[self.key]
+        if not isinstance(groups.dtype, pd.CategoricalDtype):
+            groups = groups.astype('category')
+        codes = groups.cat.codes.to_numpy()
+        size = len(groups.cat.categories)
+        valid = codes >= 0  # rows with no key are left out
+        if not valid.all():
+            codes = codes[valid]
+
+        def column(name, dtype='float64'):
+            values = typed[name].to_numpy(dtype=dtype)
+            return values if valid.all() else values[valid]
+
+        def count(mask):
+            return np.bincount(codes, weights=mask, minlength=size).astype('int64')
+
+        sums = {'Records': np.bincount(codes, minlength=size)}
+        if 'APS_Tier' in typed.columns:
+            # Tier codes in TIER_COLUMNS order; one bincount over (group, tier) cells
+            tiers = typed['APS_Tier'].astype('category').cat.set_categories(TIER_COLUMNS).cat.codes.to_numpy()
+            tiers = tiers if valid.all() else tiers[valid]
+            cells = np.bincount(codes.astype('int64') * (len(TIER_COLUMNS) + 1) + tiers + 1,
+                                minlength=size * (len(TIER_COLUMNS) + 1)).reshape(size, len(TIER_COLUMNS) + 1)
+            for i, label in enumerate(TIER_COLUMNS):
+                sums[label] = cells[:, i + 1]
+        if 'LTV %' in typed.columns and 'Loan_Age_Mo' in typed.columns:
+            sums['Refi_Count'] = count(refi_eligible(column('LTV %'), column('Loan_Age_Mo')))
+
+        totals = {}
+        for name, source in (('Score', 'APS_Score (v2.0)'), ('Equity', 'Equity_Dollars')):
+            if source in typed.columns:
+                totals[f'{name}_Sum'] = column(source)
+                sums[f'{name}_Count'] = count(~np.isnan(totals[f'{name}_Sum']))
+        sums = pd.DataFrame(sums)
+        if totals:
+            # Float sums through pandas' compensated group-by sum
+            summed = pd.DataFrame(totals).groupby(codes).sum()
+            for name in totals:
+                sums[name] = summed[name].reindex(sums.index, fill_value=0.0)
+
+        observed = sums['Records'].to_numpy() > 0
+        sums = sums[observed]
+        sums.index = groups.cat.categories[observed].astype(object)
+        self.sums = merge_counts(self.sums, sums)
+
+        if 'Equity_Dollars' in typed.columns:
+            self.equity.update(typed['Equity_Dollars'], groups=groups)
+        if 'LTV %' in typed.columns:
+            self.ltv.update(typed['LTV %'], groups=groups)
+        return self
+
+    def merge(self, other):
+        self.sums = merge_counts(self.sums, other.sums)
+        self.equity.merge(other.equity)
+        self.ltv.merge(other.ltv)
+        return self
+
+    def records(self):
+        """Records per group, first-appearance order"""
+        return None if self.sums is None else self.sums['Records']
+
+    def table(self):
+        """
+        The cube as a DataFrame sorted by key: Records, one count per tier,
+        Tier1_Count, Mean_Score, Mean_Equity, Median_Equity, Est_LTV (median LTV)
+        and Refi_Count. Stats whose input columns were missing are NaN.
+        """
+        sums = self.sums if self.sums is not None else pd.DataFrame(columns=['Records'])
+        sums = sums.reindex(columns=['Records', *TIER_COLUMNS, 'Score_Sum', 'Score_Count',
+                                     'Equity_Sum', 'Equity_Count', 'Refi_Count'])
+        cube = sums[['Records', *TIER_COLUMNS]].copy()
+        cube['Tier1_Count'] = sums[list(TIER1_LABELS)].sum(axis=1, min_count=len(TIER1_LABELS))
+        cube['Mean_Score'] = sums['Score_Sum'] / sums['Score_Count']
+        cube['Mean_Equity'] = sums['Equity_Sum'] / sums['Equity_Count']
+        cube['Median_Equity'] = self.equity.grouped_median()
+        cube['Est_LTV'] = self.ltv.grouped_median()
+        cube['Refi_Count'] = sums['Refi_Count']
+        cube = cube.sort_index()
+        cube.index.name = self.key
+        return cube.reset_index()
+
+# ==================== REPORT ACCUMULATOR ====================
+
+SAMPLE_SIZE = 500
+TOP_ROWS = 12
+TOP_ROW_COLUMNS = ['Property Address', 'City', 'State', 'LTV %', 'Equity %', 'Loan_Age_Mo', 'APS_Score (v2.0)', 'APS_Tier']
+SAMPLE_COLUMNS = ['Loan_Age_Mo', 'Equity %', 'APS_Score (v2.0)']
+MEDIAN_COLUMNS = ['LTV %', 'Equity %', 'Equity_Dollars', 'Loan_Age_Mo']
+# Columns with a GroupCube; their value counts are the cube's record counts
+CUBE_KEYS = ['ZIP', 'City']
+# Columns whose value counts the report keeps (from the cube when one is built)
+COUNT_COLUMNS = ['City', 'State', 'Servicer_Name', 'APS_Tier']
+
+# Named aggregates a ReportAccumulator can be limited to (the page registry
+# declares which ones each page reads):
+# - summary: medians, refi-eligible count, mean equity
+# - counts: value counts of COUNT_COLUMNS
+# - zip_cube / city_cube: the per-ZIP / per-city GroupCube
+# - loan_ages: loan-age counts
+# - matrix: prediction matrix cells
+# - churn: churn triangle sample and density grid
+# - top_rows: top-scoring rows for the preview table
+REPORT_AGGREGATES = ['summary', 'counts', 'zip_cube', 'city_cube', 'loan_ages', 'matrix', 'churn', 'top_rows']
+CUBE_AGGREGATES = {'ZIP': 'zip_cube', 'City': 'city_cube'}
+
+# Prediction matrix (Loan Age x Equity_Dollars). Loan-age bands include their
+# upper month; equity bands include their lower dollar bound.
+MATRIX_COLUMNS = ['Loan_Age_Mo', 'Equity_Dollars', 'APS_Score (v2.0)']
+MATRIX_AGE_UPPER = np.array([24, 48, 72, 96])
+MATRIX_AGE_LABELS = ['0-24m', '25-48m', '49-72m', '73-96m', '96m+']
+MATRIX_EQUITY_LOWER = np.array([50_000, 100_000, 150_000, 250_000])
+MATRIX_EQUITY_LABELS = ['$0-50k', '$50-100k', '$100-150k', '$150-250k', '$250k+']
+MATRIX_SHAPE = (len(MATRIX_AGE_LABELS), len(MATRIX_EQUITY_LABELS))
+
+# Churn triangle density grid (Loan_Age_Mo x Equity %); out-of-range values
+# land in the edge cells so the grid is fixed and mergeable
+DENSITY_AGE_EDGES = np.linspace(0, 360, 61)
+DENSITY_EQUITY_EDGES = np.linspace(-50, 100, 61)
+DENSITY_SHAPE = (len(DENSITY_AGE_EDGES) - 1, len(DENSITY_EQUITY_EDGES) - 1)
+
+class ReportAccumulator:
+    """
+    Everything the report pages read from the scored data, as mergeable aggregates:
+    medians, per-ZIP and per-city cubes, tier and loan-age counts, a bounded
+    random sample for the churn triangle and the top-scoring rows for the
+    preview table.
+
+    aggregates limits the work to the named REPORT_AGGREGATES (None = all);
+    the rest stay empty. Row totals, columns and head are always kept.
+    """
+
+    def __init__(self, seed=42, aggregates=None):
+        unknown = set(aggregates or ()) - set(REPORT_AGGREGATES)
+        if unknown:
+            raise ValueError(f"Unknown report aggregates: {', '.join(sorted(unknown))}")
+        self.aggregates = frozenset(REPORT_AGGREGATES if aggregates is None else aggregates)
+        self.columns = None
+        self.head = None
+        self.total_records = 0
+        self.refi_count = 0
+        self.equity_dollars_sum = 0.0
+        self.equity_dollars_count = 0
+        self.medians = {col: QuantileSketch() for col in MEDIAN_COLUMNS}
+        self.value_counts = {}
+        self.loan_age_counts = None
+        self.cubes = {key: GroupCube(key) for key in CUBE_KEYS if CUBE_AGGREGATES[key] in self.aggregates}
+        self.matrix_counts = np.zeros(MATRIX_SHAPE, dtype='int64')
+        self.matrix_score_sum = np.zeros(MATRIX_SHAPE)
+        self.density_counts = np.zeros(DENSITY_SHAPE, dtype='int64')
+        self.density_score_sum = np.zeros(DENSITY_SHAPE)
+        self.sample = None
+        self.top_rows = None
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_frame(cls, df, aggregates=None):
+        return cls(aggregates=aggregates).update(df)
+
+    def update(self, data):
+        """Fold one scored chunk (RecordBatch or scored DataFrame) into the aggregates"""
+        batch = as_record_batch(data)
+        df, typed = batch.frame, batch.typed
+        if self.columns is None:
+            self.columns = list(df.columns)
+            self.head = df.head(5).copy()
+        self.total_records += len(df)
+        wants = self.aggregates
+
+        if 'summary' in wants:
+            for col, sketch in self.medians.items():
+                if col in typed.columns:
+                    sketch.update(typed[col])
+
+            if 'Equity_Dollars' in df.columns:
+                self.equity_dollars_sum += float(df['Equity_Dollars'].sum())
+                self.equity_dollars_count += int(df['Equity_Dollars'].count())
+
+            if 'LTV %' in df.columns and 'Loan_Age_Mo' in df.columns:
+                self.refi_count += int(refi_eligible(df['LTV %'], df['Loan_Age_Mo']).sum())
+
+        if 'counts' in wants:
+            for col in COUNT_COLUMNS:
+                source = typed if col in typed.columns else df
+                if col in self.cubes or col not in source.columns:
+                    continue
+                counts = plain_index(source[col].value_counts(sort=False))
+                self.value_counts[col] = merge_counts(self.value_counts.get(col), counts[counts > 0])
+
+        if 'loan_ages' in wants and 'Loan_Age_Mo' in df.columns:
+            self.loan_age_counts = merge_counts(self.loan_age_counts, df['Loan_Age_Mo'].value_counts(sort=False))
+
+        for key, cube in self.cubes.items():
+            if key in typed.columns:
+                cube.update(typed)
+
+        if 'matrix' in wants and all(col in typed.columns for col in MATRIX_COLUMNS):
+            self._update_matrix(typed)
+
+        if 'churn' in wants and all(col in df.columns for col in SAMPLE_COLUMNS):
+            self._update_sample(df)
+            self._update_density(typed)
+
+        if 'top_rows' in wants:
+            self._update_top_rows(df)
+        return self
+
+    def _update_matrix(self, typed):
+        """Bin every row into its loan-age x equity cell once; count and sum scores per cell"""
+        ages = typed['Loan_Age_Mo'].to_numpy(dtype='float64')
+        equity = typed['Equity_Dollars'].to_numpy(dtype='float64')
+        scores = typed['APS_Score (v2.0)'].to_numpy(dtype='float64')
+        valid = ~(np.isnan(ages) | np.isnan(equity) | np.isnan(scores))
+        if not valid.all():
+            ages, equity, scores = ages[valid], equity[valid], scores[valid]
+
+        cells = (np.searchsorted(MATRIX_AGE_UPPER, ages, side='left') * MATRIX_SHAPE[1]
+                 + np.searchsorted(MATRIX_EQUITY_LOWER, equity, side='right'))
+        size = MATRIX_SHAPE[0] * MATRIX_SHAPE[1]
+        self.matrix_counts += np.bincount(cells, minlength=size).reshape(MATRIX_SHAPE)
+        self.matrix_score_sum += np.bincount(cells, weights=scores, minlength=size).reshape(MATRIX_SHAPE)
+
+    def _update_density(self, typed):
+        """Churn triangle over all rows: per-cell counts and APS score sums on the density grid"""
+        ages = typed['Loan_Age_Mo'].to_numpy(dtype='float64')
+        equity = typed['Equity %'].to_numpy(dtype='float64')
+        scores = typed['APS_Score (v2.0)'].to_numpy(dtype='float64')
+        valid = ~(np.isnan(ages) | np.isnan(equity) | np.isnan(scores))
+        if not valid.all():
+            ages, equity, scores = ages[valid], equity[valid], scores[valid]
+
+        cells = (np.searchsorted(DENSITY_AGE_EDGES[1:-1], ages, side='right') * DENSITY_SHAPE[1]
+                 + np.searchsorted(DENSITY_EQUITY_EDGES[1:-1], equity, side='right'))
+        size = DENSITY_SHAPE[0] * DENSITY_SHAPE[1]
+        self.density_counts += np.bincount(cells, minlength=size).reshape(DENSITY_SHAPE)
+        self.density_score_sum += np.bincount(cells, weights=scores, minlength=size).reshape(DENSITY_SHAPE)
+
+    def _update_sample(self, df):
+        """Bottom-k sample on random keys - uniform over all rows and mergeable"""
+        sample = df[SAMPLE_COLUMNS].copy()
+        sample['_key'] = self._rng.random(len(sample))
+        sample = sample.nsmallest(SAMPLE_SIZE, '_key')
+        self.sample = sample if self.sample is None else pd.concat([self.sample, sample]).nsmallest(SAMPLE_SIZE, '_key')
+
+    def _update_top_rows(self, df):
+        cols = [col for col in TOP_ROW_COLUMNS if col in df.columns]
+        if 'APS_Score (v2.0)' in df.columns:
+            top = df.nlargest(TOP_ROWS, 'APS_Score (v2.0)')[cols]
+            if self.top_rows is not None:
+                top = pd.concat([self.top_rows, top]).nlargest(TOP_ROWS, 'APS_Score (v2.0)')
+        else:
+            top = df.head(TOP_ROWS)[cols] if self.top_rows is None else self.top_rows
+        self.top_rows = top
+
+    def merge(self, other):
+        """Fold another accumulator (e.g. a later chunk range) into this one"""
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self.columns, self.head = other.columns, other.head
+        self.total_records += other.total_records
+        self.refi_count += other.refi_count
+        self.equity_dollars_sum += other.equity_dollars_sum
+        self.equity_dollars_count += other.equity_dollars_count
+        for col, sketch in self.medians.items():
+            sketch.merge(other.medians[col])
+        for col, counts in other.value_counts.items():
+            self.value_counts[col] = merge_counts(self.value_counts.get(col), counts)
+        self.loan_age_counts = merge_counts(self.loan_age_counts, other.loan_age_counts)
+        for key, cube in self.cubes.items():
+            if key in other.cubes:
+                cube.merge(other.cubes[key])
+        self.matrix_counts += other.matrix_counts
+        self.matrix_score_sum += other.matrix_score_sum
+        self.density_counts += other.density_counts
+        self.density_score_sum += other.density_score_sum
+        if other.sample is not None:
+            self.sample = other.sample if self.sample is None else pd.concat([self.sample, other.sample]).nsmallest(SAMPLE_SIZE, '_key')
+        if other.top_rows is not None:
+            if self.top_rows is None:
+                self.top_rows = other.top_rows
+            elif 'APS_Score (v2.0)' in self.top_rows.columns:
+                self.top_rows = pd.concat([self.top_rows, other.top_rows]).nlargest(TOP_ROWS, 'APS_Score (v2.0)')
+        return self
+
+    # ===== Read side (used by aps_pages / aps_render) =====
+
+    def has(self, *cols):
+        return self.columns is not None and all(col in self.columns for col in cols)
+
+    def median(self, col):
+        return self.medians[col].median() if col in self.medians else np.nan
+
+    def mean(self, col):
+        if col != 'Equity_Dollars' or self.equity_dollars_count == 0:
+            return np.nan
+        return self.equity_dollars_sum / self.equity_dollars_count
+
+    def counts(self, col):
+        """Value counts of col (None if it was never seen)"""
+        if col in self.cubes:
+            return self.cubes[col].records()
+        return self.value_counts.get(col)
+
+    def mode(self, col):
+        return top_value(self.counts(col))
+
+    def top_counts(self, col, n=5):
+        counts = self.counts(col)
+        if counts is None:
+            return pd.Series(dtype='int64')
+        return counts.sort_values(ascending=False).head(n)
+
+    def count_loan_age(self, low=None, high=None):
+        """Records with low < Loan_Age_Mo <= high (open-ended when None)"""
+        counts = self.loan_age_counts
+        if counts is None:
+            return 0
+        ages = counts.index.to_numpy(dtype='float64')
+        mask = np.ones(len(ages), dtype=bool)
+        if low is not None:
+            mask &= ages > low
+        if high is not None:
+            mask &= ages <= high
+        return int(counts.to_numpy()[mask].sum())
+
+    def cube(self, key):
+        """Per-group summary table for key ('ZIP' or 'City'), see GroupCube.table()"""
+        return self.cubes[key].table()
+
+    def zip_summary(self):
+        """Per-ZIP median equity, median LTV and Tier-1 count, sorted by ZIP"""
+        return self.cube('ZIP')[['ZIP', 'Median_Equity', 'Est_LTV', 'Tier1_Count']]
+
+    def zip_scores(self):
+        """Per-ZIP mean APS score, sorted by ZIP"""
+        scores = self.cube('ZIP')[['ZIP', 'Mean_Score']]
+        return scores.rename(columns={'Mean_Score': 'APS_Score (v2.0)'})
+
+    def prediction_matrix(self):
+        """
+        Mean APS score per loan-age x equity cell (NaN where a cell is empty)
+
+        Returns:
+            tuple: (mean score matrix, record count matrix), rows = loan-age bands
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = self.matrix_score_sum / self.matrix_counts
+        means[self.matrix_counts == 0] = np.nan
+        return means, self.matrix_counts.copy()
+
+    def churn_density(self):
+        """
+        Mean APS score per churn-triangle grid cell (NaN where empty)
+
+        Returns:
+            tuple: (mean score grid, loan-age edges, equity % edges), rows = loan-age bins
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = self.density_score_sum / self.density_counts
+        means[self.density_counts == 0] = np.nan
+        return means, DENSITY_AGE_EDGES, DENSITY_EQUITY_EDGES
+
+    def churn_sample(self):
+        return None if self.sample is None else self.sample.drop(columns='_key')
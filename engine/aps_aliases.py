@@ -0,0 +1,85 @@
+# aps_aliases.py - Compiled vendor column alias index
+"""
+APS Market Intelligence - Vendor Aliases
+aliases/vendor_alias_map.json lists header variants per normalized field.
+It is compiled once into a dict keyed on the header with case, whitespace
+and punctuation removed ("Est. Value $" -> "estvalue"), so resolving an
+upload's columns is one dict lookup per column. The compiled index is cached
+per process and rebuilt when the file's mtime changes.
+"""
+import json
+import re
+import threading
+from aps_config import ALIAS_FILE
+
+# APS's own headers for the normalized fields; these outrank vendor variants
+CANONICAL_HEADERS = {
+    'property_address': 'Property Address',
+    'city': 'City',
+    'state': 'State',
+    'zip': 'ZIP',
+    'property_value': 'EstValue',
+    'loan_balance': 'TotalLoanBal',
+    'loan_date': 'LastLoanDate',
+    'owner_name': 'Owner Name',
+    'mailing_address': 'Mail Address',
+}
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+def header_key(name):
+    """Case-, whitespace- and punctuation-insensitive form of a header"""
+    return _NON_ALNUM.sub('', str(name).lower())
+
+def compile_aliases(aliases):
+    """
+    Build {header key: (field, rank)} from {field: [vendor headers]}.
+    Rank orders candidates for one field: canonical APS header, then the
+    field name itself, then vendor variants in file order. A key listed under
+    two fields belongs to the field that appears first in the file.
+    """
+    index = {}
+    for field, headers in aliases.items():
+        if not isinstance(headers, list):
+            continue  # e.g. the "notes" entry
+        candidates = [CANONICAL_HEADERS.get(field), field] + headers
+        for rank, header in enumerate(h for h in candidates if h):
+            index.setdefault(header_key(header), (field, rank))
+    for field, header in CANONICAL_HEADERS.items():
+        index.setdefault(header_key(header), (field, 0))
+    return index
+
+_cache = {'mtime': None, 'index': None}
+_lock = threading.Lock()
+
+def alias_index(path=ALIAS_FILE):
+    """Compiled index for path, recompiled only when its mtime changes"""
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+
+    with _lock:
+        if _cache['index'] is None or _cache['mtime'] != mtime or _cache.get('path') != path:
+            aliases = {}
+            if mtime is not None:
+                with open(path, 'r', encoding='utf-8') as f:
+                    aliases = json.load(f)
+            _cache.update(path=path, mtime=mtime, index=compile_aliases(aliases))
+        return _cache['index']
+
+def resolve_columns(columns, index=None):
+    """
+    Map normalized field -> source column for the given headers, O(columns).
+    When several columns match one field the best-ranked wins (ties: leftmost).
+    """
+    index = alias_index() if index is None else index
+    best = {}
+    for col in columns:
+        match = index.get(header_key(col))
+        if match is None:
+            continue
+        field, rank = match
+        if field not in best or rank < best[field][1]:
+            best[field] = (col, rank)
+    return {field: col for field, (col, _) in best.items()}
@@ -0,0 +1,159 @@
+# aps_batch.py - Batch mode: a directory or glob of feeds on a worker pool
+"""
+APS Market Intelligence - Batch Runner
+Runs every CSV in a directory (or matching a glob) through score -> health
+check -> render on a process pool, one file per worker at a time. A file that
+fails is recorded and the rest keep going; the run ends with one JSON
+manifest listing records, quality, stage timings and output paths per file.
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from aps_config import OUTPUT_DIR, BATCH_WORKERS, COLUMNAR_CACHE
+from aps_jobs import JOB_STAGES, process_job
+
+def expand_inputs(target):
+    """CSV files in a directory (non-recursive) or matching a glob, sorted; scored outputs are skipped"""
+    target = str(target)
+    if Path(target).is_dir():
+        paths = Path(target).glob('*.csv')
+    else:
+        paths = (Path(p) for p in glob.glob(target, recursive=True))
+    return sorted(p for p in paths if p.is_file() and not p.stem.endswith('_scored'))
+
+class StageClock:
+    """report_stage callback that keeps stage start times (worker-local)"""
+
+    def __init__(self):
+        self.started = {}
+
+    def __call__(self, stage):
+        self.started[stage] = time.perf_counter()
+
+    def timings(self, end):
+        stages = [s for s in JOB_STAGES if s in self.started]
+        bounds = [self.started[s] for s in stages] + [end]
+        return {stage: round(bounds[i + 1] - bounds[i], 3) for i, stage in enumerate(stages)}
+
+def run_file(csv_path, output_dir, rebuild=False):
+    """
+    Worker body for one file. Never raises: failures come back as a
+    manifest entry with status 'failed' and the error message.
+    """
+    csv_path = Path(csv_path)
+    scored_csv_path = Path(output_dir) / (csv_path.stem + "_scored.csv")
+    pdf_path = Path(output_dir) / (csv_path.stem + "_DEMO.pdf")
+    entry = {"file": str(csv_path)}
+
+    clock = StageClock()
+    start = time.perf_counter()
+    try:
+        # Workers run side by side; keep their progress lines off the console
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = process_job(csv_path, scored_csv_path, pdf_path, None, clock,
+                                 csv_filename=csv_path.name, columnar=COLUMNAR_CACHE, rebuild=rebuild)
+        entry.update({
+            "status": "done",
+            "records": result["input_records"],
+            "quality_status": result["quality_status"],
+            "quality_score": result["quality_score"],
+            "health_check_summary": result["health_check_summary"],
+            "stages": result["timings"]["stages"],
+            # pdf: the first feed's PDF; feeds: every PDF when the file mixes feeds
+            "outputs": {"pdf": next(iter(result["pdfs"].values())), "feeds": result["pdfs"],
+                        "scored_csv": str(scored_csv_path)}
+        })
+    except Exception as e:
+        entry.update({"status": "failed", "error": f"{type(e).__name__}: {e}"})
+
+    end = time.perf_counter()
+    entry["timings"] = {**clock.timings(end), "total": round(end - start, 3)}
+    return entry
+
+def run_batch(paths, workers=BATCH_WORKERS, output_dir=OUTPUT_DIR, manifest_path=None, rebuild=False):
+    """
+    Process paths on a pool of workers and write the manifest.
+
+    Returns:
+        dict: the manifest (also written to manifest_path)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    started = datetime.now()
+    manifest_path = Path(manifest_path or output_dir / f"batch_manifest_{started.strftime('%Y%m%d_%H%M%S')}.json")
+
+    # Outputs are named after the file stem; a second file with the same stem would overwrite the first
+    entries, seen = {}, set()
+    for path in paths:
+        if path.stem in seen:
+            entries[path] = {"file": str(path), "status": "failed",
+                             "error": f"Another input already writes {path.stem}_DEMO.pdf / {path.stem}_scored.csv"}
+        seen.add(path.stem)
+
+    todo = [p for p in paths if p not in entries]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(run_file, path, output_dir, rebuild): path for path in todo}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. out of memory)
+                entry = {"file": str(path), "status": "failed", "error": f"{type(e).__name__}: {e}"}
+            entries[path] = entry
+            if entry["status"] == "done":
+                print(f" ✓ {path.name}: {entry['records']:,} records, quality {entry['quality_score']} "
+                      f"({entry['timings']['total']:.1f}s)")
+            else:
+                print(f" ✗ {path.name}: {entry['error']}")
+
+    files = [entries[p] for p in paths]
+    manifest = {
+        "started": started.isoformat(),
+        "finished": datetime.now().isoformat(),
+        "seconds": round(time.perf_counter() - start, 3),
+        "workers": workers,
+        "total_files": len(files),
+        "succeeded": sum(1 for f in files if f["status"] == "done"),
+        "failed": sum(1 for f in files if f["status"] != "done"),
+        "files": files
+    }
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    manifest["manifest_path"] = str(manifest_path)
+    return manifest
+
+def main(target, workers=BATCH_WORKERS, manifest_path=None, rebuild=False):
+    paths = expand_inputs(target)
+    print("\n=== APS Batch Starting ===")
+    print(f"Input: {target} ({len(paths)} files, {workers} workers)")
+    if not paths:
+        print("No CSV files found")
+        return 1
+
+    manifest = run_batch(paths, workers=workers, manifest_path=manifest_path, rebuild=rebuild)
+
+    print(f"\n✓ {manifest['succeeded']} succeeded, {manifest['failed']} failed in {manifest['seconds']:.1f}s")
+    print(f"✓ Wrote manifest -> {manifest['manifest_path']}")
+    print("\n=== Batch Complete ===")
+    return 1 if manifest['failed'] else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every CSV in a directory or glob through the APS pipeline")
+    parser.add_argument("target", help="Directory of CSVs or a glob such as input/test_feeds/*.csv")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS,
+                        help="Files processed at once (default: %(default)s)")
+    parser.add_argument("--manifest", default=None,
+                        help="Manifest path (default: OUTPUT_DIR/batch_manifest_<timestamp>.json)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Re-score every file even if a matching columnar cache exists")
+    args = parser.parse_args()
+    sys.exit(main(args.target, workers=args.workers, manifest_path=args.manifest, rebuild=args.rebuild))
@@ -0,0 +1,182 @@
+# aps_cache.py - Content-addressed result cache for processed uploads
+"""
+APS Market Intelligence - Result Cache
+Maps (upload content hash, scoring version, feed type) to the artifacts a
+previous run produced, so retried or duplicate uploads return immediately.
+Disk usage is bounded; least-recently-used entries (and their files) are evicted.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows (waitress serves from one process; the thread lock is enough)
+    fcntl = None
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+def file_digest(path):
+    """SHA-256 of a file's bytes, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cache_key(content_hash, scoring_version, feed_type=None):
+    """Cache key for one upload under one scoring version and feed type"""
+    return f"{content_hash}:{scoring_version}:{feed_type or 'auto'}"
+
+class ResultCache:
+    """
+    Disk-bounded LRU index of processed results.
+    Each entry records its artifact paths, their total size and the response
+    fields needed to answer a repeat request. The index persists as JSON next
+    to the artifacts so hits survive restarts, and is re-read whenever another
+    process (e.g. another server worker) has rewritten it. Writers hold an
+    flock on a lock file next to the index across read, modify and save, so
+    workers don't overwrite each other's entries. Hits don't rewrite the
+    index: they bump the artifacts' access time, which eviction orders by.
+    """
+
+    def __init__(self, index_path, max_bytes):
+        self.index_path = Path(index_path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._lock_path = self.index_path.with_name(f"{self.index_path.name}.lock")
+        self._mtime = None
+        self._entries = self._load()
+
+    def _index_mtime(self):
+        try:
+            return self.index_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self):
+        self._mtime = self._index_mtime()
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _refresh(self):
+        # Pick up entries other processes sharing the index have written
+        if self._index_mtime() != self._mtime:
+            self._entries = self._load()
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive access to the index for a read-modify-write, across threads and processes"""
+        with self._lock:
+            if fcntl is None:
+                self._entries = self._load()
+                yield
+                return
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    # Always re-read: an mtime check can miss a rewrite within the clock's resolution
+                    self._entries = self._load()
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _save(self):
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.index_path)
+        self._mtime = self._index_mtime()
+
+    def get(self, key):
+        """Cached entry for key (artifacts still on disk), or None"""
+        with self._lock:
+            self._refresh()
+            entry = self._entries.get(key)
+            if entry is not None and _touch(entry['files']):
+                self.hits += 1
+                return dict(entry['result'])
+            self.misses += 1
+
+        if entry is not None:
+            # Its artifacts are gone (deleted, or evicted by another worker)
+            with self._locked():
+                if key in self._entries and not all(Path(p).exists() for p in self._entries[key]['files']):
+                    del self._entries[key]
+                    self._save()
+        return None
+
+    def put(self, key, result, files):
+        """Record a finished run and evict LRU entries beyond max_bytes"""
+        files = [str(p) for p in files]
+        size = sum(Path(p).stat().st_size for p in files if Path(p).exists())
+        with self._locked():
+            # A run that reused an output name overwrote those files; older entries pointing there are stale
+            for stale in [k for k, e in self._entries.items() if set(e['files']) & set(files)]:
+                del self._entries[stale]
+            self._entries[key] = {
+                'result': result,
+                'files': files,
+                'size': size,
+                'last_used': time.time()
+            }
+            self._evict(keep=key)
+            self._save()
+
+    def _evict(self, keep=None):
+        total = sum(entry['size'] for entry in self._entries.values())
+        for key in sorted(self._entries, key=lambda k: _last_used(self._entries[k])):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            entry = self._entries.pop(key)
+            for path in entry['files']:
+                Path(path).unlink(missing_ok=True)
+            total -= entry['size']
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            self._refresh()
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(entry['size'] for entry in self._entries.values()),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+def _touch(files):
+    """Mark files as just used (access time; mtime is kept). False if any is missing."""
+    now = time.time_ns()
+    try:
+        for path in files:
+            os.utime(path, ns=(now, os.stat(path).st_mtime_ns))
+    except OSError:
+        return False
+    return True
+
+def _last_used(entry):
+    """When an entry was last put or hit (its artifacts' latest access time)"""
+    atimes = []
+    for path in entry['files']:
+        try:
+            atimes.append(os.stat(path).st_atime)
+        except OSError:
+            pass
+    return max([entry['last_used'], *atimes])
@@ -0,0 +1,364 @@
+# engine/aps_charts.py - Chart drawing for the PDF report
+"""
+APS Market Intelligence - Charts
+Every report figure is drawn by a module-level function that takes plain
+data (small DataFrames, color dicts) and returns PNG bytes. Figures use the
+object-oriented matplotlib API, so no pyplot state is shared, and
+render_charts() can draw all of a report's charts at once on a process pool.
+Finished PNGs are memoized on (figure id, colors, input digest); figures that
+don't depend on the data are also kept on disk, so they render once per install.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+import matplotlib.patches as mpatches
+from aps_config import CHART_WORKERS, FIGURE_CACHE_DIR, FIGURE_CACHE_ENTRIES
+
+# Bump when any draw_* function changes its output so cached PNGs are redrawn
+FIGURE_VERSION = 1
+
+def figure_png(fig, dpi, **savefig_kwargs):
+    """Rasterize a Figure to PNG bytes"""
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight', **savefig_kwargs)
+    return buffer.getvalue()
+
+def static_figure(fn):
+    """Mark a draw function whose output depends only on its (color) arguments"""
+    fn.static = True
+    return fn
+
+# ==================== CHARTS ====================
+
+def draw_zip_heatmap(zip_scores, palette):
+    """Page 4: horizontal bars of average APS score per ZIP (300 DPI)"""
+    fig = Figure(figsize=(8, 6), dpi=300)
+    ax = fig.subplots()
+
+    colors_list = []
+    for score in zip_scores['APS_Score (v2.0)']:
+        if score >= 70:
+            colors_list.append(palette['teal'])
+        elif score >= 50:
+            colors_list.append(palette['yellow'])
+        else:
+            colors_list.append(palette['red'])
+
+    ax.barh(zip_scores['ZIP'].astype(str), zip_scores['APS_Score (v2.0)'], color=colors_list)
+
+    ax.set_xlabel('Average APS Score', fontsize=12, fontweight='bold')
+    ax.set_ylabel('ZIP Code', fontsize=12, fontweight='bold')
+    ax.set_title('Market Heat Map - APS Score by ZIP', fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlim(0, 100)
+    ax.grid(axis='x', alpha=0.3)
+
+    teal_patch = mpatches.Patch(color=palette['teal'], label='High Score (70+)')
+    yellow_patch = mpatches.Patch(color=palette['yellow'], label='Medium Score (50-70)')
+    red_patch = mpatches.Patch(color=palette['red'], label='Low Score (<50)')
+    ax.legend(handles=[teal_patch, yellow_patch, red_patch], loc='lower right')
+
+    fig.tight_layout()
+    return figure_png(fig, 300)
+
+def draw_churn_triangle(sample):
+    """Page 5: loan age vs equity scatter colored by APS score (300 DPI)"""
+    fig = Figure(figsize=(8, 6), dpi=300)
+    ax = fig.subplots()
+
+    scatter = ax.scatter(
+        sample['Loan_Age_Mo'],
+        sample['Equity %'],
+        c=sample['APS_Score (v2.0)'],
+        cmap='RdYlGn',
+        s=50,
+        alpha=0.6,
+        edgecolors='black',
+        linewidth=0.5
+    )
+
+    ax.set_xlabel('Loan Age (Months)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Equity %', fontsize=12, fontweight='bold')
+    ax.set_title('Churn Triangle: Loan Age vs Equity (Color = APS Score)', fontsize=14, fontweight='bold', pad=20)
+    ax.grid(True, alpha=0.3)
+
+    cbar = fig.colorbar(scatter, ax=ax)
+    cbar.set_label('APS Score', rotation=270, labelpad=20)
+
+    ax.axvspan(18, 36, alpha=0.1, color='green', label='Prime Refi Window')
+    ax.axhline(y=40, color='blue', linestyle='--', alpha=0.5, label='Min Equity Threshold')
+    ax.legend(loc='upper right')
+
+    fig.tight_layout()
+    return figure_png(fig, 300)
+
+def draw_churn_density(means, age_edges, equity_edges, total_records):
+    """Page 5 density mode: mean APS score per loan age x equity % cell over all rows (300 DPI)"""
+    fig = Figure(figsize=(8, 6), dpi=300)
+    ax = fig.subplots()
+
+    mesh = ax.pcolormesh(age_edges, equity_edges, np.ma.masked_invalid(means.T), cmap='RdYlGn')
+
+    # Zoom to the populated cells
+    rows, cols = np.nonzero(~np.isnan(means))
+    if len(rows):
+        ax.set_xlim(age_edges[rows.min()], age_edges[rows.max() + 1])
+        ax.set_ylim(equity_edges[cols.min()], equity_edges[cols.max() + 1])
+
+    ax.set_xlabel('Loan Age (Months)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Equity %', fontsize=12, fontweight='bold')
+    ax.set_title(f'Churn Triangle: Loan Age vs Equity (Color = Mean APS Score, n={total_records:,})',
+                 fontsize=13, fontweight='bold', pad=20)
+    ax.grid(True, alpha=0.3)
+
+    cbar = fig.colorbar(mesh, ax=ax)
+    cbar.set_label('Mean APS Score', rotation=270, labelpad=20)
+
+    ax.axvspan(18, 36, alpha=0.1, color='green', label='Prime Refi Window')
+    ax.axhline(y=40, color='blue', linestyle='--', alpha=0.5, label='Min Equity Threshold')
+    ax.legend(loc='upper right')
+
+    fig.tight_layout()
+    return figure_png(fig, 300)
+
+@static_figure
+def draw_churn_models(colors_theme, palette):
+    """Churn models page: Diamond Equity Cycle + velocity curve (150 DPI)"""
+    fig = Figure(figsize=(10, 5), dpi=150)
+    ax1, ax2 = fig.subplots(1, 2)
+    fig.patch.set_facecolor('white')
+
+    # Left: Diamond Equity Cycle
+    ax1.set_facecolor('white')
+    stages = ['Equity\nBuildup', 'Refinance\nWindow', 'Sale\nDecision', 'Re-entry\nCycle']
+    angles = [0, 90, 180, 270]
+
+    for i, (stage, angle) in enumerate(zip(stages, angles)):
+        x = np.cos(np.radians(angle))
+        y = np.sin(np.radians(angle))
+        ax1.scatter(x, y, s=500, c=colors_theme['primary'], edgecolors='black', linewidths=2, zorder=3)
+        ax1.text(x*1.3, y*1.3, stage, ha='center', va='center', color='black', fontsize=9, weight='bold')
+
+    # Draw diamond connections
+    for i in range(4):
+        x1, y1 = np.cos(np.radians(angles[i])), np.sin(np.radians(angles[i]))
+        x2, y2 = np.cos(np.radians(angles[(i+1)%4])), np.sin(np.radians(angles[(i+1)%4]))
+        ax1.plot([x1, x2], [y1, y2], c=colors_theme['secondary'], linewidth=2, alpha=0.6)
+
+    ax1.set_xlim(-2, 2)
+    ax1.set_ylim(-2, 2)
+    ax1.axis('off')
+    ax1.set_title('Diamond Equity Cycle', color='black', fontsize=12, weight='bold', pad=20)
+
+    # Right: Velocity Curve with gradient colors
+    ax2.set_facecolor('white')
+    x = np.linspace(0, 100, 100)
+    y = 50 + 30 * np.sin(x * 0.08) + np.random.RandomState(42).normal(0, 3, 100)
+
+    # Draw gradient segments (Teal → Yellow → Red)
+    for i in range(len(x)-1):
+        if x[i] < 33:
+            color = palette['teal']
+        elif x[i] < 66:
+            color = palette['yellow']
+        else:
+            color = palette['red']
+        ax2.plot(x[i:i+2], y[i:i+2], c=color, linewidth=3)
+
+    ax2.set_xlabel('Loan Age (Months)', color='black', fontsize=10, weight='bold')
+    ax2.set_ylabel('Churn Probability (%)', color='black', fontsize=10, weight='bold')
+    ax2.set_title('Velocity Curve (Teal→Yellow→Red)', color='black', fontsize=12, weight='bold', pad=20)
+    ax2.tick_params(colors='black')
+    ax2.spines['bottom'].set_color('gray')
+    ax2.spines['left'].set_color('gray')
+    ax2.spines['top'].set_visible(False)
+    ax2.spines['right'].set_visible(False)
+    ax2.grid(True, alpha=0.2, color='gray')
+
+    fig.tight_layout()
+    return figure_png(fig, 150, facecolor='white')
+
+def draw_prediction_matrix(matrix, loan_age_bins, equity_bins):
+    """Prediction matrix page: mean APS score by loan age x equity band (150 DPI)"""
+    fig = Figure(figsize=(8, 5), dpi=150)
+    ax = fig.subplots()
+    fig.patch.set_facecolor('white')
+    ax.set_facecolor('white')
+
+    # Create heatmap
+    im = ax.imshow(matrix, cmap='RdYlGn_r', aspect='auto', vmin=30, vmax=90)
+
+    # Set ticks and labels
+    ax.set_xticks(np.arange(len(equity_bins)))
+    ax.set_yticks(np.arange(len(loan_age_bins)))
+    ax.set_xticklabels(equity_bins, fontsize=9)
+    ax.set_yticklabels(loan_age_bins, fontsize=9)
+
+    ax.set_xlabel('Estimated Equity', fontsize=11, weight='bold', color='black')
+    ax.set_ylabel('Loan Age', fontsize=11, weight='bold', color='black')
+    ax.set_title('Churn Probability Matrix (Avg APS Score)', fontsize=13, weight='bold', pad=15, color='black')
+
+    # Add value annotations (empty cells stay blank and read n/a)
+    for i in range(len(loan_age_bins)):
+        for j in range(len(equity_bins)):
+            value = matrix[i, j]
+            text_color = 'white' if value > 65 else 'black'
+            label = 'n/a' if np.isnan(value) else f'{value:.0f}'
+            ax.text(j, i, label,
+                   ha="center", va="center", color=text_color, fontsize=9, weight='bold')
+
+    # Add colorbar
+    cbar = fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
+    cbar.set_label('Avg APS Score', rotation=270, labelpad=20, fontsize=10, weight='bold')
+    cbar.ax.tick_params(labelsize=8)
+
+    ax.tick_params(colors='black')
+    fig.tight_layout()
+    return figure_png(fig, 150, facecolor='white')
+
+# ==================== FIGURE CACHE ====================
+
+def input_digest(args):
+    """Stable digest of a draw function's arguments (DataFrames hashed by content)"""
+    digest = hashlib.sha256()
+    for arg in args:
+        if isinstance(arg, np.ndarray):
+            digest.update(f"{arg.dtype}{arg.shape}".encode())
+            digest.update(np.ascontiguousarray(arg).tobytes())
+        elif isinstance(arg, pd.DataFrame):
+            digest.update(json.dumps([str(c) for c in arg.columns]).encode())
+            digest.update(pd.util.hash_pandas_object(arg, index=True).to_numpy().tobytes())
+        else:
+            digest.update(json.dumps(arg, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+class FigureCache:
+    """
+    LRU of rendered PNGs in memory, backed by a directory for static figures.
+    Keys cover the figure id, its colors/data and the matplotlib version.
+    """
+
+    def __init__(self, directory, max_entries):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, chart_id, fn, args):
+        return f"{chart_id}-{fn.__name__}-v{FIGURE_VERSION}-{matplotlib.__version__}-{input_digest(args)}"
+
+    def _path(self, key):
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.png"
+
+    def get(self, key, static=False):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        if static:
+            try:
+                png = self._path(key).read_bytes()
+            except OSError:
+                return None
+            self._remember(key, png)
+            return png
+        return None
+
+    def put(self, key, png, static=False):
+        self._remember(key, png)
+        if static:
+            # Write-then-rename so concurrent processes never read a partial file
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                path = self._path(key)
+                tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+                tmp_path.write_bytes(png)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"⚠ Could not store figure on disk: {e}")
+
+    def _remember(self, key, png):
+        with self._lock:
+            self._entries[key] = png
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop the in-memory entries (static figures on disk are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+figure_cache = FigureCache(FIGURE_CACHE_DIR, FIGURE_CACHE_ENTRIES)
+
+# ==================== PARALLEL RENDERING ====================
+
+_pool = None
+
+def chart_pool():
+    """Process pool shared by every report rendered in this process"""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=CHART_WORKERS)
+    return _pool
+
+def close_chart_pool():
+    """Shut the pool down (e.g. before forking); the next render_charts() starts a new one"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+        _pool = None
+
+def render_charts(jobs):
+    """
+    Draw charts concurrently, reusing any already in the figure cache.
+
+    Args:
+        jobs: dict of chart id -> (draw function, args tuple)
+
+    Returns:
+        dict: chart id -> PNG bytes. A chart that failed is left out so its page
+        redraws it in-process and reports the error the usual way.
+    """
+    global _pool
+    charts = {}
+    keys = {}
+    for chart_id, (fn, args) in list(jobs.items()):
+        keys[chart_id] = figure_cache.key(chart_id, fn, args)
+        png = figure_cache.get(keys[chart_id], static=getattr(fn, 'static', False))
+        if png is not None:
+            charts[chart_id] = png
+    jobs = {chart_id: job for chart_id, job in jobs.items() if chart_id not in charts}
+    if not jobs:
+        return charts
+
+    if len(jobs) == 1 or CHART_WORKERS <= 1:
+        futures = None
+    else:
+        try:
+            pool = chart_pool()
+            futures = {chart_id: pool.submit(fn, *args) for chart_id, (fn, args) in jobs.items()}
+        except Exception as e:
+            print(f"⚠ Chart pool unavailable, drawing serially: {e}")
+            futures = None
+
+    for chart_id, (fn, args) in jobs.items():
+        try:
+            charts[chart_id] = futures[chart_id].result() if futures else fn(*args)
+            figure_cache.put(keys[chart_id], charts[chart_id], static=getattr(fn, 'static', False))
+        except BrokenProcessPool as e:
+            # A dead worker poisons the pool; start a fresh one next time
+            _pool = None
+            print(f"⚠ Chart '{chart_id}' failed: {e}")
+        except Exception as e:
+            print(f"⚠ Chart '{chart_id}' failed: {e}")
+    return charts
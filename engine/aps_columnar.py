@@ -0,0 +1,113 @@
+# aps_columnar.py - Columnar (Feather) cache of scored feeds
+"""
+APS Market Intelligence - Columnar Cache
+The scored frame and its parsed value/balance/date columns are written as
+an uncompressed Feather (Arrow IPC) file next to *_scored.csv, one record
+batch per scoring chunk. The file carries the key it was built under: source
+hash, scoring version, the month loan ages were measured in, and whether
+unused vendor columns were passed through. When the key still matches,
+later runs memory-map the file and rebuild each RecordBatch from it instead
+of re-reading and re-scoring the CSV.
+"""
+import os
+from datetime import datetime
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+from aps_cache import file_digest
+from aps_normalize import SCORING_VERSION, RecordBatch
+from aps_trace import stage
+
+TYPED_COLUMNS = ['property_value', 'loan_balance', 'loan_date']
+TYPED_PREFIX = '__typed__'
+KEY_FIELD = b'aps_columnar_key'
+
+def columnar_path(scored_csv_path):
+    """Cache file that sits next to a scored CSV (test_scored.csv -> test_scored.feather)"""
+    return Path(scored_csv_path).with_suffix('.feather')
+
+def columnar_key(csv_path, passthrough):
+    """Key a cache file must carry to be reused for csv_path today"""
+    scored_month = datetime.now().strftime('%Y-%m')
+    columns = 'all' if passthrough else 'projected'
+    return f"{file_digest(csv_path)}:{SCORING_VERSION}:{scored_month}:{columns}"
+
+def _record_frame(batch):
+    """Scored frame plus the typed parse columns, categoricals as plain strings"""
+    columns = {}
+    for col in batch.frame.columns:
+        values = batch.frame[col]
+        columns[col] = values.astype(object) if isinstance(values.dtype, pd.CategoricalDtype) else values
+    for name in TYPED_COLUMNS:
+        columns[TYPED_PREFIX + name] = batch.typed[name]
+    return pd.DataFrame(columns, copy=False)
+
+class ColumnarWriter:
+    """
+    Appends scored chunks to a temporary Feather file; commit() moves it into
+    place, so a half-written file is never picked up as a cache.
+    """
+
+    def __init__(self, path, key):
+        self.path = Path(path)
+        self.key = key
+        self.tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self.schema = None
+        self.failed = False
+        self._writer = None
+
+    def write(self, batch):
+        if self.failed:
+            return
+        frame = _record_frame(batch)
+        try:
+            if self._writer is None:
+                record = pa.RecordBatch.from_pandas(frame, preserve_index=False)
+                self.schema = record.schema.remove_metadata().with_metadata({KEY_FIELD: self.key.encode()})
+                self._writer = pa.ipc.new_file(str(self.tmp_path), self.schema)
+            else:
+                record = pa.RecordBatch.from_pandas(frame, schema=self.schema, preserve_index=False)
+            self._writer.write_batch(record)
+        except (pa.ArrowException, OSError):
+            # e.g. a column whose type changes between chunks - skip caching, keep scoring
+            self.abort()
+            self.failed = True
+
+    def commit(self):
+        """Publish the file; returns False when there is nothing to publish"""
+        if self._writer is None or self.failed:
+            return False
+        self._writer.close()
+        os.replace(self.tmp_path, self.path)
+        return True
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self.tmp_path.unlink(missing_ok=True)
+
+def load_columnar(path, key):
+    """
+    Memory-map path and return an iterator of its RecordBatches, or None when
+    the file is missing, unreadable or was built under a different key
+    """
+    try:
+        reader = pa.ipc.open_file(pa.memory_map(str(path), 'r'))
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if (reader.schema.metadata or {}).get(KEY_FIELD) != key.encode():
+        return None
+    return _iter_batches(reader)
+
+def _iter_batches(reader):
+    offset = 0
+    for i in range(reader.num_record_batches):
+        with stage('columnar_read'):
+            frame = reader.get_batch(i).to_pandas()
+            # Same row labels the scoring chunks had
+            frame.index = pd.RangeIndex(offset, offset + len(frame))
+            offset += len(frame)
+            typed = {name: frame.pop(TYPED_PREFIX + name) for name in TYPED_COLUMNS}
+            batch = RecordBatch.build(frame, typed['property_value'], typed['loan_balance'], typed['loan_date'])
+        yield batch
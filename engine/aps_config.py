@@ -1,13 +1,74 @@
 # Config (ASCII)
+import os
 from pathlib import Path
 ENGINE_DIR = Path(__file__).parent
 INPUT_DIR  = ENGINE_DIR.parent / "input"
 OUTPUT_DIR = ENGINE_DIR.parent / "APS_Market_Intelligence_Live"
 ASSETS_DIR = ENGINE_DIR.parent / "assets"
+ALIAS_FILE = ENGINE_DIR.parent / "aliases" / "vendor_alias_map.json"
 LOGO_FILE = "APS_Master_Logo.png"
 STRICT_SCHEMA = True
 REQUIRED_HEADERS = [
     "Owner Name","Mail Address","Property Address","City","State","ZIP",
     "EstValue","TotalLoanBal","LastLoanDate",
     "Equity %","LTV %","Loan_Age_Mo","APS_Score (v2.0)","APS_Tier","CCI"
-]
\ No newline at end of file
+]
+# Streaming (chunked) mode - files at or above STREAM_MIN_BYTES are read in
+# STREAM_CHUNK_ROWS-row chunks so memory stays flat regardless of file size
+STREAM_CHUNK_ROWS = 250_000
+STREAM_MIN_BYTES = 256 * 1024 * 1024
+# Result cache - duplicate uploads reuse earlier artifacts; least recently
+# used entries are evicted once their files exceed RESULT_CACHE_MAX_BYTES
+RESULT_CACHE_INDEX = OUTPUT_DIR / ".aps_result_cache.json"
+RESULT_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+# Background jobs - API uploads run on a local process pool; new submissions
+# are rejected once JOB_QUEUE_DEPTH jobs are queued or running
+JOB_WORKERS = 2
+JOB_QUEUE_DEPTH = 16
+# Chart rendering - a report's figures are drawn concurrently on this many
+# processes (1 draws them serially in the rendering process)
+CHART_WORKERS = min(4, os.cpu_count() or 1)
+# Figure cache - rendered charts are memoized per process (FIGURE_CACHE_ENTRIES
+# PNGs); data-independent figures are also kept in FIGURE_CACHE_DIR
+FIGURE_CACHE_DIR = OUTPUT_DIR / ".figure_cache"
+FIGURE_CACHE_ENTRIES = 64
+# Churn triangle - above this many records page 5 draws a density grid of
+# mean APS score over all rows instead of a scatter of a 500-row sample
+CHURN_DENSITY_MIN_ROWS = 5_000
+# Ingestion - only the columns the pipeline uses are parsed; with passthrough
+# the remaining vendor columns are copied to the scored CSV as plain text
+INGEST_PASSTHROUGH = True
+# Columnar cache - CLI runs keep the scored records in a Feather file next to
+# *_scored.csv and reuse it while the source and scoring version are unchanged
+COLUMNAR_CACHE = True
+# Batch mode - files in a directory/glob are processed on this many worker
+# processes; each run writes a JSON manifest to OUTPUT_DIR
+BATCH_WORKERS = min(4, os.cpu_count() or 1)
+# Watch-folder mode - INPUT_DIR is polled every WATCH_POLL_SECONDS; a CSV is
+# processed once its size/mtime hold still for WATCH_SETTLE_SECONDS
+WATCH_WORKERS = 2
+WATCH_POLL_SECONDS = 1.0
+WATCH_SETTLE_SECONDS = 2.0
+# Mixed-feed uploads - a file whose feed_type column holds several feeds gets
+# one PDF per feed, rendered concurrently on this many processes
+SPLIT_RENDER_WORKERS = min(4, os.cpu_count() or 1)
+# Production API server (serve.py) - pre-forked worker processes x threads per
+# worker; job records go to JOB_STATE_DIR so any worker can answer job polls
+SERVER_BIND = "0.0.0.0:5000"
+SERVER_WORKERS = 2
+SERVER_THREADS = 4
+SERVER_TIMEOUT = 300
+JOB_STATE_DIR = OUTPUT_DIR / ".jobs"
+# Streamed uploads - the API reads request bodies in UPLOAD_BLOCK_BYTES blocks,
+# at most UPLOAD_PREFETCH_BLOCKS ahead of the parser, and scores them in
+# UPLOAD_CHUNK_ROWS-row chunks while the rest of the upload is still arriving.
+# A finished request waits at most UPLOAD_PREFETCH_JOIN_SECONDS for its reader
+# thread (which may be stuck on a stalled client; it is a daemon thread)
+UPLOAD_BLOCK_BYTES = 256 * 1024
+UPLOAD_PREFETCH_BLOCKS = 16
+UPLOAD_CHUNK_ROWS = 50_000
+UPLOAD_PREFETCH_JOIN_SECONDS = 1.0
+# JSON scoring (/api/v1/score) - at most SCORE_MAX_RECORDS records per request,
+# scored and streamed back SCORE_BLOCK_ROWS records at a time
+SCORE_MAX_RECORDS = 100_000
+SCORE_BLOCK_ROWS = 1_000
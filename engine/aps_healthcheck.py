@@ -1,230 +1,324 @@
 # 18-Point Health Check - Complete Implementation
+"""
+Each of the 18 checks is a small mergeable accumulator (update / merge /
+result). HealthCheckAccumulator runs all of them in one fused pass per
+chunk over a CheckBatch, which reads the parsed values and dates from the
+normalizer's RecordBatch instead of re-parsing the raw strings.
+"""
 import pandas as pd
 import numpy as np
-from datetime import datetime
+from abc import ABC, abstractmethod
+from functools import cached_property
+from aps_aggregate import QuantileSketch, merge_counts, category_counts
+from aps_normalize import as_record_batch
+from aps_aliases import resolve_columns
 
-def health_check(df):
+CRITICAL_COLUMNS = ['Property Address', 'ZIP', 'EstValue', 'TotalLoanBal', 'LastLoanDate']
+VALID_TIERS = ['Platinum', 'Gold', 'Silver', 'Nurture']
+
+def _grade(pct, pass_at, warn_at=None, low='FAIL'):
+    """PASS at/above pass_at, WARN at/above warn_at, otherwise low"""
+    if pct >= pass_at:
+        return 'PASS'
+    if warn_at is not None and pct >= warn_at:
+        return 'WARN'
+    return low
+
+def _value_column(columns):
+    return resolve_columns(columns).get('property_value', 'property_value')
+
+def _date_column(columns):
+    return resolve_columns(columns).get('loan_date', 'loan_date')
+
+# ==================== SHARED PARSED VIEW ====================
+
+def _match_categories(values, pattern):
+    """Regex-match a categorical column once per category instead of once per row"""
+    matched = np.asarray(values.cat.categories.astype(str).str.match(pattern), dtype=bool)
+    codes = values.cat.codes.to_numpy()
+    return pd.Series(np.append(matched, False)[codes], index=values.index)
+
+class CheckBatch:
+    """One scored chunk: raw frame (df) plus the typed view from the normalizer"""
+    
+    def __init__(self, batch):
+        self.df = batch.frame
+        self.typed = batch.typed
+        self.columns = batch.columns
+    
+    def has(self, *cols):
+        return all(col in self.columns for col in cols)
+    
+    @property
+    def property_values(self):
+        return self.typed['property_value']
+    
+    @property
+    def loan_dates(self):
+        return self.typed['loan_date']
+    
+    @cached_property
+    def zip_valid(self):
+        return _match_categories(self.typed['ZIP'], r'^\d{5}$')
+    
+    @cached_property
+    def state_valid(self):
+        return _match_categories(self.typed['State'], r'^[A-Z]{2}$')
+
+# ==================== PER-CHECK ACCUMULATORS ====================
+
+class CheckAccumulator(ABC):
+    """Base class: one health check's mergeable state"""
+    
+    def __init__(self, key):
+        self.key = key
+    
+    def applies(self, columns):
+        return True
+    
+    @abstractmethod
+    def update(self, batch):
+        """Fold in one CheckBatch"""
+    
+    @abstractmethod
+    def merge(self, other):
+        """Fold in another accumulator of the same check"""
+    
+    @abstractmethod
+    def result(self, total):
+        """Check result dict (status, value, message) over total records"""
+
+class RateCheck(CheckAccumulator):
     """
-    18-Point comprehensive data quality health check
-    Returns dict with check name and status (PASS/WARN/FAIL + details)
+    Counts rows passing a predicate and grades the pass rate.
+    With median_of set, also sketches that column and reports its median.
     """
     
-    checks = {}
-    total_records = len(df)
+    def __init__(self, key, requires, predicate, message, pass_at, warn_at=None, low='FAIL',
+                 median_of=None, value_format=None, missing_value='N/A', missing_message='Column missing'):
+        super().__init__(key)
+        self.requires = requires
+        self.predicate = predicate
+        self.message = message
+        self.pass_at, self.warn_at, self.low = pass_at, warn_at, low
+        self.median_of = median_of
+        self.value_format = value_format
+        self.missing_value = missing_value
+        self.missing_message = missing_message
+        self.passed = 0
+        self.sketch = QuantileSketch() if median_of else None
     
-    # ===== 1. Record Count Check =====
-    checks['1_Record_Count'] = {
-        'status': 'PASS' if total_records > 0 else 'FAIL',
-        'value': total_records,
-        'message': f'{total_records} records found'
-    }
+    def applies(self, columns):
+        return self.requires(columns)
     
-    # ===== 2. Address Completeness =====
-    if 'Property Address' in df.columns:
-        address_complete = df['Property Address'].notna().sum()
-        address_pct = (address_complete / total_records * 100) if total_records > 0 else 0
-        checks['2_Address_Completeness'] = {
-            'status': 'PASS' if address_pct >= 95 else 'WARN' if address_pct >= 80 else 'FAIL',
-            'value': f'{address_pct:.1f}%',
-            'message': f'{address_complete}/{total_records} addresses present'
-        }
-    else:
-        checks['2_Address_Completeness'] = {'status': 'FAIL', 'value': '0%', 'message': 'Column missing'}
-    
-    # ===== 3. ZIP Code Validity =====
-    if 'ZIP' in df.columns:
-        valid_zips = df['ZIP'].astype(str).str.match(r'^\d{5}$').sum()
-        zip_pct = (valid_zips / total_records * 100) if total_records > 0 else 0
-        checks['3_ZIP_Validity'] = {
-            'status': 'PASS' if zip_pct >= 95 else 'WARN' if zip_pct >= 80 else 'FAIL',
-            'value': f'{zip_pct:.1f}%',
-            'message': f'{valid_zips}/{total_records} valid 5-digit ZIPs'
-        }
-    else:
-        checks['3_ZIP_Validity'] = {'status': 'FAIL', 'value': '0%', 'message': 'Column missing'}
-    
-    # ===== 4. Property Value Range Check =====
-    value_col = 'EstValue' if 'EstValue' in df.columns else 'property_value'
-    if value_col in df.columns:
-        value_numeric = pd.to_numeric(df[value_col], errors='coerce')
-        valid_values = ((value_numeric >= 50000) & (value_numeric <= 10000000)).sum()
-        value_pct = (valid_values / total_records * 100) if total_records > 0 else 0
-        median_value = value_numeric.median()
-        checks['4_Property_Value_Range'] = {
-            'status': 'PASS' if value_pct >= 90 else 'WARN' if value_pct >= 70 else 'FAIL',
-            'value': f'${median_value:,.0f}' if not pd.isna(median_value) else 'N/A',
-            'message': f'{valid_values}/{total_records} values in $50K-$10M range'
-        }
-    else:
-        checks['4_Property_Value_Range'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Column missing'}
-    
-    # ===== 5. LTV Range Check (0-100%) =====
-    if 'LTV %' in df.columns:
-        ltv_valid = ((df['LTV %'] >= 0) & (df['LTV %'] <= 100)).sum()
-        ltv_pct = (ltv_valid / total_records * 100) if total_records > 0 else 0
-        median_ltv = df['LTV %'].median()
-        checks['5_LTV_Range'] = {
-            'status': 'PASS' if ltv_pct >= 95 else 'WARN' if ltv_pct >= 80 else 'FAIL',
-            'value': f'{median_ltv:.1f}%' if not pd.isna(median_ltv) else 'N/A',
-            'message': f'{ltv_valid}/{total_records} LTV values 0-100%'
-        }
-    else:
-        checks['5_LTV_Range'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Column missing'}
-    
-    # ===== 6. Equity % Accuracy Check =====
-    if 'Equity %' in df.columns and 'LTV %' in df.columns:
-        equity_accuracy = (abs((df['Equity %'] + df['LTV %']) - 100) < 1).sum()
-        equity_pct = (equity_accuracy / total_records * 100) if total_records > 0 else 0
-        checks['6_Equity_Accuracy'] = {
-            'status': 'PASS' if equity_pct >= 95 else 'WARN' if equity_pct >= 80 else 'FAIL',
-            'value': f'{equity_pct:.1f}%',
-            'message': f'{equity_accuracy}/{total_records} records: Equity% + LTV% = 100%'
-        }
-    else:
-        checks['6_Equity_Accuracy'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Required columns missing'}
-    
-    # ===== 7. Loan Date Format Check =====
-    date_col = 'LastLoanDate' if 'LastLoanDate' in df.columns else 'loan_date'
-    if date_col in df.columns:
-        valid_dates = pd.to_datetime(df[date_col], errors='coerce').notna().sum()
-        date_pct = (valid_dates / total_records * 100) if total_records > 0 else 0
-        checks['7_Loan_Date_Format'] = {
-            'status': 'PASS' if date_pct >= 90 else 'WARN' if date_pct >= 70 else 'FAIL',
-            'value': f'{date_pct:.1f}%',
-            'message': f'{valid_dates}/{total_records} parseable dates'
+    def update(self, batch):
+        self.passed += int(self.predicate(batch).sum())
+        if self.sketch is not None:
+            self.sketch.update(self.median_of(batch))
+    
+    def merge(self, other):
+        self.passed += other.passed
+        if self.sketch is not None:
+            self.sketch.merge(other.sketch)
+    
+    def format_value(self, pct):
+        if self.sketch is None:
+            return f'{pct:.1f}%'
+        median = self.sketch.median()
+        return self.value_format.format(median) if not pd.isna(median) else 'N/A'
+    
+    def format_message(self, total):
+        return self.message.format(n=self.passed, total=total)
+    
+    def result(self, total):
+        pct = (self.passed / total * 100) if total > 0 else 0
+        return {
+            'status': _grade(pct, self.pass_at, self.warn_at, self.low),
+            'value': self.format_value(pct),
+            'message': self.format_message(total)
         }
-    else:
-        checks['7_Loan_Date_Format'] = {'status': 'FAIL', 'value': '0%', 'message': 'Column missing'}
-    
-    # ===== 8. Loan Age Reasonableness =====
-    if 'Loan_Age_Mo' in df.columns:
-        reasonable_age = ((df['Loan_Age_Mo'] >= 0) & (df['Loan_Age_Mo'] <= 360)).sum()
-        age_pct = (reasonable_age / total_records * 100) if total_records > 0 else 0
-        median_age = df['Loan_Age_Mo'].median()
-        checks['8_Loan_Age_Reasonable'] = {
-            'status': 'PASS' if age_pct >= 95 else 'WARN' if age_pct >= 80 else 'FAIL',
-            'value': f'{median_age:.0f} mo' if not pd.isna(median_age) else 'N/A',
-            'message': f'{reasonable_age}/{total_records} ages 0-360 months'
+    
+    def missing(self):
+        return {'status': 'FAIL', 'value': self.missing_value, 'message': self.missing_message}
+
+class TierCheck(RateCheck):
+    """Tier coverage plus the tier distribution (value_counts order)"""
+    
+    def __init__(self, key):
+        super().__init__(
+            key, lambda c: 'APS_Tier' in c, lambda b: b.df['APS_Tier'].isin(VALID_TIERS),
+            None, 95, low='WARN'
+        )
+        self.tier_counts = None
+    
+    def update(self, batch):
+        super().update(batch)
+        tiers = batch.df['APS_Tier']
+        counts = category_counts(tiers) if isinstance(tiers.dtype, pd.CategoricalDtype) else tiers.value_counts(sort=False)
+        self.tier_counts = merge_counts(self.tier_counts, counts)
+    
+    def merge(self, other):
+        super().merge(other)
+        self.tier_counts = merge_counts(self.tier_counts, other.tier_counts)
+    
+    def format_message(self, total):
+        tier_dist = self.tier_counts.sort_values(ascending=False).to_dict() if self.tier_counts is not None else {}
+        return f'Distribution: {tier_dist}'
+
+class RecordCountCheck(CheckAccumulator):
+    def update(self, batch):
+        pass
+    
+    def merge(self, other):
+        pass
+    
+    def result(self, total):
+        return {
+            'status': 'PASS' if total > 0 else 'FAIL',
+            'value': total,
+            'message': f'{total} records found'
         }
-    else:
-        checks['8_Loan_Age_Reasonable'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Column missing'}
+
+def _merge_runs(left, right):
+    """Merge two (sorted distinct hashes, times seen) runs, times seen capped at 2"""
+    hashes = np.concatenate([left[0], right[0]])
+    seen = np.concatenate([left[1], right[1]])
+    order = np.argsort(hashes, kind='stable')  # two sorted runs: a linear merge
+    hashes, seen = hashes[order], seen[order]
+    starts = np.flatnonzero(np.append(True, hashes[1:] != hashes[:-1]))
+    return hashes[starts], np.minimum(np.add.reduceat(seen, starts), 2)
+
+class DuplicateCheck(CheckAccumulator):
+    """
+    Rows whose (Property Address, ZIP) occurs more than once.
+    Keys are 64-bit hashes kept in sorted runs of distinct hashes, each with a
+    seen-once / seen-twice flag (9 bytes per distinct key). A run is merged
+    into the one before it once that is no more than twice its size, so there
+    are O(log n) runs and n rows cost O(n log n) however they are chunked.
+    """
     
-    # ===== 9. Duplicate Detection =====
-    if 'Property Address' in df.columns and 'ZIP' in df.columns:
-        duplicates = df.duplicated(subset=['Property Address', 'ZIP'], keep=False).sum()
-        dup_pct = (duplicates / total_records * 100) if total_records > 0 else 0
-        checks['9_Duplicate_Detection'] = {
+    def __init__(self, key):
+        super().__init__(key)
+        self.rows = 0
+        self.runs = []
+    
+    def applies(self, columns):
+        return 'Property Address' in columns and 'ZIP' in columns
+    
+    def update(self, batch):
+        keys = pd.util.hash_pandas_object(batch.df[['Property Address', 'ZIP']], index=False).to_numpy()
+        self.rows += len(keys)
+        hashes, counts = np.unique(keys, return_counts=True)
+        self._push((hashes, np.minimum(counts, 2).astype('uint8')))
+    
+    def merge(self, other):
+        self.rows += other.rows
+        for run in other.runs:
+            self._push(run)
+    
+    def _push(self, run):
+        if not len(run[0]):
+            return
+        self.runs.append(run)
+        while len(self.runs) > 1 and len(self.runs[-2][0]) <= 2 * len(self.runs[-1][0]):
+            self.runs[-2:] = [_merge_runs(*self.runs[-2:])]
+    
+    def result(self, total):
+        while len(self.runs) > 1:
+            self.runs[-2:] = [_merge_runs(*self.runs[-2:])]
+        singles = int((self.runs[0][1] == 1).sum()) if self.runs else 0
+        duplicates = self.rows - singles
+        dup_pct = (duplicates / total * 100) if total > 0 else 0
+        return {
             'status': 'PASS' if dup_pct == 0 else 'WARN' if dup_pct < 5 else 'FAIL',
             'value': f'{duplicates}',
             'message': f'{duplicates} potential duplicate records ({dup_pct:.1f}%)'
         }
-    else:
-        checks['9_Duplicate_Detection'] = {'status': 'WARN', 'value': 'N/A', 'message': 'Cannot check - missing columns'}
-    
-    # ===== 10. Missing Value Count =====
-    missing_critical = 0
-    critical_cols = ['Property Address', 'ZIP', 'EstValue', 'TotalLoanBal', 'LastLoanDate']
-    for col in critical_cols:
-        if col in df.columns:
-            missing_critical += df[col].isna().sum()
-    
-    missing_pct = (missing_critical / (total_records * len(critical_cols)) * 100) if total_records > 0 else 0
-    checks['10_Missing_Values'] = {
-        'status': 'PASS' if missing_pct < 5 else 'WARN' if missing_pct < 15 else 'FAIL',
-        'value': f'{missing_critical}',
-        'message': f'{missing_pct:.1f}% missing in critical fields'
-    }
     
-    # ===== 11. APS Score Distribution =====
-    if 'APS_Score (v2.0)' in df.columns:
-        valid_scores = ((df['APS_Score (v2.0)'] >= 0) & (df['APS_Score (v2.0)'] <= 100)).sum()
-        score_pct = (valid_scores / total_records * 100) if total_records > 0 else 0
-        median_score = df['APS_Score (v2.0)'].median()
-        checks['11_APS_Score_Distribution'] = {
-            'status': 'PASS' if score_pct >= 95 else 'WARN',
-            'value': f'{median_score:.1f}' if not pd.isna(median_score) else 'N/A',
-            'message': f'{valid_scores}/{total_records} scores in 0-100 range'
-        }
-    else:
-        checks['11_APS_Score_Distribution'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Column missing'}
-    
-    # ===== 12. Tier Assignment Coverage =====
-    if 'APS_Tier' in df.columns:
-        valid_tiers = df['APS_Tier'].isin(['Platinum', 'Gold', 'Silver', 'Nurture']).sum()
-        tier_pct = (valid_tiers / total_records * 100) if total_records > 0 else 0
-        tier_dist = df['APS_Tier'].value_counts().to_dict()
-        checks['12_Tier_Assignment'] = {
-            'status': 'PASS' if tier_pct >= 95 else 'WARN',
-            'value': f'{tier_pct:.1f}%',
-            'message': f'Distribution: {tier_dist}'
-        }
-    else:
-        checks['12_Tier_Assignment'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Column missing'}
-    
-    # ===== 13. CCI Index Validity =====
-    if 'CCI' in df.columns:
-        valid_cci = ((df['CCI'] >= 0) & (df['CCI'] <= 100)).sum()
-        cci_pct = (valid_cci / total_records * 100) if total_records > 0 else 0
-        median_cci = df['CCI'].median()
-        checks['13_CCI_Validity'] = {
-            'status': 'PASS' if cci_pct >= 95 else 'WARN',
-            'value': f'{median_cci:.1f}' if not pd.isna(median_cci) else 'N/A',
-            'message': f'{valid_cci}/{total_records} CCI scores 0-100'
-        }
-    else:
-        checks['13_CCI_Validity'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Column missing'}
-    
-    # ===== 14. State Code Format =====
-    if 'State' in df.columns:
-        valid_states = df['State'].astype(str).str.match(r'^[A-Z]{2}$').sum()
-        state_pct = (valid_states / total_records * 100) if total_records > 0 else 0
-        checks['14_State_Code_Format'] = {
-            'status': 'PASS' if state_pct >= 95 else 'WARN',
-            'value': f'{state_pct:.1f}%',
-            'message': f'{valid_states}/{total_records} valid 2-letter state codes'
-        }
-    else:
-        checks['14_State_Code_Format'] = {'status': 'FAIL', 'value': '0%', 'message': 'Column missing'}
-    
-    # ===== 15. Refi Eligibility Count =====
-    if 'LTV %' in df.columns and 'Loan_Age_Mo' in df.columns:
-        refi_eligible = ((df['LTV %'] <= 80) & (df['Loan_Age_Mo'] >= 18)).sum()
-        refi_pct = (refi_eligible / total_records * 100) if total_records > 0 else 0
-        checks['15_Refi_Eligibility'] = {
-            'status': 'PASS' if refi_pct >= 50 else 'WARN' if refi_pct >= 25 else 'INFO',
-            'value': f'{refi_pct:.1f}%',
-            'message': f'{refi_eligible}/{total_records} meet refi criteria (LTV<=80%, Age>=18mo)'
-        }
-    else:
-        checks['15_Refi_Eligibility'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Required columns missing'}
-    
-    # ===== 16. Owner Name Completeness =====
-    if 'Owner Name' in df.columns:
-        owner_present = df['Owner Name'].notna().sum()
-        owner_pct = (owner_present / total_records * 100) if total_records > 0 else 0
-        checks['16_Owner_Name_Present'] = {
-            'status': 'PASS' if owner_pct >= 90 else 'WARN' if owner_pct >= 70 else 'FAIL',
-            'value': f'{owner_pct:.1f}%',
-            'message': f'{owner_present}/{total_records} records have owner names'
-        }
-    else:
-        checks['16_Owner_Name_Present'] = {'status': 'FAIL', 'value': '0%', 'message': 'Column missing'}
-    
-    # ===== 17. Data Freshness Check =====
-    date_col = 'LastLoanDate' if 'LastLoanDate' in df.columns else 'loan_date'
-    if date_col in df.columns:
-        loan_dates = pd.to_datetime(df[date_col], errors='coerce')
-        recent_loans = (loan_dates >= '2020-01-01').sum()
-        recent_pct = (recent_loans / total_records * 100) if total_records > 0 else 0
-        checks['17_Data_Freshness'] = {
-            'status': 'PASS' if recent_pct >= 70 else 'WARN' if recent_pct >= 40 else 'INFO',
-            'value': f'{recent_pct:.1f}%',
-            'message': f'{recent_loans}/{total_records} loans from 2020 or later'
+    def missing(self):
+        return {'status': 'WARN', 'value': 'N/A', 'message': 'Cannot check - missing columns'}
+
+class MissingValuesCheck(CheckAccumulator):
+    def __init__(self, key):
+        super().__init__(key)
+        self.missing_count = 0
+    
+    def update(self, batch):
+        for col in CRITICAL_COLUMNS:
+            if col in batch.columns:
+                self.missing_count += int(batch.df[col].isna().sum())
+    
+    def merge(self, other):
+        self.missing_count += other.missing_count
+    
+    def result(self, total):
+        missing_pct = (self.missing_count / (total * len(CRITICAL_COLUMNS)) * 100) if total > 0 else 0
+        return {
+            'status': 'PASS' if missing_pct < 5 else 'WARN' if missing_pct < 15 else 'FAIL',
+            'value': f'{self.missing_count}',
+            'message': f'{missing_pct:.1f}% missing in critical fields'
         }
-    else:
-        checks['17_Data_Freshness'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Column missing'}
+
+def build_checks():
+    """Fresh accumulators for checks 1-17 (18 is derived from these)"""
+    def has(*cols):
+        return lambda columns: all(col in columns for col in cols)
     
-    # ===== 18. Overall Data Quality Score =====
+    return [
+        RecordCountCheck('1_Record_Count'),
+        RateCheck('2_Address_Completeness', has('Property Address'),
+                  lambda b: b.df['Property Address'].notna(),
+                  '{n}/{total} addresses present', 95, 80, missing_value='0%'),
+        RateCheck('3_ZIP_Validity', has('ZIP'),
+                  lambda b: b.zip_valid,
+                  '{n}/{total} valid 5-digit ZIPs', 95, 80, missing_value='0%'),
+        RateCheck('4_Property_Value_Range', lambda c: _value_column(c) in c,
+                  lambda b: (b.property_values >= 50000) & (b.property_values <= 10000000),
+                  '{n}/{total} values in $50K-$10M range', 90, 70,
+                  median_of=lambda b: b.property_values, value_format='${:,.0f}'),
+        RateCheck('5_LTV_Range', has('LTV %'),
+                  lambda b: (b.df['LTV %'] >= 0) & (b.df['LTV %'] <= 100),
+                  '{n}/{total} LTV values 0-100%', 95, 80,
+                  median_of=lambda b: b.df['LTV %'], value_format='{:.1f}%'),
+        RateCheck('6_Equity_Accuracy', has('Equity %', 'LTV %'),
+                  lambda b: abs((b.df['Equity %'] + b.df['LTV %']) - 100) < 1,
+                  '{n}/{total} records: Equity% + LTV% = 100%', 95, 80,
+                  missing_message='Required columns missing'),
+        RateCheck('7_Loan_Date_Format', lambda c: _date_column(c) in c,
+                  lambda b: b.loan_dates.notna(),
+                  '{n}/{total} parseable dates', 90, 70, missing_value='0%'),
+        RateCheck('8_Loan_Age_Reasonable', has('Loan_Age_Mo'),
+                  lambda b: (b.df['Loan_Age_Mo'] >= 0) & (b.df['Loan_Age_Mo'] <= 360),
+                  '{n}/{total} ages 0-360 months', 95, 80,
+                  median_of=lambda b: b.df['Loan_Age_Mo'], value_format='{:.0f} mo'),
+        DuplicateCheck('9_Duplicate_Detection'),
+        MissingValuesCheck('10_Missing_Values'),
+        RateCheck('11_APS_Score_Distribution', has('APS_Score (v2.0)'),
+                  lambda b: (b.df['APS_Score (v2.0)'] >= 0) & (b.df['APS_Score (v2.0)'] <= 100),
+                  '{n}/{total} scores in 0-100 range', 95, low='WARN',
+                  median_of=lambda b: b.df['APS_Score (v2.0)'], value_format='{:.1f}'),
+        TierCheck('12_Tier_Assignment'),
+        RateCheck('13_CCI_Validity', has('CCI'),
+                  lambda b: (b.df['CCI'] >= 0) & (b.df['CCI'] <= 100),
+                  '{n}/{total} CCI scores 0-100', 95, low='WARN',
+                  median_of=lambda b: b.df['CCI'], value_format='{:.1f}'),
+        RateCheck('14_State_Code_Format', has('State'),
+                  lambda b: b.state_valid,
+                  '{n}/{total} valid 2-letter state codes', 95, low='WARN', missing_value='0%'),
+        RateCheck('15_Refi_Eligibility', has('LTV %', 'Loan_Age_Mo'),
+                  lambda b: (b.df['LTV %'] <= 80) & (b.df['Loan_Age_Mo'] >= 18),
+                  '{n}/{total} meet refi criteria (LTV<=80%, Age>=18mo)', 50, 25, low='INFO',
+                  missing_message='Required columns missing'),
+        RateCheck('16_Owner_Name_Present', has('Owner Name'),
+                  lambda b: b.df['Owner Name'].notna(),
+                  '{n}/{total} records have owner names', 90, 70, missing_value='0%'),
+        RateCheck('17_Data_Freshness', lambda c: _date_column(c) in c,
+                  lambda b: b.loan_dates >= '2020-01-01',
+                  '{n}/{total} loans from 2020 or later', 70, 40, low='INFO'),
+    ]
+
+def overall_quality(checks):
+    """Check 18: overall grade from the 17 checks before it"""
     pass_count = sum(1 for c in checks.values() if c.get('status') == 'PASS')
     warn_count = sum(1 for c in checks.values() if c.get('status') == 'WARN')
     fail_count = sum(1 for c in checks.values() if c.get('status') == 'FAIL')
@@ -240,10 +334,71 @@ def health_check(df):
     else:
         overall_status = 'POOR'
     
-    checks['18_Overall_Quality'] = {
+    return {
         'status': overall_status,
         'value': f'{quality_score:.1f}%',
         'message': f'Pass:{pass_count} Warn:{warn_count} Fail:{fail_count}'
     }
+
+# ==================== FUSED RUNNER ====================
+
+class HealthCheckAccumulator:
+    """
+    Mergeable state behind the 18-point health check.
+    update() folds in one scored chunk in a single fused pass, merge() combines
+    partial results (chunked or parallel runs), result() formats the dict.
+    """
+    
+    def __init__(self):
+        self.columns = None
+        self.total = 0
+        self.checks = build_checks()
+    
+    @classmethod
+    def combine(cls, parts):
+        """Merge an iterable of partial accumulators into a new one"""
+        combined = cls()
+        for part in parts:
+            combined.merge(part)
+        return combined
+    
+    def update(self, data):
+        """Fold one scored chunk (RecordBatch or scored DataFrame) into every applicable check"""
+        batch = as_record_batch(data)
+        if self.columns is None:
+            self.columns = list(batch.columns)
+        self.total += len(batch)
+        
+        batch = CheckBatch(batch)
+        for check in self.checks:
+            if check.applies(self.columns):
+                check.update(batch)
+        return self
+    
+    def merge(self, other):
+        """Combine with another accumulator (chunked or parallel runs)"""
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self.columns = other.columns
+        self.total += other.total
+        for check, other_check in zip(self.checks, other.checks):
+            check.merge(other_check)
+        return self
     
-    return checks
\ No newline at end of file
+    def result(self):
+        """Format the accumulated state as the 18-point check dict"""
+        columns = self.columns or []
+        checks = {}
+        for check in self.checks:
+            checks[check.key] = check.result(self.total) if check.applies(columns) else check.missing()
+        checks['18_Overall_Quality'] = overall_quality(checks)
+        return checks
+
+def health_check(data):
+    """
+    18-Point comprehensive data quality health check
+    Accepts the normalizer's RecordBatch (preferred) or a scored DataFrame
+    Returns dict with check name and status (PASS/WARN/FAIL + details)
+    """
+    return HealthCheckAccumulator().update(data).result()
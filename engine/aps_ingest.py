@@ -0,0 +1,47 @@
+# aps_ingest.py - Column-projected CSV reading
+"""
+APS Market Intelligence - Ingestion
+Vendor exports carry hundreds of columns but the pipeline reads about a dozen.
+The header is read on its own first and the columns the pipeline uses are
+resolved through the alias map, so the reader only parses those. Every other
+column is either carried through to the scored CSV as plain text (never
+cleaned or typed) or skipped by the parser altogether.
+"""
+import pandas as pd
+from aps_config import INGEST_PASSTHROUGH
+from aps_aliases import resolve_columns
+
+# Columns read by name downstream that aren't alias-map fields
+EXTRA_COLUMNS = ['feed_type', 'Servicer_Name']
+# Low-cardinality columns the reader stores as categoricals instead of strings;
+# they stay categorical through scoring, aggregation and the columnar cache
+CATEGORY_COLUMNS = ['ZIP', 'City', 'State', 'feed_type']
+
+def read_header(csv_path):
+    """Column names of csv_path as pandas labels them (header row only)"""
+    return list(pd.read_csv(csv_path, dtype=str, nrows=0).columns)
+
+def plan_columns(header, passthrough=INGEST_PASSTHROUGH):
+    """
+    Decide what to parse for a CSV header.
+
+    Returns:
+        tuple: (column positions to read, {column: dtype})
+    """
+    used = set(resolve_columns(header).values()) | set(EXTRA_COLUMNS)
+    positions = [i for i, col in enumerate(header) if passthrough or col in used]
+    if not positions and header:
+        positions = [0]  # nothing recognised: keep one column so row counts survive
+    dtype = {header[i]: 'category' if header[i] in CATEGORY_COLUMNS else str for i in positions}
+    return positions, dtype
+
+def read_projected(csv_path, passthrough=INGEST_PASSTHROUGH, chunksize=None, header=None):
+    """
+    pd.read_csv over only the planned columns (file order preserved).
+    Values are read verbatim (no NA inference) so passthrough text round-trips.
+    csv_path may be a binary file object read once from the start (e.g. an
+    upload stream), in which case the caller passes its already-parsed header.
+    Returns a DataFrame, or a chunk reader when chunksize is given.
+    """
+    positions, dtype = plan_columns(read_header(csv_path) if header is None else header, passthrough)
+    return pd.read_csv(csv_path, usecols=positions, dtype=dtype, keep_default_na=False, chunksize=chunksize)
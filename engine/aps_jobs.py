@@ -0,0 +1,305 @@
+# aps_jobs.py - Local background job queue for the API
+"""
+APS Market Intelligence - Job Queue
+Runs pipeline jobs on a local process pool (no external broker) so the API
+can accept an upload, hand back a job id and let clients poll for progress.
+Each worker process has its own matplotlib state, so concurrent renders
+don't share pyplot figures.
+"""
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from aps_pipeline import score_csv, plan_report
+from aps_split import render_feeds
+from aps_trace import tracing, combine_timings
+
+JOB_STAGES = ['score', 'render']
+JOB_ID_PATTERN = re.compile(r'[0-9a-f]{32}')
+
+class QueueFullError(RuntimeError):
+    """Raised when the queue already holds its maximum number of pending jobs"""
+
+class EmptyCSVError(ValueError):
+    """Raised by a job whose CSV has a header but no data rows"""
+
+class StageReporter:
+    """Picklable handle a worker uses to publish which stage its job is in"""
+
+    def __init__(self, job_id, progress):
+        self.job_id = job_id
+        self.progress = progress
+
+    def __call__(self, stage):
+        # Manager dict proxies don't see nested mutation, so write the whole record
+        record = dict(self.progress.get(self.job_id, {}))
+        record.setdefault('stages', {})[stage] = time.time()
+        record['stage'] = stage
+        self.progress[self.job_id] = record
+
+def process_job(csv_path, scored_csv_path, pdf_path, feed_type, report_stage,
+                csv_filename=None, columnar=False, rebuild=False):
+    """
+    Worker-process body: score + health check, then render. Without a
+    feed_type override, an upload mixing feeds gets one PDF per feed.
+    csv_filename (for feed type detection) and the columnar cache options are
+    passed by callers that run on the source file itself rather than an upload.
+
+    Returns:
+        dict: input_records, quality_status/score, the health check summary,
+        pdfs (feed type -> PDF path) and per-stage timings
+    """
+    with tracing() as trace:
+        report_stage('score')
+        hc, report = score_csv(csv_path, scored_csv_path, columnar=columnar, rebuild=rebuild,
+                               report=plan_report(csv_filename, feed_type))
+
+        if report.total_records == 0:
+            Path(scored_csv_path).unlink(missing_ok=True)
+            raise EmptyCSVError("The uploaded CSV file contains no data")
+
+        report_stage('render')
+        pdfs = render_feeds(report, pdf_path, csv_filename=csv_filename, feed_type=feed_type)
+
+    return job_summary(hc, report, pdfs, trace.to_dict())
+
+def render_job(hc, report, pdf_path, feed_type, csv_filename, score_timings, report_stage):
+    """
+    Worker-process body for an upload the API already scored while it streamed
+    in (see aps_upload): render only, from its health check and report.
+    score_timings (the request thread's trace) lead the job's timings.
+
+    Returns:
+        dict: as process_job
+    """
+    with tracing() as trace:
+        report_stage('render')
+        pdfs = render_feeds(report, pdf_path, csv_filename=csv_filename, feed_type=feed_type)
+
+    return job_summary(hc, report, pdfs, combine_timings(score_timings, trace.to_dict()))
+
+def job_summary(hc, report, pdfs, timings):
+    """Result dict of a finished job (see process_job)"""
+    quality_check = hc.get('18_Overall_Quality', {})
+    return {
+        "input_records": report.total_records,
+        "quality_status": quality_check.get('status', 'UNKNOWN'),
+        "quality_score": quality_check.get('value', 'N/A'),
+        "health_check_summary": {
+            "total_checks": len(hc),
+            "passed": sum(1 for c in hc.values() if c.get('status') == 'PASS'),
+            "warnings": sum(1 for c in hc.values() if c.get('status') == 'WARN'),
+            "failed": sum(1 for c in hc.values() if c.get('status') == 'FAIL')
+        },
+        "pdfs": {feed: str(path) for feed, path in pdfs.items()},
+        "timings": timings
+    }
+
+class JobQueue:
+    """
+    Bounded queue of pipeline jobs on a ProcessPoolExecutor.
+    At most max_pending jobs may be queued or running at once; finished jobs
+    are kept (newest history_size) so their status and result stay pollable.
+    With state_dir, each job's record is also written there when it is queued
+    and when it finishes, so the other processes of a multi-worker server can
+    answer status/result requests for it (as queued until it finishes; stage
+    progress is only live in the submitting process).
+    """
+
+    def __init__(self, max_workers, max_pending, history_size=500, state_dir=None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.history_size = history_size
+        self.state_dir = Path(state_dir) if state_dir else None
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+        self._progress = None
+
+    def _start(self):
+        # Pool and progress manager start on first use, not at import
+        if self._manager is None:
+            self._manager = multiprocessing.Manager()
+            self._progress = self._manager.dict()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def _discard_pool(self, executor):
+        """Drop a pool a dead worker broke, so the next submit starts a fresh one"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def pending(self):
+        return sum(1 for job in self._jobs.values() if job['status'] in ('queued', 'running'))
+
+    def submit(self, fn, *args, on_done=None, stages=JOB_STAGES):
+        """
+        Queue fn(*args, report_stage) and return the new job id.
+        on_done(job) runs in this process once the job finishes (done or failed)
+        and may replace job['result']. stages lists the stage names fn reports,
+        in order.
+        """
+        with self._lock:
+            if self.pending() >= self.max_pending:
+                raise QueueFullError(f"Job queue is full ({self.max_pending} pending jobs)")
+            self._start()
+
+            job_id = uuid.uuid4().hex
+            job = {
+                'id': job_id,
+                'status': 'queued',
+                'submitted': time.time(),
+                'finished': None,
+                'result': None,
+                'error': None,
+                'empty_input': False,
+                'stages': list(stages),
+                'event': threading.Event()
+            }
+            reporter = StageReporter(job_id, self._progress)
+            try:
+                future = self._executor.submit(fn, *args, reporter)
+            except BrokenProcessPool:
+                # A worker died since the last submit (its jobs fail in finish)
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                self._start()
+                future = self._executor.submit(fn, *args, reporter)
+            executor = self._executor
+            self._jobs[job_id] = job
+            self._publish(job)
+
+        def finish(future):
+            try:
+                job['result'] = future.result()
+                job['status'] = 'done'
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    # Every job queued or running on this pool fails with it
+                    self._discard_pool(executor)
+                job['error'] = str(e)
+                job['empty_input'] = isinstance(e, EmptyCSVError)
+                job['status'] = 'failed'
+            job['finished'] = time.time()
+            if on_done:
+                try:
+                    on_done(job)
+                except Exception as e:
+                    job['error'] = str(e)
+                    job['status'] = 'failed'
+            self._publish(job)
+            job['event'].set()
+            self._prune()
+
+        future.add_done_callback(finish)
+        return job_id
+
+    def _prune(self):
+        with self._lock:
+            finished = [j for j in self._jobs.values() if j['status'] in ('done', 'failed')]
+            finished.sort(key=lambda j: j['finished'])
+            for job in finished[:max(0, len(finished) - self.history_size)]:
+                del self._jobs[job['id']]
+                self._progress.pop(job['id'], None)
+                if self.state_dir is not None:
+                    (self.state_dir / f"{job['id']}.json").unlink(missing_ok=True)
+
+    def _publish(self, job):
+        """Write job's record to state_dir (with its stage progress once finished)"""
+        if self.state_dir is None:
+            return
+        record = {k: v for k, v in job.items() if k != 'event'}
+        if job['finished'] is not None:
+            record['progress'] = dict(self._progress.get(job['id'], {}))
+        path = self.state_dir / f"{job['id']}.json"
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                # NumPy scalars in health check values -> plain numbers
+                json.dump(record, f, default=lambda v: v.item() if hasattr(v, 'item') else str(v))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠ Job record not written: {e}")
+
+    def _lookup(self, job_id):
+        """Published record of a job submitted by another process, or None"""
+        if self.state_dir is None or not JOB_ID_PATTERN.fullmatch(job_id):
+            return None
+        try:
+            with open(self.state_dir / f"{job_id}.json", encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, job_id):
+        return self._jobs.get(job_id) or self._lookup(job_id)
+
+    def wait(self, job_id):
+        """Block until job_id has finished and its on_done hook has run"""
+        job = self._jobs[job_id]
+        job['event'].wait()
+        return job
+
+    def status(self, job_id):
+        """JSON-ready status (queued/running/done/failed + per-stage progress), or None"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            progress = self._progress.get(job_id, {}) if self._progress is not None else {}
+        else:
+            job = self._lookup(job_id)
+            if job is None:
+                return None
+            progress = job.get('progress', {})
+
+        status = job['status']
+        if status == 'queued' and progress:
+            status = 'running'
+
+        started = progress.get('stages', {})
+        end = job['finished'] or time.time()
+        names = job.get('stages', JOB_STAGES)
+        stages = []
+        for i, name in enumerate(names):
+            if name not in started:
+                stages.append({"name": name, "status": "pending"})
+                continue
+            next_start = started.get(names[i + 1]) if i + 1 < len(names) else None
+            if next_start is not None or status == 'done':
+                stage_status, stage_end = 'done', next_start or end
+            elif status == 'failed':
+                stage_status, stage_end = 'failed', end
+            else:
+                stage_status, stage_end = 'running', end
+            stages.append({
+                "name": name,
+                "status": stage_status,
+                "seconds": round(stage_end - started[name], 3)
+            })
+
+        return {
+            "job_id": job_id,
+            "status": status,
+            "stage": progress.get('stage'),
+            "stages": stages,
+            "error": job['error'],
+            "submitted": job['submitted'],
+            "finished": job['finished']
+        }
+
+    def stats(self):
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending(),
+            "tracked": len(self._jobs)
+        }
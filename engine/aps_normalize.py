@@ -299,129 +299,364 @@ from datetime import datetime
 from pathlib import Path
 import json
 from aps_config import REQUIRED_HEADERS, ENGINE_DIR
+from aps_aliases import resolve_columns
 
-def normalize_and_score(df: pd.DataFrame) -> pd.DataFrame:
+# Bump whenever scoring output changes; cached results are keyed on it
+SCORING_VERSION = '2.0.1'
+
+TIER_LABELS = ['Platinum', 'Gold', 'Silver']
+TIER_DEFAULT = 'Nurture'
+# APS_Tier categories, sorted like astype('category') would sort them
+TIER_CATEGORIES = sorted(TIER_LABELS + [TIER_DEFAULT])
+
+# ==================== VECTORIZED SCORING KERNEL ====================
+
+def round_like_python(values, ndigits=1):
     """
-    Main normalization and scoring function
-    Handles both normalized and raw vendor column names
+    Round an array the way Python's built-in round() rounds a float.
+    np.round works on the scaled binary value, so it disagrees with round()
+    on near-ties like 0.15 -> 0.1; those few elements are re-rounded in Python.
+    """
+    values = np.asarray(values, dtype='float64')
+    rounded = np.round(values, ndigits)
+    scaled = values * (10 ** ndigits)
+    near_tie = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(float(v), ndigits) for v in values[near_tie]]
+    return rounded
+
+def calculate_loan_age_months(loan_dates, today=None):
+    """Whole months between each loan date and today (0 when missing)"""
+    today = today or datetime.now()
+    loan_dates = np.asarray(loan_dates, dtype='datetime64[ns]')
+    # datetime64[M] counts months since 1970-01
+    loan_months = loan_dates.astype('datetime64[M]').astype('int64')
+    months = (today.year - 1970) * 12 + (today.month - 1) - loan_months
+    return np.where(np.isnat(loan_dates), 0, months).clip(min=0).astype('int64')
+
+def calculate_aps_score(equity_pct, loan_age, ltv_pct):
     """
+    APS Score v2.0 (0-100):
+    - Equity weight 40%
+    - Loan age weight 30% (sweet spot: 18-36 months)
+    - LTV weight 30% (lower is better)
+    """
+    equity_pct = np.asarray(equity_pct, dtype='float64')
+    loan_age = np.asarray(loan_age, dtype='float64')
+    ltv_pct = np.asarray(ltv_pct, dtype='float64')
     
-    # Create working columns with consistent names
-    # Property Value
-    if 'EstValue' in df.columns:
-        df['_property_value'] = pd.to_numeric(df['EstValue'].astype(str).str.replace('$', '').str.replace(',', '').str.strip(), errors='coerce')
-    elif 'property_value' in df.columns:
-        df['_property_value'] = pd.to_numeric(df['property_value'].astype(str).str.replace('$', '').str.replace(',', '').str.strip(), errors='coerce')
-    else:
-        df['_property_value'] = 0
+    age_score = np.select(
+        [loan_age < 18, loan_age <= 36, loan_age <= 60],
+        [(loan_age / 18) * 50, 100.0, 100 - ((loan_age - 36) / 24) * 30],
+        default=np.fmax(40, 70 - ((loan_age - 60) / 60) * 30)
+    )
+    ltv_score = 100 - ltv_pct
     
-    # Loan Balance
-    if 'TotalLoanBal' in df.columns:
-        df['_loan_balance'] = pd.to_numeric(df['TotalLoanBal'].astype(str).str.replace('$', '').str.replace(',', '').str.strip(), errors='coerce')
-    elif 'loan_balance' in df.columns:
-        df['_loan_balance'] = pd.to_numeric(df['loan_balance'].astype(str).str.replace('$', '').str.replace(',', '').str.strip(), errors='coerce')
-    else:
-        df['_loan_balance'] = 0
+    return round_like_python(equity_pct * 0.40 + age_score * 0.30 + ltv_score * 0.30, 1)
+
+def assign_tier(aps_score, ltv_pct, equity_dollars):
+    """
+    APS Tier ladder:
+    - Platinum: score >= 80, LTV <= 30%, Equity >= $500K
+    - Gold: score >= 65, LTV <= 50%, Equity >= $300K
+    - Silver: score >= 50, LTV <= 65%, Equity >= $200K
+    - Nurture: everything else
+    Returns a Categorical built straight from tier codes (no per-row strings).
+    """
+    aps_score = np.asarray(aps_score, dtype='float64')
+    ltv_pct = np.asarray(ltv_pct, dtype='float64')
+    equity_dollars = np.asarray(equity_dollars, dtype='float64')
+    
+    codes = np.select(
+        [
+            (aps_score >= 80) & (ltv_pct <= 30) & (equity_dollars >= 500000),
+            (aps_score >= 65) & (ltv_pct <= 50) & (equity_dollars >= 300000),
+            (aps_score >= 50) & (ltv_pct <= 65) & (equity_dollars >= 200000),
+        ],
+        [TIER_CATEGORIES.index(label) for label in TIER_LABELS],
+        default=TIER_CATEGORIES.index(TIER_DEFAULT)
+    ).astype('int8')
+    return pd.Categorical.from_codes(codes, categories=TIER_CATEGORIES)
+
+def calculate_cci(equity_pct, ltv_pct, loan_age):
+    """
+    CCI - Credit Confidence Index (0-100)
+    Equity (0-40) + LTV health (0-35) + loan age maturity (0-25)
+    """
+    equity_pct = np.asarray(equity_pct, dtype='float64')
+    ltv_pct = np.asarray(ltv_pct, dtype='float64')
+    loan_age = np.asarray(loan_age, dtype='float64')
     
-    # Loan Date
-    if 'LastLoanDate' in df.columns:
-        df['_loan_date'] = pd.to_datetime(df['LastLoanDate'], errors='coerce')
-    elif 'loan_date' in df.columns:
-        df['_loan_date'] = pd.to_datetime(df['loan_date'], errors='coerce')
-    else:
-        df['_loan_date'] = pd.NaT
-    
-    # Calculate LTV %
-    df['LTV %'] = ((df['_loan_balance'] / df['_property_value']) * 100).round(2)
-    df['LTV %'] = df['LTV %'].fillna(0).clip(0, 100)
-    
-    # Calculate Equity %
-    df['Equity %'] = (100 - df['LTV %']).round(2)
-    
-    # Calculate Equity Dollars
-    df['Equity_Dollars'] = (df['_property_value'] * (df['Equity %'] / 100)).round(0)
-    
-    # Calculate Loan Age in Months
-    def calculate_months(loan_date):
-        if pd.isna(loan_date):
-            return 0
-        today = datetime.now()
-        years_diff = today.year - loan_date.year
-        months_diff = today.month - loan_date.month
-        total_months = years_diff * 12 + months_diff
-        return max(0, total_months)
-    
-    df['Loan_Age_Mo'] = df['_loan_date'].apply(calculate_months)
-    
-    # Calculate APS Score v2.0
-    def calculate_aps_score(row):
-        equity_pct = row['Equity %']
-        loan_age = row['Loan_Age_Mo']
-        ltv_pct = row['LTV %']
-        
-        # Equity component (0-100)
-        equity_score = equity_pct
-        
-        # Loan age component (optimal 18-36 months)
-        if loan_age < 18:
-            age_score = (loan_age / 18) * 50
-        elif loan_age <= 36:
-            age_score = 100
-        elif loan_age <= 60:
-            age_score = 100 - ((loan_age - 36) / 24) * 30
-        else:
-            age_score = max(40, 70 - ((loan_age - 60) / 60) * 30)
-        
-        # LTV component (lower is better)
-        ltv_score = 100 - ltv_pct
-        
-        # Weighted combination
-        aps_score = (equity_score * 0.40 + age_score * 0.30 + ltv_score * 0.30)
-        return round(aps_score, 1)
+    equity_component = np.fmin(40, (equity_pct / 100) * 40)
+    ltv_component = np.fmax(0, 35 - (ltv_pct / 100) * 35)
+    age_component = np.where(
+        loan_age >= 18,
+        np.fmin(25, 25 * (loan_age / 60)),
+        (loan_age / 18) * 15
+    )
+    
+    return round_like_python(equity_component + ltv_component + age_component, 1)
+
+def score_columns(property_value, loan_balance, loan_dates, today=None):
+    """
+    LTV %, Equity %, Equity_Dollars, Loan_Age_Mo, APS score, tier and CCI from
+    parsed property values and loan balances (NaN when missing) and loan dates
+    (NaT when missing). normalize_batch and the records API both score here.
     
-    df['APS_Score (v2.0)'] = df.apply(calculate_aps_score, axis=1)
+    Returns:
+        dict: scored column name -> array (APS_Tier as a Categorical)
+    """
+    property_value = np.asarray(property_value, dtype='float64')
+    loan_balance = np.asarray(loan_balance, dtype='float64')
+    
+    # LTV % (no value -> 0), Equity % and Equity Dollars
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ltv = np.round((loan_balance / property_value) * 100, 2)
+    ltv = np.clip(np.where(np.isnan(ltv), 0, ltv), 0, 100)
+    equity_pct = np.round(100 - ltv, 2)
+    equity_dollars = np.round(property_value * (equity_pct / 100), 0)
+    
+    loan_age = calculate_loan_age_months(loan_dates, today)
+    aps_score = calculate_aps_score(equity_pct, loan_age, ltv)
+    return {
+        'LTV %': ltv,
+        'Equity %': equity_pct,
+        'Equity_Dollars': equity_dollars,
+        'Loan_Age_Mo': loan_age,
+        'APS_Score (v2.0)': aps_score,
+        'APS_Tier': assign_tier(aps_score, ltv, equity_dollars),
+        'CCI': calculate_cci(equity_pct, ltv, loan_age),
+    }
+
+# ==================== PARSING ====================
+
+def clean_numeric(series):
+    """Strip $, commas and whitespace and parse to float64 (unparseable -> NaN)"""
+    # One pass of plain str methods; the .str accessor makes three
+    cleaned = [v.replace('$', '').replace(',', '').strip() for v in series.astype(str).to_numpy()]
+    return pd.Series(pd.to_numeric(cleaned, errors='coerce'), index=series.index)
+
+# Loan date layouts seen in vendor feeds; earlier wins ties (month-first before day-first)
+DATE_FORMATS = ['%m/%d/%Y', '%Y-%m-%d', '%m-%d-%Y', '%d/%m/%Y', '%Y/%m/%d']
+DATE_SAMPLE_SIZE = 200
+# Distinct date strings a LoanDateParser remembers across chunks
+DATE_MEMO_SIZE = 200_000
+# ISO 8601 date[time], optionally with a UTC offset; the first group is the local part
+ISO_DATETIME = r'^(\d{4}-\d\d-\d\d(?:[Tt ]\d\d(?::\d\d(?::\d\d(?:\.\d+)?)?)?)?)(?:\s*(?:[Zz]|[+-]\d\d(?::?\d\d)?))?$'
+
+def infer_date_format(values, sample_size=DATE_SAMPLE_SIZE):
+    """The DATE_FORMATS entry that parses most of an evenly spaced sample of values (None if none fit)"""
+    step = max(1, len(values) // sample_size)
+    sample = values[::step][:sample_size]
+    best, best_hits = None, 0
+    for fmt in DATE_FORMATS:
+        hits = int(pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum())
+        if hits > best_hits:
+            best, best_hits = fmt, hits
+        if hits == len(sample):
+            break  # no later format can fit more
+    return best
+
+def _parse_free_form(value):
+    # pandas' own parser; a UTC offset is dropped, keeping the local date and
+    # time; NaT outside datetime64[ns]
+    try:
+        parsed = pd.to_datetime(value)
+        if parsed.tzinfo is not None:
+            parsed = parsed.tz_localize(None)
+        return parsed.as_unit('ns')
+    except (ValueError, TypeError, OverflowError):
+        return pd.NaT
+
+class LoanDateParser:
+    """
+    Parses loan date columns to datetime64 (unparseable -> NaT), chunk after
+    chunk of the same file. Dates repeat heavily, so each distinct string is
+    parsed once: the dominant format is inferred from a sample of the first
+    chunk, the other DATE_FORMATS entries and then ISO 8601 pick up what it
+    doesn't fit (one vectorized call each), and only strings none of them fit
+    go through pandas' own parser one by one. Parsed strings are remembered
+    (up to DATE_MEMO_SIZE of them) for the following chunks.
+    A string parses the same way under the same format, so a parser given a
+    format (elect=False) can be shared by unrelated inputs elected to it.
+    """
     
-    # Assign APS Tier
-    def assign_tier(row):
-        score = row['APS_Score (v2.0)']
-        ltv = row['LTV %']
-        equity_dollars = row['Equity_Dollars']
-        
-        if score >= 80 and ltv <= 30 and equity_dollars >= 500000:
-            return 'Platinum'
-        elif score >= 65 and ltv <= 50 and equity_dollars >= 300000:
-            return 'Gold'
-        elif score >= 50 and ltv <= 65 and equity_dollars >= 200000:
-            return 'Silver'
-        else:
-            return 'Nurture'
-    
-    df['APS_Tier'] = df.apply(assign_tier, axis=1)
-    
-    # Calculate CCI (Credit Confidence Index)
-    def calculate_cci(row):
-        equity_pct = row['Equity %']
-        ltv_pct = row['LTV %']
-        loan_age = row['Loan_Age_Mo']
+    def __init__(self, format=None, elect=True, memo_size=DATE_MEMO_SIZE):
+        self.format = format
+        self.elect = elect
+        self.memo_size = memo_size
+        # (distinct raw values, their dates), replaced whole so concurrent callers see a matching pair
+        self._memo = (pd.Index([], dtype=object), np.array([], dtype='datetime64[ns]'))
+    
+    @staticmethod
+    def _texts(uniques):
+        return np.array([str(v).strip() for v in uniques], dtype=object)
+    
+    @classmethod
+    def elect_format(cls, series):
+        """The format a new parser would elect on series as its first chunk (None if none fits)"""
+        texts = cls._texts(pd.factorize(series)[1])
+        return infer_date_format(texts[texts != ''])
+    
+    def __call__(self, series):
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series
         
-        # Equity component (0-40 points)
-        equity_component = min(40, (equity_pct / 100) * 40)
+        codes, uniques = pd.factorize(series)
+        uniques = pd.Index(uniques, dtype=object)
+        known, known_dates = self._memo
+        positions = known.get_indexer(uniques)
+        # Trailing NaT: position -1 (not seen before)
+        parsed = np.append(known_dates, np.datetime64('NaT', 'ns'))[positions]
+        new = np.flatnonzero(positions < 0)
+        if len(new):
+            parsed[new] = self._parse(uniques[new])
+            self._remember(uniques[new], parsed[new])
         
-        # LTV component (0-35 points)
-        ltv_component = max(0, 35 - (ltv_pct / 100) * 35)
+        # Code -1 (missing) picks the trailing NaT
+        values = np.append(parsed, np.datetime64('NaT', 'ns'))[codes]
+        return pd.Series(values, index=series.index, dtype='datetime64[ns]')
+    
+    def _parse(self, uniques):
+        """datetime64[ns] array for distinct strings not seen before"""
+        texts = self._texts(uniques)
+        parsed = np.full(len(texts), np.datetime64('NaT', 'ns'))
+        rest = texts != ''
+        if self.format is None and self.elect:
+            self.format = infer_date_format(texts[rest])
         
-        # Loan age component (0-25 points)
-        if loan_age >= 18:
-            age_component = min(25, 25 * (loan_age / 60))
-        else:
-            age_component = (loan_age / 18) * 15
-        
-        cci = equity_component + ltv_component + age_component
-        return round(cci, 1)
+        formats = [self.format] + [fmt for fmt in DATE_FORMATS if fmt != self.format] if self.format else DATE_FORMATS
+        for fmt in formats:
+            if not rest.any():
+                break
+            parsed[rest] = pd.to_datetime(texts[rest], format=fmt, errors='coerce').astype('datetime64[ns]')
+            rest &= np.isnat(parsed)
+        if rest.any():
+            local = pd.Series(texts[rest], dtype=object).str.extract(ISO_DATETIME, expand=False)
+            parsed[rest] = pd.to_datetime(local, format='ISO8601', errors='coerce').astype('datetime64[ns]')
+            rest &= np.isnat(parsed)
+        if rest.any():
+            parsed[rest] = pd.DatetimeIndex([_parse_free_form(v) for v in texts[rest]], dtype='datetime64[ns]')
+        return parsed
+    
+    def _remember(self, uniques, parsed):
+        known, known_dates = self._memo
+        room = self.memo_size - len(known)
+        if room > 0:
+            self._memo = (known.append(uniques[:room]), np.concatenate([known_dates, parsed[:room]]))
+
+def parse_loan_dates(series):
+    """Parse one loan date column to datetime64 (unparseable -> NaT); see LoanDateParser"""
+    return LoanDateParser()(series)
+
+# ==================== TYPED RECORD BATCH ====================
+
+CATEGORICAL_COLUMNS = ['ZIP', 'City', 'State', 'APS_Tier']
+SCORE_COLUMNS = ['LTV %', 'Equity %', 'Equity_Dollars', 'Loan_Age_Mo', 'APS_Score (v2.0)', 'CCI']
+
+class RecordBatch:
+    """
+    One normalized + scored set of records, parsed once.
+    - frame: vendor columns + derived scores, exactly what goes to *_scored.csv
+    - typed: float64 property_value / loan_balance, datetime64 loan_date, the score
+      columns, and categorical ZIP / City / State / APS_Tier
+    The health check and report aggregates read typed instead of re-parsing strings.
+    Categorical columns the frame already holds are shared with typed, not copied.
+    """
     
-    df['CCI'] = df.apply(calculate_cci, axis=1)
+    def __init__(self, frame, typed):
+        self.frame = frame
+        self.typed = typed
+    
+    def __len__(self):
+        return len(self.frame)
+    
+    @property
+    def columns(self):
+        return self.frame.columns
+    
+    def slice(self, start, stop):
+        """Rows start:stop as a RecordBatch over the same data (no copy)"""
+        return RecordBatch(self.frame.iloc[start:stop], self.typed.iloc[start:stop])
+    
+    def take(self, positions):
+        """Rows at positions (in that order) as a new RecordBatch"""
+        return RecordBatch(self.frame.take(positions), self.typed.take(positions))
+    
+    @classmethod
+    def build(cls, frame, property_value, loan_balance, loan_date):
+        typed = {
+            'property_value': property_value,
+            'loan_balance': loan_balance,
+            'loan_date': loan_date,
+        }
+        for col in SCORE_COLUMNS:
+            if col in frame.columns:
+                typed[col] = frame[col]
+        for col in CATEGORICAL_COLUMNS:
+            if col in frame.columns:
+                values = frame[col]
+                typed[col] = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype('category')
+        return cls(frame, pd.DataFrame(typed, index=frame.index, copy=False))
+    
+    @classmethod
+    def from_scored(cls, frame):
+        """Typed view of an already-scored frame (parses the raw value/date columns once)"""
+        resolved = resolve_columns(frame.columns)
+        value_col = resolved.get('property_value')
+        balance_col = resolved.get('loan_balance')
+        date_col = resolved.get('loan_date')
+        return cls.build(
+            frame,
+            clean_numeric(frame[value_col]) if value_col else pd.Series(np.nan, index=frame.index),
+            clean_numeric(frame[balance_col]) if balance_col else pd.Series(np.nan, index=frame.index),
+            parse_loan_dates(frame[date_col]) if date_col else pd.Series(pd.NaT, index=frame.index, dtype='datetime64[ns]'),
+        )
+
+def as_record_batch(data):
+    """Accept a RecordBatch or a scored DataFrame"""
+    return data if isinstance(data, RecordBatch) else RecordBatch.from_scored(data)
+
+# ==================== NORMALIZE & SCORE ====================
+
+def normalize_batch(df: pd.DataFrame, parse_dates=parse_loan_dates, today=None) -> RecordBatch:
+    """
+    Main normalization and scoring function
+    Handles APS, normalized and vendor column names (resolved via the alias map).
+    Chunks of one file should share a LoanDateParser as parse_dates.
+    Loan age is counted up to today (default: now).
+    Returns a RecordBatch: the scored frame plus its parsed, typed view.
+    """
     
-    # Clean up temporary columns
-    df = df.drop(columns=['_property_value', '_loan_balance', '_loan_date'], errors='ignore')
+    # Parse each source column once, with consistent names
+    resolved = resolve_columns(df.columns)
     
-    return df
\ No newline at end of file
+    # Low-cardinality text as categoricals (read_projected already reads them so)
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    
+    # Property Value
+    value_col = resolved.get('property_value')
+    property_value = clean_numeric(df[value_col]) if value_col else pd.Series(0, index=df.index)
+    
+    # Loan Balance
+    balance_col = resolved.get('loan_balance')
+    loan_balance = clean_numeric(df[balance_col]) if balance_col else pd.Series(0, index=df.index)
+    
+    # Loan Date
+    date_col = resolved.get('loan_date')
+    if date_col:
+        loan_date = parse_dates(df[date_col])
+    else:
+        loan_date = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+    
+    # LTV, equity, loan age, score, tier and CCI - columnar, one pass each
+    for col, values in score_columns(property_value, loan_balance, loan_date, today).items():
+        df[col] = values
+    
+    return RecordBatch.build(df, property_value.astype('float64'), loan_balance.astype('float64'), loan_date)
+
+def normalize_and_score(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize and score, returning only the scored frame (see normalize_batch)"""
+    return normalize_batch(df).frame
@@ -0,0 +1,101 @@
+# aps_page_registry.py - Page id -> lazily imported page builder
+"""
+APS Market Intelligence - Page Registry
+Every page id a feed layout (FEED_TYPES[...]['pages']) can list is registered
+here against the module and function that build it, plus what it reads:
+- columns: scored columns the page's figure needs (no figure is drawn without them)
+- aggregates: ReportAccumulator aggregates the page reads (REPORT_AGGREGATES)
+- themed: the builder takes the feed's color theme
+- chart: name of a function in the same module returning the page's
+  render_charts() job, drawn up front with the other figures
+Modules are imported the first time one of their pages is rendered, so a
+report only loads the builders (and chart code) it uses, and the pipeline
+asks report_aggregates() which aggregates to compute at all.
+"""
+import importlib
+from aps_feed_config import get_page_list
+from aps_aggregate import MATRIX_COLUMNS, SAMPLE_COLUMNS
+
+class PageSpec:
+    """One registered page; module None marks a page drawn as part of another"""
+
+    def __init__(self, page_id, module, builder, columns=(), aggregates=(), themed=False, chart=None):
+        self.page_id = page_id
+        self.module = module
+        self.builder = builder
+        self.columns = tuple(columns)
+        self.aggregates = frozenset(aggregates)
+        self.themed = themed
+        self.chart = chart
+
+    def _attr(self, name):
+        return getattr(importlib.import_module(self.module), name)
+
+    def chart_job(self, report, colors_theme):
+        """(draw function, args) for this page's figure, or None when it has none or lacks its columns"""
+        if self.chart is None or not report.has(*self.columns):
+            return None
+        return self._attr(self.chart)(report, colors_theme)
+
+    def render(self, story, styles, report, colors_theme, charts):
+        if self.module is None:
+            return
+        args = [story, styles, report]
+        if self.themed:
+            args.append(colors_theme)
+        if self.chart is not None:
+            args.append(charts.get(self.page_id))
+        self._attr(self.builder)(*args)
+
+PAGES = {}
+
+def register_page(page_id, module, builder, **options):
+    PAGES[page_id] = PageSpec(page_id, module, builder, **options)
+
+def get_page(page_id):
+    """Registered PageSpec for page_id, or None (rendered as a placeholder)"""
+    return PAGES.get(page_id)
+
+def required_aggregates(page_ids):
+    """Union of the aggregates the given pages read"""
+    needs = set()
+    for page_id in page_ids:
+        spec = PAGES.get(page_id)
+        if spec is not None:
+            needs |= spec.aggregates
+    return needs
+
+def report_aggregates(feed_type):
+    """Aggregates a feed_type report reads (pass to ReportAccumulator)"""
+    return required_aggregates(get_page_list(feed_type))
+
+# ==================== PAGES ====================
+
+# Core pages (aps_pages)
+register_page('cover_summary', 'aps_pages', 'create_page1_cover', aggregates={'summary', 'counts'})
+register_page('zip_insights', 'aps_pages', 'create_page2_zip_insights', aggregates={'zip_cube'})
+register_page('institutional_opportunity', 'aps_pages', 'create_page3_institutional_summary',
+              aggregates={'summary'})
+register_page('heat_map', 'aps_pages', 'create_page4_heatmap', columns=('ZIP', 'APS_Score (v2.0)'),
+              aggregates={'zip_cube'}, chart='heat_map_job')
+register_page('churn_triangle', 'aps_pages', 'create_page5_churn_triangle', columns=SAMPLE_COLUMNS,
+              aggregates={'churn'}, chart='churn_triangle_job')
+register_page('qa_schema', 'aps_pages', 'create_page6_qa_schema')
+register_page('sample_data', 'aps_pages', 'create_page7_sample_data', aggregates={'top_rows'})
+
+# Transactional Momentum
+register_page('transaction_velocity', 'aps_pages_momentum', 'create_transaction_velocity_page',
+              aggregates={'loan_ages'}, themed=True)
+register_page('dom_analysis', 'aps_pages_momentum', 'create_dom_analysis_page', themed=True)
+
+# Predictive Churn
+register_page('churn_models', 'aps_pages_churn', 'create_churn_models_page', themed=True,
+              chart='churn_models_job')
+register_page('dual_model_framework', None, None)  # drawn on the churn_models page
+register_page('risk_tiers', 'aps_pages_churn', 'create_risk_tiers_page', aggregates={'loan_ages'}, themed=True)
+register_page('prediction_matrix', 'aps_pages_churn', 'create_prediction_matrix_page', columns=MATRIX_COLUMNS,
+              aggregates={'matrix'}, themed=True, chart='prediction_matrix_job')
+
+# Lender Engagement
+register_page('lender_patterns', 'aps_pages_lender', 'create_lender_patterns_page', aggregates={'counts'},
+              themed=True)
@@ -6,11 +6,8 @@ from reportlab.lib import colors
 from reportlab.platypus import Table, TableStyle, Paragraph, Spacer, PageBreak, Image
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
 from io import BytesIO
+from aps_config import CHURN_DENSITY_MIN_ROWS
 
 # Brand Colors
 BRAND_COLORS = {
@@ -21,21 +18,21 @@ BRAND_COLORS = {
     'light_gray': '#ECF0F1'
 }
 
-def generate_summary_metrics(df):
+def generate_summary_metrics(report):
     """Calculate summary metrics for cover page"""
-    total_records = len(df)
-    median_ltv = df['LTV %'].median() if 'LTV %' in df.columns else 0
-    median_equity_pct = df['Equity %'].median() if 'Equity %' in df.columns else 0
+    total_records = report.total_records
+    median_ltv = report.median('LTV %') if report.has('LTV %') else 0
+    median_equity_pct = report.median('Equity %') if report.has('Equity %') else 0
     
-    if 'Equity_Dollars' in df.columns:
-        median_equity_dollars = df['Equity_Dollars'].median()
+    if report.has('Equity_Dollars'):
+        median_equity_dollars = report.median('Equity_Dollars')
     else:
         median_equity_dollars = 0
     
-    median_loan_age = df['Loan_Age_Mo'].median() if 'Loan_Age_Mo' in df.columns else 0
+    median_loan_age = report.median('Loan_Age_Mo') if report.has('Loan_Age_Mo') else 0
     
-    if 'LTV %' in df.columns and 'Loan_Age_Mo' in df.columns:
-        refi_count = ((df['LTV %'] <= 80) & (df['Loan_Age_Mo'] >= 18)).sum()
+    if report.has('LTV %', 'Loan_Age_Mo'):
+        refi_count = report.refi_count
         refi_pct = (refi_count / total_records * 100) if total_records > 0 else 0
     else:
         refi_pct = 0
@@ -49,7 +46,7 @@ def generate_summary_metrics(df):
         'refi_opportunity_pct': refi_pct
     }
 
-def create_page1_cover(story, styles, df):
+def create_page1_cover(story, styles, report):
     """Page 1: Cover + Summary Metrics"""
     
     title_style = ParagraphStyle(
@@ -72,9 +69,9 @@ def create_page1_cover(story, styles, df):
         spaceAfter=20
     )
     
-    if 'City' in df.columns and 'State' in df.columns:
-        city = df['City'].mode()[0] if len(df['City'].mode()) > 0 else 'Market'
-        state = df['State'].mode()[0] if len(df['State'].mode()) > 0 else ''
+    if report.has('City', 'State'):
+        city = report.mode('City') if report.mode('City') is not None else 'Market'
+        state = report.mode('State') if report.mode('State') is not None else ''
         market_name = f"{city}, {state} Q4 2025"
     else:
         market_name = "Market Analysis Q4 2025"
@@ -82,7 +79,7 @@ def create_page1_cover(story, styles, df):
     story.append(Paragraph(market_name, subtitle_style))
     story.append(Spacer(1, 0.5*inch))
     
-    metrics = generate_summary_metrics(df)
+    metrics = generate_summary_metrics(report)
     
     data = [
         ['Metric', 'Value'],
@@ -130,7 +127,7 @@ def create_page1_cover(story, styles, df):
     story.append(Paragraph(commentary, commentary_style))
     story.append(PageBreak())
 
-def create_page2_zip_insights(story, styles, df):
+def create_page2_zip_insights(story, styles, report):
     """Page 2: ZIP-Level Insights Table"""
     
     title_style = ParagraphStyle(
@@ -143,28 +140,16 @@ def create_page2_zip_insights(story, styles, df):
     story.append(Paragraph("ZIP-Level Insights & Market Churn Map", title_style))
     story.append(Spacer(1, 0.3*inch))
     
-    if 'ZIP' in df.columns:
-        zip_groups = df.groupby('ZIP').agg({
-            'Equity_Dollars': 'median',
-            'LTV %': 'median',
-            'APS_Tier': lambda x: (x == 'Platinum').sum() + (x == 'Gold').sum()
-        }).reset_index()
+    if report.has('ZIP'):
+        zip_groups = report.zip_summary().copy()
         
-        zip_groups.columns = ['ZIP', 'Median_Equity', 'Est_LTV', 'Tier1_Count']
-        
-        def get_churn_potential(ltv):
-            if ltv < 50:
-                return 'High'
-            elif ltv < 65:
-                return 'Medium-High'
-            elif ltv < 75:
-                return 'Medium'
-            else:
-                return 'Low'
-        
-        zip_groups['Churn_Potential'] = zip_groups['Est_LTV'].apply(get_churn_potential)
-        zip_groups['Opportunity_Class'] = zip_groups['Churn_Potential'].apply(
-            lambda x: 'Tier 1' if x in ['High', 'Medium-High'] else 'Tier 2'
+        # Churn potential by median LTV band (missing LTV -> Low)
+        ltv = zip_groups['Est_LTV'].to_numpy(dtype='float64')
+        zip_groups['Churn_Potential'] = np.select(
+            [ltv < 50, ltv < 65, ltv < 75], ['High', 'Medium-High', 'Medium'], default='Low'
+        )
+        zip_groups['Opportunity_Class'] = np.where(
+            zip_groups['Churn_Potential'].isin(['High', 'Medium-High']), 'Tier 1', 'Tier 2'
         )
         
         zip_groups = zip_groups.sort_values('Tier1_Count', ascending=False)
@@ -209,7 +194,7 @@ def create_page2_zip_insights(story, styles, df):
     story.append(Paragraph(commentary, styles['Normal']))
     story.append(PageBreak())
 
-def create_page3_institutional_summary(story, styles, df):
+def create_page3_institutional_summary(story, styles, report):
     """Page 3: Institutional Opportunity Summary"""
     
     title_style = ParagraphStyle(
@@ -222,7 +207,7 @@ def create_page3_institutional_summary(story, styles, df):
     story.append(Paragraph("Institutional Opportunity Summary – APS Predictive Churn Layer", title_style))
     story.append(Spacer(1, 0.3*inch))
     
-    avg_equity = df['Equity_Dollars'].mean() if 'Equity_Dollars' in df.columns else 0
+    avg_equity = report.mean('Equity_Dollars') if report.has('Equity_Dollars') else 0
     
     data = [
         ['Metric', 'Value', 'Strategic Note'],
@@ -259,8 +244,8 @@ def create_page3_institutional_summary(story, styles, df):
     story.append(Paragraph(explanation, styles['Normal']))
     story.append(PageBreak())
 
-def create_page4_heatmap(story, styles, df):
-    """Page 4: ZIP Heat Map"""
+def create_page4_heatmap(story, styles, report, chart=None):
+    """Page 4: ZIP Heat Map (chart: pre-rendered PNG bytes, drawn here if omitted)"""
     
     title_style = ParagraphStyle(
         'SectionTitle',
@@ -272,41 +257,12 @@ def create_page4_heatmap(story, styles, df):
     story.append(Paragraph("Equity on the Move - Q4 2025 Insights", title_style))
     story.append(Spacer(1, 0.2*inch))
     
-    if 'ZIP' in df.columns and 'APS_Score (v2.0)' in df.columns:
-        zip_scores = df.groupby('ZIP')['APS_Score (v2.0)'].mean().reset_index()
-        
-        fig, ax = plt.subplots(figsize=(8, 6), dpi=300)
-        
-        colors_list = []
-        for score in zip_scores['APS_Score (v2.0)']:
-            if score >= 70:
-                colors_list.append(BRAND_COLORS['teal'])
-            elif score >= 50:
-                colors_list.append(BRAND_COLORS['yellow'])
-            else:
-                colors_list.append(BRAND_COLORS['red'])
-        
-        bars = ax.barh(zip_scores['ZIP'].astype(str), zip_scores['APS_Score (v2.0)'], color=colors_list)
+    if report.has('ZIP', 'APS_Score (v2.0)'):
+        if chart is None:
+            draw, args = heat_map_job(report)
+            chart = draw(*args)
         
-        ax.set_xlabel('Average APS Score', fontsize=12, fontweight='bold')
-        ax.set_ylabel('ZIP Code', fontsize=12, fontweight='bold')
-        ax.set_title('Market Heat Map - APS Score by ZIP', fontsize=14, fontweight='bold', pad=20)
-        ax.set_xlim(0, 100)
-        ax.grid(axis='x', alpha=0.3)
-        
-        teal_patch = mpatches.Patch(color=BRAND_COLORS['teal'], label='High Score (70+)')
-        yellow_patch = mpatches.Patch(color=BRAND_COLORS['yellow'], label='Medium Score (50-70)')
-        red_patch = mpatches.Patch(color=BRAND_COLORS['red'], label='Low Score (<50)')
-        ax.legend(handles=[teal_patch, yellow_patch, red_patch], loc='lower right')
-        
-        plt.tight_layout()
-        
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close()
-        
-        img = Image(img_buffer, width=6.5*inch, height=4.5*inch)
+        img = Image(BytesIO(chart), width=6.5*inch, height=4.5*inch)
         story.append(img)
     else:
         story.append(Paragraph("Heat map data not available", styles['Normal']))
@@ -316,8 +272,20 @@ def create_page4_heatmap(story, styles, df):
     story.append(Paragraph(legend_text, styles['Normal']))
     story.append(PageBreak())
 
-def create_page5_churn_triangle(story, styles, df):
-    """Page 5: Churn Triangle Visualization"""
+def heat_map_job(report, colors_theme=None):
+    """Page 4 figure as (draw function, args)"""
+    from aps_charts import draw_zip_heatmap
+    return draw_zip_heatmap, (report.zip_scores(), BRAND_COLORS)
+
+def churn_triangle_job(report, colors_theme=None):
+    """Page 5 figure as (draw function, args): density grid for large inputs, else sample scatter"""
+    from aps_charts import draw_churn_triangle, draw_churn_density
+    if report.total_records > CHURN_DENSITY_MIN_ROWS:
+        return draw_churn_density, (*report.churn_density(), report.total_records)
+    return draw_churn_triangle, (report.churn_sample(),)
+
+def create_page5_churn_triangle(story, styles, report, chart=None):
+    """Page 5: Churn Triangle Visualization (chart: pre-rendered PNG bytes, drawn here if omitted)"""
     
     title_style = ParagraphStyle(
         'SectionTitle',
@@ -329,49 +297,19 @@ def create_page5_churn_triangle(story, styles, df):
     story.append(Paragraph("Predictive Churn Curve — APS Market Velocity Index", title_style))
     story.append(Spacer(1, 0.2*inch))
     
-    if 'Loan_Age_Mo' in df.columns and 'Equity %' in df.columns and 'APS_Score (v2.0)' in df.columns:
-        fig, ax = plt.subplots(figsize=(8, 6), dpi=300)
-        
-        df_sample = df.sample(n=min(500, len(df)), random_state=42)
-        
-        scatter = ax.scatter(
-            df_sample['Loan_Age_Mo'],
-            df_sample['Equity %'],
-            c=df_sample['APS_Score (v2.0)'],
-            cmap='RdYlGn',
-            s=50,
-            alpha=0.6,
-            edgecolors='black',
-            linewidth=0.5
-        )
-        
-        ax.set_xlabel('Loan Age (Months)', fontsize=12, fontweight='bold')
-        ax.set_ylabel('Equity %', fontsize=12, fontweight='bold')
-        ax.set_title('Churn Triangle: Loan Age vs Equity (Color = APS Score)', fontsize=14, fontweight='bold', pad=20)
-        ax.grid(True, alpha=0.3)
+    if report.has('Loan_Age_Mo', 'Equity %', 'APS_Score (v2.0)'):
+        if chart is None:
+            draw, args = churn_triangle_job(report)
+            chart = draw(*args)
         
-        cbar = plt.colorbar(scatter, ax=ax)
-        cbar.set_label('APS Score', rotation=270, labelpad=20)
-        
-        ax.axvspan(18, 36, alpha=0.1, color='green', label='Prime Refi Window')
-        ax.axhline(y=40, color='blue', linestyle='--', alpha=0.5, label='Min Equity Threshold')
-        ax.legend(loc='upper right')
-        
-        plt.tight_layout()
-        
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close()
-        
-        img = Image(img_buffer, width=6.5*inch, height=4.5*inch)
+        img = Image(BytesIO(chart), width=6.5*inch, height=4.5*inch)
         story.append(img)
     else:
         story.append(Paragraph("Churn triangle data not available", styles['Normal']))
     
     story.append(PageBreak())
 
-def create_page6_qa_schema(story, styles, df):
+def create_page6_qa_schema(story, styles, report):
     """Page 6: QA Schema Table"""
     
     title_style = ParagraphStyle(
@@ -416,7 +354,7 @@ def create_page6_qa_schema(story, styles, df):
     story.append(t)
     story.append(PageBreak())
 
-def create_page7_sample_data(story, styles, df):
+def create_page7_sample_data(story, styles, report):
     """Page 7: Sample Data Preview"""
     
     title_style = ParagraphStyle(
@@ -429,10 +367,7 @@ def create_page7_sample_data(story, styles, df):
     story.append(Paragraph("Sample Data Preview", title_style))
     story.append(Spacer(1, 0.3*inch))
     
-    if 'APS_Score (v2.0)' in df.columns:
-        df_sample = df.nlargest(12, 'APS_Score (v2.0)')
-    else:
-        df_sample = df.head(12)
+    df_sample = report.top_rows
     
     display_cols = ['Property Address', 'City', 'State', 'LTV %', 'Equity %', 'Loan_Age_Mo', 'APS_Score (v2.0)', 'APS_Tier']
     available_cols = [col for col in display_cols if col in df_sample.columns]
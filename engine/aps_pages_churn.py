@@ -0,0 +1,218 @@
+# aps_pages_churn.py - Predictive Churn feed pages
+"""
+APS Market Intelligence - Predictive Churn Pages
+Churn models, risk tiers and the prediction matrix. Imported only when a
+report lists one of these pages (see aps_page_registry); the chart module
+is imported by the chart jobs, not at import time.
+"""
+import numpy as np
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+from reportlab.platypus import Table, TableStyle, Paragraph, Spacer, PageBreak, Image
+from reportlab.lib.styles import ParagraphStyle
+from io import BytesIO
+from aps_aggregate import MATRIX_COLUMNS, MATRIX_AGE_LABELS, MATRIX_EQUITY_LABELS
+
+# Brand Colors (Updated to match client spec)
+BRAND_COLORS = {
+    'black': '#000000',
+    'white': '#FFFFFF',
+    'teal': '#00D1D1',
+    'yellow': '#FFD166',
+    'red': '#FF6B6B',
+    'gray': '#9CA3AF'
+}
+
+def churn_models_job(report, colors_theme):
+    """Churn models figure as a render_charts() job (static: depends on colors only)"""
+    from aps_charts import draw_churn_models
+    return draw_churn_models, (colors_theme, BRAND_COLORS)
+
+def prediction_matrix_job(report, colors_theme):
+    """Prediction matrix figure as a render_charts() job"""
+    from aps_charts import draw_prediction_matrix
+    matrix, _ = report.prediction_matrix()
+    return draw_prediction_matrix, (matrix, MATRIX_AGE_LABELS, MATRIX_EQUITY_LABELS)
+
+def create_churn_models_page(story, styles, report, colors_theme, chart=None):
+    """Churn Models Page (Predictive Churn Feed) - FIXED"""
+    
+    title_style = ParagraphStyle(
+        'SectionTitle',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor(colors_theme['primary']),
+        spaceAfter=20
+    )
+    story.append(Paragraph("Dual-Model Predictive Framework – APS Churn Layer", title_style))
+    story.append(Spacer(1, 0.3*inch))
+    
+    try:
+        # Dual visualization: Diamond Equity Cycle + Velocity Curve
+        if chart is None:
+            from aps_charts import draw_churn_models
+            chart = draw_churn_models(colors_theme, BRAND_COLORS)
+        
+        # Add to PDF
+        img = Image(BytesIO(chart), width=6.5*inch, height=3*inch)
+        story.append(img)
+        
+    except Exception as e:
+        print(f"⚠ Churn graph generation failed: {e}")
+        story.append(Paragraph(f"[Graph Error: {str(e)}]", styles['Normal']))
+    
+    story.append(PageBreak())
+
+def create_risk_tiers_page(story, styles, report, colors_theme):
+    """Risk Tiers Page - Churn Risk Segmentation"""
+    
+    title_style = ParagraphStyle(
+        'SectionTitle',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor(colors_theme['primary']),
+        spaceAfter=20
+    )
+    story.append(Paragraph("Risk Tier Segmentation – Churn Probability Layers", title_style))
+    story.append(Spacer(1, 0.3*inch))
+    
+    # Explanation
+    explanation = """The APS Risk Tier model segments homeowners into three actionable categories based on 
+    churn velocity indicators, equity accumulation, and refinance probability scores. This tiered approach 
+    enables targeted marketing strategies for each segment."""
+    
+    story.append(Paragraph(explanation, styles['Normal']))
+    story.append(Spacer(1, 0.4*inch))
+    
+    # Calculate risk distribution
+    total_records = report.total_records
+    
+    # Tier 1: High Risk (0-24 months)
+    tier1_count = report.count_loan_age(high=24) if report.has('Loan_Age_Mo') else int(total_records * 0.35)
+    tier1_pct = (tier1_count / total_records * 100) if total_records > 0 else 35.0
+    
+    # Tier 2: Medium Risk (25-60 months)
+    tier2_count = report.count_loan_age(low=24, high=60) if report.has('Loan_Age_Mo') else int(total_records * 0.45)
+    tier2_pct = (tier2_count / total_records * 100) if total_records > 0 else 45.0
+    
+    # Tier 3: Low Risk (60+ months)
+    tier3_count = total_records - tier1_count - tier2_count
+    tier3_pct = (tier3_count / total_records * 100) if total_records > 0 else 20.0
+    
+    # Risk Tiers Table
+    risk_data = [
+        ['Tier', 'Risk Level', 'Loan Age Range', 'Count', '% of Portfolio', 'Action'],
+        ['1', 'HIGH', '0-24 months', f'{tier1_count:,}', f'{tier1_pct:.1f}%', 'Immediate Outreach'],
+        ['2', 'MEDIUM', '25-60 months', f'{tier2_count:,}', f'{tier2_pct:.1f}%', 'Monitor & Nurture'],
+        ['3', 'LOW', '60+ months', f'{tier3_count:,}', f'{tier3_pct:.1f}%', 'Retention Programs']
+    ]
+    
+    t = Table(risk_data, colWidths=[0.8*inch, 1.2*inch, 1.5*inch, 1.2*inch, 1.3*inch, 1.5*inch])
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(colors_theme['primary'])),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        # Color-code risk levels
+        ('BACKGROUND', (1, 1), (1, 1), colors.HexColor(BRAND_COLORS['red'])),
+        ('BACKGROUND', (1, 2), (1, 2), colors.HexColor(BRAND_COLORS['yellow'])),
+        ('BACKGROUND', (1, 3), (1, 3), colors.HexColor(BRAND_COLORS['teal'])),
+        ('TEXTCOLOR', (1, 1), (1, 3), colors.white),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')])
+    ]))
+    
+    story.append(t)
+    story.append(Spacer(1, 0.4*inch))
+    
+    # Key Insights
+    insights_title = ParagraphStyle(
+        'InsightsTitle',
+        parent=styles['Heading3'],
+        fontSize=12,
+        textColor=colors.HexColor(colors_theme['primary']),
+        spaceAfter=10
+    )
+    story.append(Paragraph("Strategic Insights by Tier:", insights_title))
+    
+    insights = f"""
+    <b>Tier 1 (High Risk):</b> {tier1_pct:.1f}% of portfolio in critical refinance window. 
+    Priority for immediate marketing campaigns.<br/><br/>
+    
+    <b>Tier 2 (Medium Risk):</b> {tier2_pct:.1f}% entering equity accumulation phase. 
+    Ideal for nurture campaigns and rate watch programs.<br/><br/>
+    
+    <b>Tier 3 (Low Risk):</b> {tier3_pct:.1f}% with established equity. 
+    Focus on retention and cross-sell opportunities.
+    """
+    
+    story.append(Paragraph(insights, styles['Normal']))
+    story.append(PageBreak())
+
+def create_prediction_matrix_page(story, styles, report, colors_theme, chart=None):
+    """Prediction Matrix Page - Visual Churn Probability Grid"""
+    
+    title_style = ParagraphStyle(
+        'SectionTitle',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor(colors_theme['primary']),
+        spaceAfter=20
+    )
+    story.append(Paragraph("Churn Prediction Matrix – Equity × Age Segmentation", title_style))
+    story.append(Spacer(1, 0.3*inch))
+    
+    explanation = """This matrix visualizes churn probability across two critical dimensions: 
+    Loan Age (time-based risk) and Estimated Equity (financial motivation). Each cell shows the 
+    average APS score of the records in that band; color intensity indicates relative churn risk."""
+    
+    story.append(Paragraph(explanation, styles['Normal']))
+    story.append(Spacer(1, 0.3*inch))
+    
+    if not report.has(*MATRIX_COLUMNS):
+        story.append(Paragraph("Prediction matrix data not available", styles['Normal']))
+        story.append(PageBreak())
+        return
+    
+    matrix, counts = report.prediction_matrix()
+    
+    try:
+        # Prediction matrix heatmap
+        if chart is None:
+            from aps_charts import draw_prediction_matrix
+            chart = draw_prediction_matrix(matrix, MATRIX_AGE_LABELS, MATRIX_EQUITY_LABELS)
+        
+        # Add to PDF
+        img = Image(BytesIO(chart), width=6*inch, height=4*inch)
+        story.append(img)
+        
+    except Exception as e:
+        print(f"⚠ Prediction matrix generation failed: {e}")
+        story.append(Paragraph(f"[Matrix Error: {str(e)}]", styles['Normal']))
+    
+    story.append(Spacer(1, 0.3*inch))
+    
+    # Key Findings - the two highest-scoring populated cells
+    zones = ""
+    for cell in np.argsort(np.nan_to_num(matrix, nan=-1), axis=None)[::-1][:2]:
+        i, j = np.unravel_index(cell, matrix.shape)
+        if counts[i, j] == 0:
+            break
+        zones += (f"• {MATRIX_AGE_LABELS[i].replace('m', ' months')} + {MATRIX_EQUITY_LABELS[j]} equity: "
+                  f"{matrix[i, j]:.0f} average APS score ({counts[i, j]:,} records)<br/>")
+    
+    findings = f"""
+    <b>Highest Risk Zones:</b><br/>
+    {zones or 'No records with loan age and equity data<br/>'}<br/>
+    
+    <b>Strategic Recommendations:</b><br/>
+    • Deploy aggressive retention campaigns in red zones (average APS score 70+)<br/>
+    • Yellow zones (APS score 50-70): Proactive rate monitoring and competitive offers<br/>
+    • Green zones (APS score &lt;50): Standard nurture programs sufficient
+    """
+    
+    story.append(Paragraph(findings, styles['Normal']))
+    story.append(PageBreak())
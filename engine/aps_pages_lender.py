@@ -0,0 +1,59 @@
+# aps_pages_lender.py - Lender Engagement feed pages
+"""
+APS Market Intelligence - Lender Engagement Pages
+Imported only when a report lists one of these pages (see aps_page_registry).
+"""
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+from reportlab.platypus import Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.lib.styles import ParagraphStyle
+
+def create_lender_patterns_page(story, styles, report, colors_theme):
+    """Lender Patterns Page (Lender Engagement Feed)"""
+    
+    title_style = ParagraphStyle(
+        'SectionTitle',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor(colors_theme['primary']),
+        spaceAfter=20
+    )
+    story.append(Paragraph("Lender Rate Patterns & Volume Analysis", title_style))
+    story.append(Spacer(1, 0.3*inch))
+    
+    # Calculate lender metrics from data if available
+    if report.has('Servicer_Name'):
+        # Real lender data
+        lender_counts = report.top_counts('Servicer_Name', 5)
+        lender_data = [['Lender', 'Volume', 'Market Share']]
+        
+        total_count = report.total_records
+        for lender, count in lender_counts.items():
+            share = (count / total_count * 100) if total_count > 0 else 0
+            lender_data.append([lender[:20], str(count), f'{share:.1f}%'])
+    else:
+        # Dummy lender data
+        lender_data = [
+            ['Lender', 'Avg Rate', 'Volume', 'Market Share'],
+            ['Wells Fargo', '6.75%', '234', '23.4%'],
+            ['Chase', '6.85%', '198', '19.8%'],
+            ['BofA', '6.95%', '156', '15.6%'],
+            ['Quicken', '6.65%', '142', '14.2%'],
+            ['Others', '7.05%', '270', '27.0%']
+        ]
+    
+    col_widths = [3*inch, 1.5*inch, 2*inch] if report.has('Servicer_Name') else [2*inch, 1.5*inch, 1.5*inch, 1.5*inch]
+    
+    t = Table(lender_data, colWidths=col_widths)
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(colors_theme['primary'])),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')])
+    ]))
+    
+    story.append(t)
+    story.append(PageBreak())
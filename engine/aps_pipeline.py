@@ -33,51 +33,155 @@
 
 
 # Pipeline (ASCII-safe skeleton)
-import sys, pandas as pd
+import os, argparse
 from pathlib import Path
-from aps_config import INPUT_DIR, OUTPUT_DIR
-from aps_normalize import normalize_and_score
+from aps_config import INPUT_DIR, OUTPUT_DIR, STREAM_CHUNK_ROWS, INGEST_PASSTHROUGH, COLUMNAR_CACHE
+from aps_normalize import normalize_batch, SCORING_VERSION
 from aps_healthcheck import health_check
-from aps_render import render_pdf
+from aps_aggregate import ReportAccumulator
+from aps_page_registry import report_aggregates
+from aps_split import FeedReports, render_feeds
+from aps_stream import should_stream, stream_score_csv, fold_batches
+from aps_ingest import read_projected
+from aps_columnar import ColumnarWriter, columnar_path, columnar_key, load_columnar
+from aps_trace import tracing, stage
 
-def main(csv_path: str):
-    csv_path = Path(csv_path)
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+def plan_report(filename=None, feed_type=None):
+    """
+    Empty report accumulator for a run. With a feed_type override: one report
+    computing only that feed's aggregates. Otherwise a FeedReports, which
+    splits the records by their feed_type column (one report and PDF per feed).
+    """
+    if feed_type:
+        return ReportAccumulator(aggregates=report_aggregates(feed_type))
+    return FeedReports(filename)
+
+def score_csv(csv_path, scored_csv_path, chunksize=None, passthrough=INGEST_PASSTHROUGH, columnar=False, rebuild=False,
+              report=None):
+    """
+    Read, normalize, score and health-check csv_path and write the scored CSV.
+    Large files (or an explicit chunksize) go through the streaming path.
+    Only the columns the pipeline uses are parsed; without passthrough the
+    other vendor columns are left out of the scored CSV.
+    With columnar, the scored records are also kept in a Feather file next to
+    the scored CSV and memory-mapped on later runs over the same source
+    instead of re-scoring it (rebuild forces a fresh score).
+    Records are folded into report when given (see plan_report), else into
+    a new ReportAccumulator.
     
-    print(f"\n=== APS Pipeline Starting ===")
-    print(f"Input file: {csv_path}")
+    Returns:
+        tuple: (health check dict, ReportAccumulator)
+    """
+    sink = None
+    if columnar:
+        scored_csv_path = Path(scored_csv_path)
+        cache_path = columnar_path(scored_csv_path)
+        with stage('source_hash'):
+            key = columnar_key(csv_path, passthrough)
+        batches = None if rebuild else load_columnar(cache_path, key)
+        if batches is not None:
+            # Keep the scored CSV unless it's missing or was rewritten after the cache
+            csv_current = scored_csv_path.exists() and scored_csv_path.stat().st_mtime_ns <= cache_path.stat().st_mtime_ns
+            hc_acc, report, _ = fold_batches(batches, None if csv_current else scored_csv_path, report=report)
+            if not csv_current:
+                os.utime(cache_path)  # the CSV just written matches the cache again
+            print(f"✓ Loaded {report.total_records} scored records from {cache_path.name}")
+            return hc_acc.result(), report
+        sink = ColumnarWriter(cache_path, key)
     
-    # Read CSV
-    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
-    print(f"✓ Loaded {len(df)} records")
+    try:
+        hc, report = score_source(csv_path, scored_csv_path, chunksize, passthrough, sink, report)
+    except BaseException:
+        if sink is not None:
+            sink.abort()
+        raise
+    
+    if sink is not None:
+        if sink.commit():
+            print(f"✓ Cached scored records -> {sink.path.name}")
+        else:
+            print("⚠ Columnar cache not written")
+    return hc, report
+
+def score_source(csv_path, scored_csv_path, chunksize, passthrough, sink=None, report=None):
+    """Score the source CSV itself (see score_csv); each scored batch also goes to sink"""
+    if should_stream(csv_path, chunksize):
+        chunksize = chunksize or STREAM_CHUNK_ROWS
+        print(f"✓ Streaming in chunks of {chunksize:,} rows")
+        hc_acc, report = stream_score_csv(csv_path, scored_csv_path, chunksize, passthrough, sink, report)
+        print(f"✓ Loaded, normalized and scored {report.total_records} records")
+        return hc_acc.result(), report
     
-    # Normalize and score
-    df = normalize_and_score(df)
-    print(f"✓ Normalized and scored data")
+    # Read CSV (projected to the columns in use)
+    with stage('read'):
+        df = read_projected(csv_path, passthrough=passthrough)
+    print(f"✓ Loaded {len(df)} records")
     
-    # Health check
-    hc = health_check(df)
-    print("\n=== APS 18-Point Health Check ===")
-    for k, v in hc.items():
-        status = v.get('status', 'UNKNOWN')
-        value = v.get('value', 'N/A')
-        message = v.get('message', '')
-        print(f" [{status}] {k}: {value} - {message}")
+    # Normalize and score (parse once - the typed batch feeds health check and report)
+    with stage('normalize'):
+        batch = normalize_batch(df)
+    print("✓ Normalized and scored data")
     
     # Save scored CSV (Acceptance Test #8)
-    csv_out = OUTPUT_DIR / (csv_path.stem + "_scored.csv")
-    df.to_csv(csv_out, index=False, encoding='utf-8')
-    print(f"\n✓ Wrote scored CSV -> {csv_out}")
+    with stage('scored_csv'):
+        batch.frame.to_csv(scored_csv_path, index=False, encoding='utf-8')
+    if sink is not None:
+        with stage('columnar_write'):
+            sink.write(batch)
+    
+    with stage('health_check'):
+        hc = health_check(batch)
+    with stage('aggregate'):
+        report = (ReportAccumulator() if report is None else report).update(batch)
+    return hc, report
+
+def main(csv_path: str, chunksize=None, passthrough=INGEST_PASSTHROUGH, rebuild=False, trace_path=None):
+    csv_path = Path(csv_path)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    
+    print("\n=== APS Pipeline Starting ===")
+    print(f"Input file: {csv_path}")
+    
+    with tracing() as trace:
+        # Read, normalize, score, health check, write scored CSV
+        csv_out = OUTPUT_DIR / (csv_path.stem + "_scored.csv")
+        hc, report = score_csv(csv_path, csv_out, chunksize, passthrough, columnar=COLUMNAR_CACHE, rebuild=rebuild,
+                               report=plan_report(csv_path.name))
+        
+        # Health check
+        print("\n=== APS 18-Point Health Check ===")
+        for k, v in hc.items():
+            status = v.get('status', 'UNKNOWN')
+            value = v.get('value', 'N/A')
+            message = v.get('message', '')
+            print(f" [{status}] {k}: {value} - {message}")
+        
+        print(f"\n✓ Wrote scored CSV -> {csv_out}")
+        
+        # Render PDF (pass filename for feed type detection); one per feed in a mixed file
+        out = OUTPUT_DIR / (csv_path.stem + "_DEMO.pdf")
+        for pdf_path in render_feeds(report, out, csv_filename=csv_path.name).values():
+            print(f"✓ Wrote demo PDF -> {pdf_path}")
     
-    # Render PDF (pass filename for feed type detection)
-    out = OUTPUT_DIR / (csv_path.stem + "_DEMO.pdf")
-    render_pdf(df, out, csv_filename=csv_path.name)
-    print(f"✓ Wrote demo PDF -> {out}")
+    print("\n=== Stage Timings ===")
+    print(trace.table())
+    if trace_path:
+        trace.write(trace_path, input=str(csv_path), records=report.total_records, scoring_version=SCORING_VERSION)
+        print(f"✓ Wrote timing trace -> {trace_path}")
     
     print("\n=== Pipeline Complete ===")
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: RUN_ME.bat (invokes this with input\\test.csv)")
-        raise SystemExit(1)
-    main(sys.argv[1])
\ No newline at end of file
+    parser = argparse.ArgumentParser(usage="RUN_ME.bat (invokes this with input\\test.csv)")
+    parser.add_argument("csv_path")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Stream the file in chunks of this many rows (auto for large files)")
+    parser.add_argument("--no-passthrough", dest="passthrough", action="store_false", default=INGEST_PASSTHROUGH,
+                        help="Leave vendor columns the pipeline doesn't use out of the scored CSV")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Re-score the CSV even if a matching columnar cache exists")
+    parser.add_argument("--trace", dest="trace_path", default=None,
+                        help="Also write the stage timings to this JSON file (for comparing runs)")
+    args = parser.parse_args()
+    main(args.csv_path, chunksize=args.chunksize, passthrough=args.passthrough, rebuild=args.rebuild,
+         trace_path=args.trace_path)
\ No newline at end of file
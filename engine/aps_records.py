@@ -0,0 +1,109 @@
+# aps_records.py - Score JSON records without the report pipeline
+"""
+APS Market Intelligence - Record Scoring
+/api/v1/score answers with the APS score, tier and CCI of a few hundred
+records at a time, so it skips the health check, scored CSV and PDF, and
+also what normalize_batch builds only for them (the scored frame, its
+categoricals and typed view). The record fields go through the same parsing
+(clean_numeric, LoanDateParser) and scoring kernel (score_columns) as the
+CSV path, so the numbers match the scored CSV's for the same records.
+"""
+import itertools
+import json
+import numpy as np
+import pandas as pd
+from aps_aliases import resolve_columns
+from aps_normalize import clean_numeric, LoanDateParser, score_columns
+
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+class RecordsError(ValueError):
+    """Raised for a request body that isn't a list of JSON records"""
+
+def parse_records(body, content_type):
+    """
+    Records from a JSON body (a list of objects, or {"records": [...]}) or an
+    NDJSON body (one object per line; blank lines skipped)
+
+    Returns:
+        list of dict
+    """
+    try:
+        if content_type in NDJSON_CONTENT_TYPES:
+            lines = [line for line in body.splitlines() if line.strip()]
+            try:
+                # One parse for the whole body; line by line only to locate an error
+                records = json.loads(b'[' + b','.join(lines) + b']')
+            except ValueError:
+                records = [json.loads(line) for line in lines]
+            if len(records) != len(lines):
+                raise RecordsError("Expected one JSON record per line")
+        elif content_type == 'application/json':
+            records = json.loads(body)
+            if isinstance(records, dict):
+                records = records.get('records')
+        else:
+            raise RecordsError("Send application/json (a list of records) or application/x-ndjson")
+    except ValueError as e:
+        if isinstance(e, RecordsError):
+            raise
+        raise RecordsError(f"Invalid JSON: {e}") from e
+
+    if not isinstance(records, list):
+        raise RecordsError("Expected a list of records (or {\"records\": [...]})")
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            raise RecordsError(f"Record {i} is not a JSON object")
+    return records
+
+# LoanDateParsers by elected date format, shared by all requests (see
+# LoanDateParser): dates seen in earlier requests aren't parsed again
+DATE_PARSERS = {}
+
+def parse_dates(values):
+    """parse_loan_dates(values), reusing the dates parsed for earlier requests"""
+    fmt = LoanDateParser.elect_format(values)
+    parser = DATE_PARSERS.get(fmt)
+    if parser is None:
+        parser = DATE_PARSERS.setdefault(fmt, LoanDateParser(fmt, elect=False))
+    return parser(values)
+
+def score_records(records, today=None):
+    """
+    LTV %, Equity %, Loan_Age_Mo, APS score, tier and CCI of each record,
+    parsed and scored like normalize_batch does (see score_columns). Record
+    keys are resolved through the alias map like CSV headers; records may
+    leave fields out.
+
+    Returns:
+        dict: 'APS_Score (v2.0)' and 'CCI' float arrays, 'APS_Tier' Categorical, ...
+    """
+    columns = list(dict.fromkeys(itertools.chain.from_iterable(records)))
+    resolved = resolve_columns(columns)
+
+    def values(field):
+        return pd.Series([record.get(resolved[field]) for record in records], dtype=object)
+
+    zeros = np.zeros(len(records))
+    property_value = clean_numeric(values('property_value')) if 'property_value' in resolved else zeros
+    loan_balance = clean_numeric(values('loan_balance')) if 'loan_balance' in resolved else zeros
+    if 'loan_date' in resolved:
+        loan_dates = parse_dates(values('loan_date'))
+    else:
+        loan_dates = np.full(len(records), np.datetime64('NaT', 'ns'))
+    return score_columns(property_value, loan_balance, loan_dates, today)
+
+def ndjson_lines(scored, first_row=0):
+    """One NDJSON line per scored record: row (position in the request), aps_score, aps_tier, cci"""
+    # Scores and CCI are always finite, so repr() is valid JSON
+    return ''.join(
+        f'{{"row": {row}, "aps_score": {score!r}, "aps_tier": "{tier}", "cci": {cci!r}}}\n'
+        for row, score, tier, cci in zip(range(first_row, first_row + len(scored['APS_Tier'])),
+                                         scored['APS_Score (v2.0)'].tolist(), scored['APS_Tier'],
+                                         scored['CCI'].tolist())
+    )
+
+def stream_scores(records, block_rows):
+    """Score records block_rows at a time, yielding each block's NDJSON as soon as it is scored"""
+    for start in range(0, len(records), block_rows):
+        yield ndjson_lines(score_records(records[start:start + block_rows]), start)
@@ -0,0 +1,140 @@
+# aps_split.py - One report (and PDF) per feed_type in a mixed upload
+"""
+APS Market Intelligence - Mixed-Feed Splitting
+An upload may combine several feeds, told apart by its feed_type column.
+Each scored batch is partitioned by feed_type in one grouped pass over the
+categorical codes and every part is folded into its own ReportAccumulator,
+so a mixed upload renders one PDF per feed (concurrently) from one read,
+one score and one scored CSV.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from aps_config import SPLIT_RENDER_WORKERS
+from aps_feed_config import FEED_TYPES, detect_feed_type
+from aps_normalize import as_record_batch
+from aps_aggregate import ReportAccumulator
+from aps_page_registry import report_aggregates
+from aps_render import render_pdf
+from aps_trace import stage
+
+FEED_COLUMN = 'feed_type'
+FEED_KEYS = list(FEED_TYPES)
+
+def feed_partitions(batch):
+    """
+    Split a RecordBatch by feed_type, first-seen feed first.
+
+    Returns:
+        list of (feed type, RecordBatch); feed type is None for rows with no
+        known feed_type value (or no feed_type column). Feeds that already sit
+        in contiguous runs are sliced in place; interleaved rows are put in
+        feed order once (stable) and sliced from that one copy.
+    """
+    if FEED_COLUMN not in batch.columns or len(batch) == 0:
+        return [(None, batch)]
+    values = batch.frame[FEED_COLUMN]
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype('category')
+
+    # Category code -> feed index (-1 unknown); the extra slot catches code -1 (missing)
+    feed_ids = np.array([FEED_KEYS.index(c) if c in FEED_TYPES else -1 for c in values.cat.categories] + [-1])
+    groups = feed_ids[values.cat.codes.to_numpy()]
+
+    bounds = np.r_[0, np.flatnonzero(groups[1:] != groups[:-1]) + 1, len(groups)]
+    runs = groups[bounds[:-1]]
+    if len(np.unique(runs)) < len(runs):
+        # Rank feeds by first appearance, then one stable reorder makes each contiguous
+        unique, first = np.unique(groups, return_index=True)
+        rank = np.empty(len(unique), dtype='int64')
+        rank[np.argsort(first)] = np.arange(len(unique))
+        order = np.argsort(rank[np.searchsorted(unique, groups)], kind='stable')
+        batch, groups = batch.take(order), groups[order]
+        bounds = np.r_[0, np.flatnonzero(groups[1:] != groups[:-1]) + 1, len(groups)]
+        runs = groups[bounds[:-1]]
+
+    return [(FEED_KEYS[g] if g >= 0 else None, batch.slice(start, stop))
+            for g, start, stop in zip(runs, bounds[:-1], bounds[1:])]
+
+class FeedReports:
+    """
+    One ReportAccumulator per feed, keyed by feed type in first-seen order;
+    each computes only the aggregates its feed's pages read. Rows without a
+    known feed_type go to the feed detect_feed_type picks from the filename
+    and columns. Folds and merges like a ReportAccumulator.
+    """
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.reports = {}
+        self.total_records = 0
+
+    def report(self, feed_type):
+        if feed_type not in self.reports:
+            self.reports[feed_type] = ReportAccumulator(aggregates=report_aggregates(feed_type))
+        return self.reports[feed_type]
+
+    def fallback_feed(self, batch):
+        # What render_pdf would detect for these rows: no usable feed_type value,
+        # so the filename, then the columns
+        return detect_feed_type(filename=self.filename, data=batch.frame.iloc[:0])
+
+    def update(self, data):
+        """Fold one scored chunk, each feed's rows into that feed's report"""
+        batch = as_record_batch(data)
+        self.total_records += len(batch)
+        for feed_type, part in feed_partitions(batch):
+            self.report(feed_type or self.fallback_feed(part)).update(part)
+        return self
+
+    def merge(self, other):
+        self.total_records += other.total_records
+        for feed_type, report in other.reports.items():
+            if feed_type in self.reports:
+                self.reports[feed_type].merge(report)
+            else:
+                self.reports[feed_type] = report
+        return self
+
+def feed_pdf_path(pdf_path, feed_type):
+    """<name>_<feed_type>_DEMO.pdf for <name>_DEMO.pdf"""
+    pdf_path = Path(pdf_path)
+    stem, suffix = pdf_path.stem, ''
+    if stem.endswith('_DEMO'):
+        stem, suffix = stem[:-len('_DEMO')], '_DEMO'
+    return pdf_path.with_name(f"{stem}_{feed_type}{suffix}{pdf_path.suffix}")
+
+def render_feeds(report, pdf_path, csv_filename=None, feed_type=None, workers=SPLIT_RENDER_WORKERS):
+    """
+    Render a run's PDFs. A single feed (or a plain ReportAccumulator) renders
+    to pdf_path as before; a FeedReports with several feeds renders one
+    PDF per feed to feed_pdf_path(), on up to workers processes at once.
+
+    Returns:
+        dict: feed type -> PDF path, first-seen feed first
+    """
+    if not isinstance(report, FeedReports):
+        feed_type = feed_type or detect_feed_type(filename=csv_filename, data=report.head)
+        render_pdf(None, pdf_path, csv_filename=csv_filename, report=report, feed_type=feed_type)
+        return {feed_type: Path(pdf_path)}
+
+    reports = report.reports
+    if len(reports) == 1:
+        paths = {feed: Path(pdf_path) for feed in reports}
+    else:
+        paths = {feed: feed_pdf_path(pdf_path, feed) for feed in reports}
+        print(f"✓ Mixed upload: {len(paths)} feeds ({', '.join(paths)}), one PDF each")
+
+    if len(paths) == 1 or workers <= 1:
+        for feed, path in paths.items():
+            render_pdf(None, path, csv_filename=csv_filename, report=reports[feed], feed_type=feed)
+        return paths
+
+    with stage('render_feeds'):
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            futures = [pool.submit(render_pdf, None, path, csv_filename, reports[feed], feed)
+                       for feed, path in paths.items()]
+            for future in futures:
+                future.result()
+    return paths
@@ -0,0 +1,81 @@
+# aps_stream.py - Chunked (streaming) normalize -> score -> write
+"""
+APS Market Intelligence - Streaming Mode
+Reads the vendor CSV in bounded chunks, normalizes and scores each chunk,
+appends it to the scored CSV and folds it into mergeable health-check and
+report aggregates, so peak memory depends on the chunk size, not the file.
+"""
+from pathlib import Path
+from aps_config import STREAM_CHUNK_ROWS, STREAM_MIN_BYTES, INGEST_PASSTHROUGH
+from aps_ingest import read_projected
+from aps_normalize import normalize_batch, LoanDateParser
+from aps_healthcheck import HealthCheckAccumulator
+from aps_aggregate import ReportAccumulator
+from aps_trace import stage
+
+def should_stream(csv_path, chunksize=None):
+    """Stream when a chunk size is forced or the file is large"""
+    if chunksize:
+        return True
+    return Path(csv_path).stat().st_size >= STREAM_MIN_BYTES
+
+def iter_scored_chunks(csv_path, chunksize=STREAM_CHUNK_ROWS, passthrough=INGEST_PASSTHROUGH, header=None):
+    """Yield normalized + scored RecordBatch chunks of at most chunksize rows (header: see read_projected)"""
+    reader = read_projected(csv_path, passthrough=passthrough, chunksize=chunksize, header=header)
+    parse_dates = LoanDateParser()
+    with reader:
+        while True:
+            with stage('read'):
+                chunk = next(reader, None)
+            if chunk is None:
+                return
+            with stage('normalize'):
+                batch = normalize_batch(chunk, parse_dates)
+            yield batch
+
+def fold_batches(batches, scored_csv_path=None, sink=None, report=None):
+    """
+    Fold scored RecordBatches into the health check and report aggregates
+    (into report when given, e.g. a FeedReports), appending each to
+    scored_csv_path (if given) and to sink (if given)
+    
+    Returns:
+        tuple: (HealthCheckAccumulator, ReportAccumulator, number of batches)
+    """
+    hc = HealthCheckAccumulator()
+    report = ReportAccumulator() if report is None else report
+    
+    count = 0
+    for batch in batches:
+        if scored_csv_path is not None:
+            with stage('scored_csv'):
+                batch.frame.to_csv(scored_csv_path, mode='a' if count else 'w', header=not count, index=False, encoding='utf-8')
+        if sink is not None:
+            with stage('columnar_write'):
+                sink.write(batch)
+        with stage('health_check'):
+            hc.update(batch)
+        with stage('aggregate'):
+            report.update(batch)
+        count += 1
+    
+    return hc, report, count
+
+def stream_score_csv(csv_path, scored_csv_path, chunksize=STREAM_CHUNK_ROWS, passthrough=INGEST_PASSTHROUGH, sink=None,
+                     report=None):
+    """
+    Score csv_path chunk by chunk, appending each chunk to scored_csv_path
+    (and to sink, e.g. a ColumnarWriter, when given)
+    
+    Returns:
+        tuple: (HealthCheckAccumulator, ReportAccumulator)
+    """
+    hc, report, count = fold_batches(iter_scored_chunks(csv_path, chunksize, passthrough), scored_csv_path, sink,
+                                     report)
+    
+    if not count:
+        # Header-only file: still emit the (empty) scored CSV
+        empty = normalize_batch(read_projected(csv_path, passthrough=passthrough))
+        hc, report, _ = fold_batches([empty], scored_csv_path, sink, report)
+    
+    return hc, report
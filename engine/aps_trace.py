@@ -0,0 +1,159 @@
+# aps_trace.py - Per-stage timing and memory instrumentation
+"""
+APS Market Intelligence - Stage Trace
+Records wall time, CPU time and memory for each pipeline stage (read,
+normalize, health check, scored-CSV write, each PDF page, doc.build).
+Code marks stages with `with stage('name'):`; they are recorded only while a
+`with tracing() as trace:` block is active in the same thread/context, and
+are free otherwise. Stages that run once per chunk accumulate under one name.
+
+Memory is the process's peak resident set size (high-water mark) when the
+stage ended, plus how much the stage raised it. Reading the OS counter keeps
+the overhead negligible, unlike tracemalloc.
+"""
+import contextvars
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MB = 1024 * 1024
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far (None if the platform can't tell)"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024  # Linux reports KB
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage',
+                    'QuotaPagedPoolUsage', 'QuotaPeakNonPagedPoolUsage',
+                    'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    return None
+
+def _mb(value):
+    return None if value is None else round(value / MB, 1)
+
+class StageTrace:
+    """Stage timings for one run, in the order stages first started"""
+
+    def __init__(self):
+        self.stages = {}
+        self.started = time.time()
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self.wall = None
+        self.cpu = None
+        self.peak_rss = None
+
+    def record(self, name, wall, cpu, peak_before, peak_after):
+        entry = self.stages.setdefault(name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'peak_rss': None, 'rss_growth': 0})
+        entry['calls'] += 1
+        entry['wall'] += wall
+        entry['cpu'] += cpu
+        if peak_after is not None:
+            entry['peak_rss'] = max(entry['peak_rss'] or 0, peak_after)
+            entry['rss_growth'] += peak_after - peak_before
+
+    def finish(self):
+        self.wall = time.perf_counter() - self._wall0
+        self.cpu = time.process_time() - self._cpu0
+        self.peak_rss = peak_rss_bytes()
+
+    def to_dict(self):
+        """JSON-ready timings block"""
+        return {
+            "wall_s": round(self.wall if self.wall is not None else time.perf_counter() - self._wall0, 4),
+            "cpu_s": round(self.cpu if self.cpu is not None else time.process_time() - self._cpu0, 4),
+            "peak_rss_mb": _mb(self.peak_rss if self.peak_rss is not None else peak_rss_bytes()),
+            "stages": [
+                {
+                    "name": name,
+                    "calls": entry['calls'],
+                    "wall_s": round(entry['wall'], 4),
+                    "cpu_s": round(entry['cpu'], 4),
+                    "peak_rss_mb": _mb(entry['peak_rss']),
+                    "rss_growth_mb": _mb(entry['rss_growth'])
+                }
+                for name, entry in self.stages.items()
+            ]
+        }
+
+    def table(self):
+        """Summary table for the CLI"""
+        timings = self.to_dict()
+        width = max([len(s['name']) for s in timings['stages']] + [len('total')])
+        lines = [f" {'Stage':<{width}}  {'Calls':>5}  {'Wall s':>8}  {'CPU s':>8}  {'Peak MB':>8}  {'+MB':>7}"]
+        for s in timings['stages']:
+            lines.append(f" {s['name']:<{width}}  {s['calls']:>5}  {s['wall_s']:>8.3f}  {s['cpu_s']:>8.3f}  "
+                         f"{_fmt(s['peak_rss_mb'], 8)}  {_fmt(s['rss_growth_mb'], 7)}")
+        lines.append(f" {'total':<{width}}  {'':>5}  {timings['wall_s']:>8.3f}  {timings['cpu_s']:>8.3f}  "
+                     f"{_fmt(timings['peak_rss_mb'], 8)}  {'':>7}")
+        return "\n".join(lines)
+
+    def write(self, path, **run_info):
+        """Write the timings (plus run_info such as the input file) as a JSON trace"""
+        trace = {"run": {"started": self.started, **run_info}, **self.to_dict()}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f, indent=2)
+
+def _fmt(value, width):
+    return f"{'-':>{width}}" if value is None else f"{value:>{width}.1f}"
+
+_active = contextvars.ContextVar('aps_trace', default=None)
+
+@contextmanager
+def tracing():
+    """Collect stage() timings from this context into a new StageTrace"""
+    trace = StageTrace()
+    token = _active.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.finish()
+        _active.reset(token)
+
+@contextmanager
+def stage(name):
+    """Time the enclosed block as stage name (no-op outside tracing())"""
+    trace = _active.get()
+    if trace is None:
+        yield
+        return
+    peak_before = peak_rss_bytes()
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        trace.record(name, time.perf_counter() - wall0, time.process_time() - cpu0, peak_before, peak_rss_bytes())
+
+def combine_timings(*parts):
+    """
+    One timings block (StageTrace.to_dict() layout) for a run whose stages
+    were traced in parts, one after another - e.g. an upload scored on the
+    request thread and rendered on a job worker. Peaks are per process, so
+    the combined peak is the largest.
+    """
+    peaks = [p['peak_rss_mb'] for p in parts if p['peak_rss_mb'] is not None]
+    return {
+        "wall_s": round(sum(p['wall_s'] for p in parts), 4),
+        "cpu_s": round(sum(p['cpu_s'] for p in parts), 4),
+        "peak_rss_mb": max(peaks) if peaks else None,
+        "stages": [s for p in parts for s in p['stages']]
+    }
@@ -0,0 +1,329 @@
+# aps_upload.py - Score an API upload straight from the request body
+"""
+APS Market Intelligence - Streamed Uploads
+The upload endpoint used to let Werkzeug parse the whole multipart body
+(spooling large files to a temp file), save it again and only then start
+reading. Here the request body is read in blocks on a background thread,
+decoded as it arrives (gzip Content-Encoding, then multipart/form-data or a
+raw text/csv body) and fed to the chunked reader, so scoring overlaps the
+upload and memory is bounded by the block and chunk sizes, not the file.
+The SHA-256 of the CSV bytes is computed on the way for the result cache.
+"""
+import hashlib
+import io
+import queue
+import threading
+import zlib
+from werkzeug.sansio.multipart import MultipartDecoder, Field, File, Data, Epilogue, NeedData
+from aps_config import UPLOAD_BLOCK_BYTES, UPLOAD_PREFETCH_BLOCKS, UPLOAD_PREFETCH_JOIN_SECONDS
+from aps_config import UPLOAD_CHUNK_ROWS, INGEST_PASSTHROUGH
+from aps_ingest import read_header
+from aps_stream import iter_scored_chunks, fold_batches
+
+# Upper bounds for the parts held in memory whole: a form field value, the CSV header line
+MAX_FIELD_BYTES = 64 * 1024
+MAX_HEADER_BYTES = 1024 * 1024
+CSV_CONTENT_TYPES = ('text/csv', 'application/csv', 'text/plain', 'application/octet-stream')
+
+class UploadError(ValueError):
+    """Raised for a request body that can't be read as a CSV upload"""
+
+def read_blocks(stream, block_size=UPLOAD_BLOCK_BYTES):
+    """Blocks of a binary file object (e.g. request.stream) until EOF"""
+    return iter(lambda: stream.read(block_size), b'')
+
+class Prefetch:
+    """
+    Iterates blocks read on a background thread, at most depth blocks ahead,
+    so the client keeps sending while the current chunk is being scored.
+    Until start() blocks are read on the caller's thread, so a request
+    rejected before scoring never starts one. close() stops the thread (it
+    must not outlive the request; one stuck reading from a stalled client is
+    waited for at most UPLOAD_PREFETCH_JOIN_SECONDS).
+    """
+
+    _END = object()
+
+    def __init__(self, blocks, depth=UPLOAD_PREFETCH_BLOCKS):
+        self._blocks = iter(blocks)
+        self._queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Read ahead on the background thread from the next block on"""
+        if self._thread is None and not self._stop.is_set():
+            self._thread = threading.Thread(target=self._read, args=(self._blocks,), daemon=True)
+            self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read(self, blocks):
+        try:
+            for block in blocks:
+                if not self._put(block):
+                    return
+            self._put(self._END)
+        except Exception as e:
+            self._put(e)
+
+    def __iter__(self):
+        while self._thread is None:
+            block = next(self._blocks, None)
+            if block is None:
+                return
+            yield block
+        while True:
+            item = self._queue.get()
+            if item is self._END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(UPLOAD_PREFETCH_JOIN_SECONDS)
+
+def gunzip_blocks(blocks, block_size=UPLOAD_BLOCK_BYTES):
+    """Decompress a gzip stream block by block (output blocks of at most block_size bytes)"""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        for block in blocks:
+            while block:
+                out = decompressor.decompress(block, block_size)
+                if out:
+                    yield out
+                block = decompressor.unconsumed_tail
+        tail = decompressor.flush()
+    except zlib.error as e:
+        raise UploadError(f"Request body is not valid gzip: {e}") from e
+    if not decompressor.eof:
+        raise UploadError("Request body ends inside its gzip stream")
+    if tail:
+        yield tail
+
+class MultipartReader:
+    """
+    Incremental multipart/form-data decoder over body blocks. open_file()
+    collects the form fields up to the file part; file_blocks() then yields
+    the file's bytes as they arrive; finish() reads whatever follows.
+    """
+
+    def __init__(self, blocks, boundary, file_field='file'):
+        self.file_field = file_field
+        self.fields = {}
+        self.late_fields = {}
+        self.filename = None
+        self._events = self._decode(blocks, boundary.encode('latin-1'))
+
+    @staticmethod
+    def _decode(blocks, boundary):
+        try:
+            yield from MultipartReader._events_of(blocks, boundary)
+        except UploadError:
+            raise
+        except ValueError as e:  # the decoder's "Invalid form-data"
+            raise UploadError(f"Malformed multipart body: {e}") from e
+
+    @staticmethod
+    def _events_of(blocks, boundary):
+        decoder = MultipartDecoder(boundary)
+        for block in blocks:
+            decoder.receive_data(block)
+            event = decoder.next_event()
+            while not isinstance(event, NeedData):
+                yield event
+                if isinstance(event, Epilogue):
+                    return
+                event = decoder.next_event()
+        decoder.receive_data(None)
+        event = decoder.next_event()
+        while not isinstance(event, (NeedData, Epilogue)):
+            yield event
+            event = decoder.next_event()
+        if not isinstance(event, Epilogue):
+            raise UploadError("Multipart body ends before its closing boundary")
+
+    def _read_parts(self, fields, stop_at_file):
+        """Fold form fields into fields; stop at the file part when asked (True if found)"""
+        name = None
+        for event in self._events:
+            if isinstance(event, File):
+                if stop_at_file and event.name == self.file_field:
+                    self.filename = event.filename
+                    return True
+                name = None  # another file part: skipped
+            elif isinstance(event, Field):
+                name = event.name
+                fields[name] = b''
+            elif isinstance(event, Data) and name is not None:
+                fields[name] += event.data
+                if len(fields[name]) > MAX_FIELD_BYTES:
+                    raise UploadError(f"Form field '{name}' is too large")
+        return False
+
+    def open_file(self):
+        """Read up to the file part. Returns its filename, or None if there is none."""
+        if not self._read_parts(self.fields, stop_at_file=True):
+            return None
+        self.fields = {k: v.decode('utf-8', 'replace') for k, v in self.fields.items()}
+        return self.filename
+
+    def file_blocks(self):
+        for event in self._events:
+            if isinstance(event, Data):
+                if event.data:
+                    yield event.data
+                if not event.more_data:
+                    return
+
+    def finish(self):
+        """Read the rest of the body; fields sent after the file end up in late_fields"""
+        self._read_parts(self.late_fields, stop_at_file=False)
+        self.late_fields = {k: v.decode('utf-8', 'replace') for k, v in self.late_fields.items()}
+
+class Upload:
+    """
+    A CSV upload being read from a request body: its filename, the form fields
+    sent before it (multipart only) and its bytes, hashed and counted as they
+    are iterated. Use open_upload() to create one and close() when done.
+    """
+
+    def __init__(self, blocks, filename=None, fields=None, reader=None, prefetch=None):
+        self.filename = filename
+        self.fields = fields or {}
+        self.size = 0
+        self._blocks = blocks
+        self._digest = hashlib.sha256()
+        self._reader = reader
+        self._prefetch = prefetch
+
+    def __iter__(self):
+        if self._prefetch is not None:
+            self._prefetch.start()  # validated by now: read ahead while it is scored
+        for block in self._blocks:
+            self._digest.update(block)
+            self.size += len(block)
+            yield block
+
+    def hexdigest(self):
+        """SHA-256 of the CSV bytes read so far (the whole file once scored, as file_digest)"""
+        return self._digest.hexdigest()
+
+    def finish(self):
+        """Consume the rest of the body. Returns the form fields sent after the file."""
+        if self._reader is None:
+            return {}
+        self._reader.finish()
+        return self._reader.late_fields
+
+    def close(self):
+        if self._prefetch is not None:
+            self._prefetch.close()
+
+def open_upload(stream, content_type, boundary=None, content_encoding=None, file_field='file', filename=None):
+    """
+    Start reading a request body as a CSV upload: multipart/form-data (the CSV
+    in file_field) or the raw CSV (filename names it). content_encoding may be
+    gzip. A multipart body is read up to the start of the file part here.
+
+    Returns:
+        Upload (filename None when a multipart body has no file_field part)
+    Raises:
+        UploadError: unsupported content type or encoding
+    """
+    encoding = (content_encoding or 'identity').strip().lower()
+    if encoding not in ('identity', 'gzip', 'x-gzip'):
+        raise UploadError(f"Unsupported Content-Encoding '{content_encoding}' (use gzip or none)")
+    multipart = content_type == 'multipart/form-data'
+    if not multipart and content_type not in CSV_CONTENT_TYPES:
+        raise UploadError("Send the CSV as multipart/form-data (field 'file') or as a text/csv body")
+    if multipart and not boundary:
+        raise UploadError("multipart/form-data request has no boundary")
+
+    prefetch = Prefetch(read_blocks(stream))
+    try:
+        blocks = prefetch if encoding == 'identity' else gunzip_blocks(prefetch)
+        if not multipart:
+            return Upload(blocks, filename, prefetch=prefetch)
+        reader = MultipartReader(blocks, boundary, file_field)
+        reader.open_file()
+        return Upload(reader.file_blocks(), reader.filename, reader.fields, reader, prefetch)
+    except BaseException:
+        prefetch.close()
+        raise
+
+def split_header(blocks):
+    """
+    The header line of a CSV arriving in blocks.
+
+    Returns:
+        tuple: (header line bytes, iterator over all blocks, header included)
+    """
+    blocks = iter(blocks)
+    head = bytearray()
+    for block in blocks:
+        head += block
+        if b'\n' in block or len(head) > MAX_HEADER_BYTES:
+            break
+    line = bytes(head).split(b'\n', 1)[0]
+    if len(line) > MAX_HEADER_BYTES:
+        raise UploadError("CSV header line is too long")
+    return line, _chain(bytes(head), blocks)
+
+def _chain(first, blocks):
+    if first:
+        yield first
+    yield from blocks
+
+class BlockStream(io.RawIOBase):
+    """Read-only binary file object over an iterator of byte blocks"""
+
+    def __init__(self, blocks):
+        self._blocks = iter(blocks)
+        self._pending = memoryview(b'')
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            block = next(self._blocks, None)
+            if block is None:
+                return 0
+            self._pending = memoryview(block)
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+def score_upload(upload, scored_csv_path, report=None, chunksize=UPLOAD_CHUNK_ROWS, passthrough=INGEST_PASSTHROUGH):
+    """
+    Normalize, score and health-check an Upload chunk by chunk as it arrives,
+    appending each chunk to scored_csv_path and folding it into report (see
+    plan_report). A header-only upload writes no scored CSV, has an empty
+    health check and leaves report.total_records at 0.
+
+    Returns:
+        tuple: (health check dict, ReportAccumulator)
+    Raises:
+        UploadError: the upload is empty
+    """
+    header_line, blocks = split_header(upload)
+    if not header_line.strip():
+        raise UploadError("The uploaded CSV file is empty")
+    header = read_header(io.BytesIO(header_line))
+
+    source = io.BufferedReader(BlockStream(blocks), UPLOAD_BLOCK_BYTES)
+    hc, report, count = fold_batches(iter_scored_chunks(source, chunksize, passthrough, header=header),
+                                     scored_csv_path, report=report)
+    return (hc.result() if count else {}), report
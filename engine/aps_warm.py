@@ -0,0 +1,79 @@
+# aps_warm.py - Preload and warm the engine before the first real job
+"""
+APS Market Intelligence - Warm-up
+A fresh process pays on its first report for importing pandas, matplotlib
+and ReportLab, for matplotlib's font cache and for ReportLab's first
+document. preload() does the imports up front (including every page module,
+which the page registry would otherwise import on first use) and warm_up()
+renders a tiny in-memory report per feed type, so that cost is paid at
+boot - in a server's master before it forks its workers, or once per
+long-lived pool worker.
+"""
+import contextlib
+import importlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+# A few made-up records in the vendor layout, enough for every page and figure
+WARM_UP_RECORDS = {
+    'Owner Name': ['Owner 1', 'Owner 2', 'Owner 3', 'Owner 4'],
+    'Mail Address': ['1 Main St', '2 Oak Ave', '3 Pine Rd', '4 Elm St'],
+    'Property Address': ['1 Main St', '2 Oak Ave', '3 Pine Rd', '4 Elm St'],
+    'City': ['Raleigh', 'Durham', 'Cary', 'Raleigh'],
+    'State': ['NC', 'NC', 'NC', 'NC'],
+    'ZIP': ['27601', '27701', '27511', '27609'],
+    'EstValue': ['450000', '$325,000', '610000.00', '280000'],
+    'TotalLoanBal': ['210000', '240000', '150000', ''],
+    'LastLoanDate': ['03/15/2021', '2019-07-01', '11/30/2016', '01/05/2023'],
+    'Servicer_Name': ['Chase', 'Wells Fargo', 'Chase', 'PennyMac'],
+}
+
+def preload():
+    """Import the scoring and render stack, matplotlib (Agg) and every registered page module"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import aps_pipeline, aps_split, aps_charts  # noqa: F401
+    from aps_page_registry import PAGES
+    for module in sorted({spec.module for spec in PAGES.values() if spec.module}):
+        importlib.import_module(module)
+
+def warm_figure():
+    """Draw one tiny figure (builds matplotlib's font cache)"""
+    from matplotlib.figure import Figure
+    from aps_charts import figure_png
+    fig = Figure(figsize=(1, 1))
+    fig.add_subplot(111).set_title('APS')
+    figure_png(fig, dpi=10)
+
+def warm_up(feed_types=None):
+    """
+    Score WARM_UP_RECORDS (also through the JSON record scorer) and render one
+    PDF per feed type into a temporary directory (discarded). Charts are drawn in this process and no pool is
+    left running, so it is safe to fork afterwards.
+
+    Returns:
+        float: seconds taken
+    """
+    import pandas as pd
+    from aps_feed_config import FEED_TYPES
+    from aps_normalize import normalize_batch
+    from aps_healthcheck import health_check
+    from aps_aggregate import ReportAccumulator
+    from aps_render import render_pdf
+    from aps_records import score_records
+    from aps_charts import close_chart_pool, figure_cache
+
+    start = time.perf_counter()
+    frame = pd.DataFrame(WARM_UP_RECORDS)
+    score_records(frame.to_dict('records'))
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        batch = normalize_batch(frame)
+        health_check(batch)
+        report = ReportAccumulator.from_frame(batch)
+        for feed_type in feed_types or FEED_TYPES:
+            render_pdf(None, Path(tmp) / f"warm_up_{feed_type}.pdf", report=report, feed_type=feed_type)
+    close_chart_pool()
+    figure_cache.clear()
+    return time.perf_counter() - start
@@ -0,0 +1,163 @@
+# aps_watch.py - Watch-folder mode: process CSVs as they land in input/
+"""
+APS Market Intelligence - Folder Watcher
+Long-running replacement for drop-a-file-then-run-RUN_ME.bat. INPUT_DIR is
+polled for new or changed CSVs; a file is picked up once its size and mtime
+have held still for WATCH_SETTLE_SECONDS, so half-copied files are left
+alone. Ready files run through score -> health check -> render on a small
+pool of long-lived worker processes, which import pandas, matplotlib and
+ReportLab once and then stay warm. Each finished file is appended to
+OUTPUT_DIR/watch_log.jsonl.
+"""
+import argparse
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+from aps_config import INPUT_DIR, OUTPUT_DIR, WATCH_WORKERS, WATCH_POLL_SECONDS, WATCH_SETTLE_SECONDS
+from aps_batch import run_file
+from aps_warm import preload, warm_figure
+
+def warm_worker():
+    """Pool initializer: load the render stack and draw one tiny figure (font cache)"""
+    preload()
+    warm_figure()
+
+def is_candidate(path):
+    """CSV inputs only: no scored outputs, hidden files or editor lock files"""
+    name = path.name
+    return (path.suffix.lower() == '.csv' and not path.stem.endswith('_scored')
+            and not name.startswith(('.', '~$')))
+
+def file_signature(path):
+    stat = path.stat()
+    return (stat.st_size, stat.st_mtime_ns)
+
+class FolderWatcher:
+    """
+    Poll loop over root. State per file:
+    - settling: seen with this signature at this time, not yet still for long enough
+    - queued / running: waiting for or on a worker
+    - done: the signature last processed (a later change re-queues the file)
+    """
+
+    def __init__(self, root=INPUT_DIR, output_dir=OUTPUT_DIR, workers=WATCH_WORKERS,
+                 poll_seconds=WATCH_POLL_SECONDS, settle_seconds=WATCH_SETTLE_SECONDS,
+                 include_existing=False, log_path=None):
+        self.root = Path(root)
+        self.output_dir = Path(output_dir)
+        self.workers = max(1, workers)
+        self.poll_seconds = poll_seconds
+        self.settle_seconds = settle_seconds
+        self.log_path = Path(log_path or self.output_dir / "watch_log.jsonl")
+        self.settling = {}
+        self.queue = deque()
+        self.running = {}
+        self.done = {}
+        self._pool = None
+        if not include_existing:
+            # Files already present at start-up count as handled until they change
+            self.done = self.scan()
+
+    def scan(self):
+        """{path: signature} for every candidate CSV under root"""
+        found = {}
+        for path in self.root.rglob('*.csv'):
+            if not is_candidate(path):
+                continue
+            try:
+                found[path] = file_signature(path)
+            except OSError:
+                continue  # removed between listing and stat
+        return found
+
+    def pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker)
+            for _ in range(self.workers):
+                self._pool.submit(int)  # spawn every worker now so warm_worker runs before the first file
+        return self._pool
+
+    def poll(self, now=None):
+        """One scan: advance settling files, start queued work, collect finished work"""
+        now = now if now is not None else time.monotonic()
+        current = self.scan()
+        busy = {path: sig for path, sig in self.queue}
+        busy.update(self.running.values())
+
+        for path, sig in current.items():
+            if self.done.get(path) == sig or busy.get(path) == sig:
+                continue
+            seen = self.settling.get(path)
+            if seen is None or seen[0] != sig:
+                self.settling[path] = (sig, now)  # new or still being written
+            elif now - seen[1] >= self.settle_seconds:
+                del self.settling[path]
+                self.queue.append((path, sig))
+                print(f" → {path.name} queued")
+
+        for path in [p for p in self.settling if p not in current]:
+            del self.settling[path]
+
+        self._collect()
+        self._dispatch()
+
+    def _dispatch(self):
+        # Bounded: at most one file per worker in flight, the rest wait here
+        while self.queue and len(self.running) < self.workers:
+            path, sig = self.queue.popleft()
+            future = self.pool().submit(run_file, path, self.output_dir)
+            self.running[future] = (path, sig)
+
+    def _collect(self):
+        for future in [f for f in self.running if f.done()]:
+            path, sig = self.running.pop(future)
+            try:
+                entry = future.result()
+            except Exception as e:
+                entry = {"file": str(path), "status": "failed", "error": f"{type(e).__name__}: {e}"}
+                if isinstance(e, BrokenProcessPool):
+                    self._pool = None  # a worker died; start a fresh pool for what comes next
+            self.done[path] = sig
+            self._log(entry)
+
+    def _log(self, entry):
+        entry = {"finished": datetime.now().isoformat(), **entry}
+        if entry["status"] == "done":
+            print(f" ✓ {Path(entry['file']).name}: {entry['records']:,} records, "
+                  f"quality {entry['quality_score']} ({entry['timings']['total']:.1f}s)")
+        else:
+            print(f" ✗ {Path(entry['file']).name}: {entry['error']}")
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def run(self):
+        """Poll until interrupted (Ctrl+C), then let running files finish"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.pool()  # start and warm the workers before the first file arrives
+        try:
+            while True:
+                self.poll()
+                time.sleep(self.poll_seconds)
+        except KeyboardInterrupt:
+            print("\nStopping - waiting for running files to finish")
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+            self._collect()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process CSVs as they are dropped into the input folder")
+    parser.add_argument("--dir", default=str(INPUT_DIR), help="Folder to watch (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=WATCH_WORKERS,
+                        help="Files processed at once (default: %(default)s)")
+    parser.add_argument("--include-existing", action="store_true",
+                        help="Also process CSVs already in the folder at start-up")
+    args = parser.parse_args()
+
+    print("\n=== APS Watcher Starting ===")
+    print(f"Watching {args.dir} ({args.workers} workers) - press Ctrl+C to stop")
+    FolderWatcher(args.dir, workers=args.workers, include_existing=args.include_existing).run()
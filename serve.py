@@ -0,0 +1,97 @@
+# serve.py - Production server for the APS API (pre-forked, warm workers)
+"""
+Runs api.py's app under gunicorn instead of Flask's single-process dev server:
+
+    python serve.py [--bind 0.0.0.0:5000] [--workers 2] [--threads 4] [--no-warm-up]
+
+The master process imports the engine (pandas, matplotlib on Agg, ReportLab,
+every page module), renders a tiny report per feed type to warm font caches
+and first-use paths, builds the app, then forks the workers - so every worker
+starts warm and shares the imported code copy-on-write. Each worker serves
+--threads requests at once; jobs still run on its local process pool, and
+job records are shared through JOB_STATE_DIR so polls can land on any worker.
+
+gunicorn needs Linux/macOS. Without it (e.g. on Windows) the app is served
+by waitress, which has threads but no worker processes.
+"""
+import argparse
+import shutil
+import sys
+from pathlib import Path
+
+# Add engine directory to path
+ENGINE_DIR = Path(__file__).parent / "engine"
+sys.path.insert(0, str(ENGINE_DIR))
+
+from aps_config import SERVER_BIND, SERVER_WORKERS, SERVER_THREADS, SERVER_TIMEOUT, JOB_STATE_DIR
+from aps_warm import preload, warm_up
+
+def build_app(workers, warm=True):
+    """Preload and warm the engine, then create the app (in the master, before any fork)"""
+    preload()
+    if warm:
+        print(f"✓ Warm-up render: {warm_up():.2f}s")
+    import api
+    # Records left by a previous server describe jobs whose pools are gone
+    shutil.rmtree(JOB_STATE_DIR, ignore_errors=True)
+    return api.create_app(shared_jobs=workers > 1)
+
+def run_gunicorn(app, bind, workers, threads, timeout):
+    from gunicorn.app.base import BaseApplication
+
+    class APSServer(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', bind)
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('worker_class', 'gthread' if threads > 1 else 'sync')
+            # ?wait=1 requests block until the job is done
+            self.cfg.set('timeout', timeout)
+            self.cfg.set('preload_app', True)
+
+        def load(self):
+            return app
+
+    APSServer().run()
+
+def run_waitress(app, bind, threads):
+    from waitress import serve
+    serve(app, listen=bind, threads=threads)
+
+def main(bind=SERVER_BIND, workers=SERVER_WORKERS, threads=SERVER_THREADS, timeout=SERVER_TIMEOUT, warm=True):
+    try:
+        import gunicorn  # noqa: F401
+        server = 'gunicorn'
+    except ImportError:
+        try:
+            import waitress  # noqa: F401
+            server = 'waitress'
+        except ImportError:
+            sys.exit("serve.py needs gunicorn (Linux/macOS) or waitress (Windows): "
+                     "py -m pip install gunicorn  /  py -m pip install waitress")
+
+    if server == 'waitress' and workers > 1:
+        print(f"⚠ waitress has no worker processes; serving {threads} threads in one process")
+        workers = 1
+
+    print(f"\n=== APS API Server ({server}) ===")
+    app = build_app(workers, warm)
+    print(f"✓ Listening on {bind}: {workers} worker(s) x {threads} thread(s)")
+    if server == 'gunicorn':
+        run_gunicorn(app, bind, workers, threads, timeout)
+    else:
+        run_waitress(app, bind, threads)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Production server for the APS API")
+    parser.add_argument("--bind", default=SERVER_BIND, help="host:port (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS,
+                        help="Pre-forked worker processes (default: %(default)s)")
+    parser.add_argument("--threads", type=int, default=SERVER_THREADS,
+                        help="Request threads per worker (default: %(default)s)")
+    parser.add_argument("--timeout", type=int, default=SERVER_TIMEOUT,
+                        help="Seconds a request may run before its worker is restarted (default: %(default)s)")
+    parser.add_argument("--no-warm-up", dest="warm", action="store_false",
+                        help="Skip the warm-up render at boot")
+    args = parser.parse_args()
+    main(args.bind, max(1, args.workers), max(1, args.threads), args.timeout, args.warm)
@@ -0,0 +1,7 @@
+# conftest.py - Make the engine modules importable the way the pipeline imports them
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "engine"))
+sys.path.insert(0, str(ROOT))
@@ -0,0 +1,37 @@
+# test_api_score.py - /api/v1/score agrees with the scored CSV
+import json
+from pathlib import Path
+import pandas as pd
+import pytest
+import api
+from aps_pipeline import score_csv
+
+INPUT_DIR = Path(__file__).resolve().parent.parent / "input"
+FEEDS = [INPUT_DIR / "test.csv", *sorted((INPUT_DIR / "test_feeds").glob("*.csv"))]
+
+@pytest.fixture(scope='module')
+def client():
+    return api.create_app(job_workers=1).test_client()
+
+@pytest.mark.parametrize('csv_path', FEEDS, ids=lambda p: p.name)
+def test_scores_match_scored_csv(client, csv_path, tmp_path):
+    scored_csv_path = tmp_path / f"{csv_path.stem}_scored.csv"
+    score_csv(csv_path, scored_csv_path)
+    scored = pd.read_csv(scored_csv_path)
+    
+    records = pd.read_csv(csv_path, dtype=str, keep_default_na=False).to_dict('records')
+    response = client.post('/api/v1/score', json=records)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    
+    assert [line['row'] for line in lines] == list(range(len(scored)))
+    assert [line['aps_score'] for line in lines] == scored['APS_Score (v2.0)'].tolist()
+    assert [line['aps_tier'] for line in lines] == scored['APS_Tier'].tolist()
+    assert [line['cci'] for line in lines] == scored['CCI'].tolist()
+
+def test_ndjson_body_scores_like_json(client):
+    records = pd.read_csv(FEEDS[0], dtype=str, keep_default_na=False).head(20).to_dict('records')
+    ndjson = '\n'.join(json.dumps(record) for record in records) + '\n'
+    as_json = client.post('/api/v1/score', json=records).get_data()
+    as_ndjson = client.post('/api/v1/score', data=ndjson, content_type='application/x-ndjson').get_data()
+    assert as_ndjson == as_json
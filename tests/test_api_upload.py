@@ -0,0 +1,39 @@
+# test_api_upload.py - /api/v1/process answers repeat uploads from the result cache
+import hashlib
+from pathlib import Path
+import pytest
+import api
+
+CSV_PATH = Path(__file__).resolve().parent.parent / "input" / "test.csv"
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(api, 'OUTPUT_DIR', tmp_path)
+    monkeypatch.setattr(api, 'RESULT_CACHE_INDEX', tmp_path / 'index.json')
+    return api.create_app(job_workers=1).test_client()
+
+def upload(client, body, sha256=None):
+    query = f"&sha256={sha256}" if sha256 else ''
+    return client.post(f'/api/v1/process?wait=1&filename=test.csv{query}', data=body, content_type='text/csv')
+
+def test_repeat_upload_with_sha256_is_not_scored_again(client, tmp_path):
+    body = CSV_PATH.read_bytes()
+    sha256 = hashlib.sha256(body).hexdigest()
+    first = upload(client, body, sha256)
+    assert first.status_code == 200
+    assert first.get_json()['cached'] is False
+    scored_files = sorted(tmp_path.glob('*_scored.csv'))
+
+    # The body isn't read on a hit: even one that isn't a CSV gets the first run's files
+    repeat = upload(client, b'not read', sha256)
+    assert repeat.status_code == 200
+    assert repeat.get_json()['cached'] is True
+    assert repeat.get_json()['files'] == first.get_json()['files']
+    assert sorted(tmp_path.glob('*_scored.csv')) == scored_files
+
+def test_sha256_must_match_the_upload(client, tmp_path):
+    response = upload(client, CSV_PATH.read_bytes(), '0' * 64)
+    assert response.status_code == 400
+    assert "doesn't match" in response.get_json()['message']
+    assert not list(tmp_path.glob('*_scored.csv'))
+    assert upload(client, CSV_PATH.read_bytes(), 'abc').status_code == 400
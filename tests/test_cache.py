@@ -0,0 +1,73 @@
+# test_cache.py - Result cache shared by server workers
+import multiprocessing
+import os
+import pytest
+from aps_cache import ResultCache, fcntl
+
+ARTIFACT_BYTES = 100
+
+def put_entries(index_path, max_bytes, worker, count):
+    cache = ResultCache(index_path, max_bytes)
+    for i in range(count):
+        path = index_path.parent / f"w{worker}_{i}.csv"
+        path.write_bytes(b'x' * ARTIFACT_BYTES)
+        cache.put(f"w{worker}:{i}", {"file": path.name}, [path])
+
+def put_concurrently(index_path, max_bytes, workers=4, count=25):
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=put_entries, args=(index_path, max_bytes, w, count))
+                 for w in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+@pytest.mark.skipif(fcntl is None or not hasattr(os, 'fork'), reason="needs fcntl and fork")
+def test_concurrent_puts_keep_every_entry(tmp_path):
+    index_path = tmp_path / 'index.json'
+    put_concurrently(index_path, max_bytes=10**9)
+
+    assert ResultCache(index_path, 10**9).stats()['entries'] == 100
+
+@pytest.mark.skipif(fcntl is None or not hasattr(os, 'fork'), reason="needs fcntl and fork")
+def test_concurrent_puts_stay_within_max_bytes(tmp_path):
+    index_path = tmp_path / 'index.json'
+    max_bytes = 10 * ARTIFACT_BYTES
+    put_concurrently(index_path, max_bytes)
+
+    stats = ResultCache(index_path, max_bytes).stats()
+    on_disk = list(tmp_path.glob('*.csv'))
+    assert stats['bytes'] <= max_bytes
+    assert len(on_disk) == stats['entries']  # evicted artifacts are deleted, none leak
+
+def test_hits_leave_the_index_alone_and_count_for_eviction(tmp_path):
+    index_path = tmp_path / 'index.json'
+    cache = ResultCache(index_path, 2 * ARTIFACT_BYTES)
+    paths = {}
+    for key in 'abc':
+        paths[key] = tmp_path / f"{key}.csv"
+        paths[key].write_bytes(b'x' * ARTIFACT_BYTES)
+
+    cache.put('a', {"n": 1}, [paths['a']])
+    cache.put('b', {"n": 2}, [paths['b']])
+    before = index_path.stat().st_mtime_ns
+    assert cache.get('a') == {"n": 1}
+    assert index_path.stat().st_mtime_ns == before
+
+    cache.put('c', {"n": 3}, [paths['c']])  # evicts b, the least recently used
+    assert cache.get('b') is None
+    assert not paths['b'].exists()
+    assert cache.get('a') == {"n": 1}
+    assert cache.get('c') == {"n": 3}
+
+def test_entry_with_missing_artifacts_is_dropped(tmp_path):
+    index_path = tmp_path / 'index.json'
+    path = tmp_path / 'a.csv'
+    path.write_bytes(b'x')
+    cache = ResultCache(index_path, 10**9)
+    cache.put('a', {"n": 1}, [path])
+    path.unlink()
+
+    assert cache.get('a') is None
+    assert ResultCache(index_path, 10**9).stats()['entries'] == 0
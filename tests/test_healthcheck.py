@@ -0,0 +1,39 @@
+# test_healthcheck.py - Health check accumulators give the same result however the rows are chunked
+import numpy as np
+import pandas as pd
+import pytest
+from aps_healthcheck import DuplicateCheck
+
+class Batch:
+    def __init__(self, df):
+        self.df = df
+
+def addresses(n, seed=0):
+    rng = np.random.default_rng(seed)
+    ids = rng.integers(0, n // 2, n).astype(str)
+    return pd.DataFrame({'Property Address': [f'{i} Main St' for i in ids], 'ZIP': [i[-1] * 5 for i in ids]})
+
+def expected_duplicates(df):
+    counts = df.groupby(['Property Address', 'ZIP']).size()
+    return int(counts[counts > 1].sum())
+
+@pytest.mark.parametrize('chunk', [7, 64, 2000])
+def test_duplicates_chunked_and_merged(chunk):
+    df = addresses(2000)
+    expected = expected_duplicates(df)
+    
+    chunked = DuplicateCheck('9_Duplicate_Detection')
+    parts = [DuplicateCheck('9_Duplicate_Detection') for _ in range(3)]
+    for i, start in enumerate(range(0, len(df), chunk)):
+        chunked.update(Batch(df.iloc[start:start + chunk]))
+        parts[i % 3].update(Batch(df.iloc[start:start + chunk]))
+    merged = DuplicateCheck('9_Duplicate_Detection')
+    for part in parts:
+        merged.merge(part)
+    
+    assert chunked.result(len(df))['value'] == str(expected)
+    assert merged.result(len(df)) == chunked.result(len(df))
+    assert len(chunked.runs) == 1
+
+def test_no_rows():
+    assert DuplicateCheck('9_Duplicate_Detection').result(0)['value'] == '0'
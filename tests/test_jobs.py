@@ -0,0 +1,27 @@
+# test_jobs.py - Local job queue
+import os
+import signal
+import pytest
+from aps_jobs import JobQueue
+
+def crash(report_stage):
+    os.kill(os.getpid(), signal.SIGKILL)
+
+def worker_pid(report_stage):
+    report_stage('score')
+    return os.getpid()
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGKILL'), reason="needs SIGKILL")
+def test_dead_worker_fails_its_jobs_and_the_pool_recovers():
+    queue = JobQueue(max_workers=1, max_pending=4)
+    crashed = queue.submit(crash)
+    behind = queue.submit(worker_pid)  # queued on the same pool
+    
+    assert queue.wait(crashed)['status'] == 'failed'
+    assert queue.wait(behind)['status'] == 'failed'
+    assert queue.status(crashed)['status'] == 'failed'
+    
+    after = queue.wait(queue.submit(worker_pid))
+    assert after['status'] == 'done'
+    assert after['result'] != os.getpid()
+    assert queue.stats()['pending'] == 0
@@ -0,0 +1,43 @@
+# test_loan_dates.py - Loan date parsing (parse_loan_dates)
+import pandas as pd
+from aps_normalize import parse_loan_dates, normalize_batch, LoanDateParser
+
+def test_tz_aware_dates_keep_local_date():
+    dates = pd.Series(['2019-03-01T00:00:00+05:00', '2019-03-01T23:30:00-08:00', '2020-01-15T00:00:00Z'])
+    parsed = parse_loan_dates(dates)
+    assert parsed.dtype == 'datetime64[ns]'
+    assert parsed.tolist() == [pd.Timestamp('2019-03-01'), pd.Timestamp('2019-03-01 23:30'),
+                               pd.Timestamp('2020-01-15')]
+
+def test_mixed_naive_and_tz_aware_dates():
+    dates = pd.Series(['03/01/2019', '2019-03-01T00:00:00+05:00', None, '', 'garbage',
+                       '2020-05-06 10:00', '04/15/2018'])
+    parsed = parse_loan_dates(dates)
+    assert parsed.dtype == 'datetime64[ns]'
+    assert parsed.tolist()[:2] == [pd.Timestamp('2019-03-01')] * 2
+    assert parsed[2:5].isna().all()
+    assert parsed[5] == pd.Timestamp('2020-05-06 10:00')
+    assert parsed[6] == pd.Timestamp('2018-04-15')
+
+def test_normalize_batch_with_tz_aware_dates():
+    df = pd.DataFrame({
+        'EstValue': ['500000', '400000'],
+        'TotalLoanBal': ['100000', '100000'],
+        'LastLoanDate': ['2019-03-01T00:00:00+05:00', '03/01/2019'],
+    })
+    frame = normalize_batch(df).frame
+    assert frame['Loan_Age_Mo'].iloc[0] == frame['Loan_Age_Mo'].iloc[1] > 0
+
+def test_parser_carries_format_and_memo_across_chunks():
+    dates = pd.Series(['03/01/2019', '2019-04-02', '2019-03-01T00:00:00+05:00', 'unknown', '12/31/2020'] * 4)
+    whole = parse_loan_dates(dates)
+    parser = LoanDateParser()
+    chunked = pd.concat([parser(dates.iloc[i:i + 3]) for i in range(0, len(dates), 3)])
+    assert chunked.equals(whole)
+    assert parser.format == '%m/%d/%Y'
+    assert len(parser._memo[0]) == 5
+
+def test_other_formats_parsed_after_the_dominant_one():
+    dates = pd.Series(['03/01/2019', '04/15/2019', '05/20/2019', '2019-06-01', '07-04-2019', '2019/08/09'])
+    parsed = parse_loan_dates(dates)
+    assert parsed.dt.month.tolist() == [3, 4, 5, 6, 7, 8]
@@ -0,0 +1,120 @@
+# test_scoring_parity.py - Vectorized scoring kernel vs the original row-wise scoring
+import itertools
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from aps_normalize import calculate_aps_score, assign_tier, calculate_cci, normalize_batch
+
+# One "now" for both sides, so they can't straddle a month boundary
+TODAY = datetime.now()
+
+# ---- Reference: the row-wise implementation the kernel replaced ----
+
+def rowwise_months(loan_date):
+    if pd.isna(loan_date):
+        return 0
+    today = TODAY
+    years_diff = today.year - loan_date.year
+    months_diff = today.month - loan_date.month
+    total_months = years_diff * 12 + months_diff
+    return max(0, total_months)
+
+def rowwise_aps_score(row):
+    equity_pct = row['Equity %']
+    loan_age = row['Loan_Age_Mo']
+    ltv_pct = row['LTV %']
+    equity_score = equity_pct
+    if loan_age < 18:
+        age_score = (loan_age / 18) * 50
+    elif loan_age <= 36:
+        age_score = 100
+    elif loan_age <= 60:
+        age_score = 100 - ((loan_age - 36) / 24) * 30
+    else:
+        age_score = max(40, 70 - ((loan_age - 60) / 60) * 30)
+    ltv_score = 100 - ltv_pct
+    aps_score = (equity_score * 0.40 + age_score * 0.30 + ltv_score * 0.30)
+    return round(aps_score, 1)
+
+def rowwise_tier(row):
+    score = row['APS_Score (v2.0)']
+    ltv = row['LTV %']
+    equity_dollars = row['Equity_Dollars']
+    if score >= 80 and ltv <= 30 and equity_dollars >= 500000:
+        return 'Platinum'
+    elif score >= 65 and ltv <= 50 and equity_dollars >= 300000:
+        return 'Gold'
+    elif score >= 50 and ltv <= 65 and equity_dollars >= 200000:
+        return 'Silver'
+    else:
+        return 'Nurture'
+
+def rowwise_cci(row):
+    equity_pct = row['Equity %']
+    ltv_pct = row['LTV %']
+    loan_age = row['Loan_Age_Mo']
+    equity_component = min(40, (equity_pct / 100) * 40)
+    ltv_component = max(0, 35 - (ltv_pct / 100) * 35)
+    if loan_age >= 18:
+        age_component = min(25, 25 * (loan_age / 60))
+    else:
+        age_component = (loan_age / 18) * 15
+    cci = equity_component + ltv_component + age_component
+    return round(cci, 1)
+
+def rows(frame):
+    # The original applied over the vendor frame, whose text columns make each
+    # row object dtype: values are Python floats, so round() is Python's
+    return frame.astype(object)
+
+def rowwise_normalize(df):
+    value = pd.to_numeric(df['EstValue'].astype(str).str.replace('$', '').str.replace(',', '').str.strip(), errors='coerce')
+    balance = pd.to_numeric(df['TotalLoanBal'].astype(str).str.replace('$', '').str.replace(',', '').str.strip(), errors='coerce')
+    out = pd.DataFrame(index=df.index)
+    out['LTV %'] = ((balance / value) * 100).round(2).fillna(0).clip(0, 100)
+    out['Equity %'] = (100 - out['LTV %']).round(2)
+    out['Equity_Dollars'] = (value * (out['Equity %'] / 100)).round(0)
+    out['Loan_Age_Mo'] = pd.to_datetime(df['LastLoanDate'], errors='coerce').apply(rowwise_months)
+    out['APS_Score (v2.0)'] = rows(out).apply(rowwise_aps_score, axis=1)
+    out['APS_Tier'] = rows(out).apply(rowwise_tier, axis=1)
+    out['CCI'] = rows(out).apply(rowwise_cci, axis=1)
+    return out
+
+# ---- Parity ----
+
+LTVS = [0, 0.01, 12.35, 29.99, 30, 30.01, 49.99, 50, 50.01, 64.99, 65, 65.01, 80, 99.99, 100]
+LOAN_AGES = [0, 1, 17, 18, 19, 35, 36, 37, 59, 60, 61, 90, 119, 120, 121, 180, 360, 600]
+
+def assert_same(vectorized, reference):
+    assert np.array_equal(np.asarray(vectorized, dtype='float64'), np.asarray(reference, dtype='float64'))
+
+def test_score_and_cci_match_rowwise_on_grid():
+    grid = pd.DataFrame(list(itertools.product(LTVS, LOAN_AGES)), columns=['LTV %', 'Loan_Age_Mo'])
+    grid['Equity %'] = (100 - grid['LTV %']).round(2)
+    grid['APS_Score (v2.0)'] = calculate_aps_score(grid['Equity %'], grid['Loan_Age_Mo'], grid['LTV %'])
+    assert_same(grid['APS_Score (v2.0)'], rows(grid).apply(rowwise_aps_score, axis=1))
+    assert_same(calculate_cci(grid['Equity %'], grid['LTV %'], grid['Loan_Age_Mo']), rows(grid).apply(rowwise_cci, axis=1))
+
+def test_tiers_match_rowwise_at_boundaries():
+    scores = [0, 49.9, 50, 50.1, 64.9, 65, 65.1, 79.9, 80, 80.1, 100]
+    equity = [np.nan, 0, 199999, 200000, 299999, 300000, 499999, 500000, 2000000]
+    grid = pd.DataFrame(list(itertools.product(scores, LTVS, equity)),
+                        columns=['APS_Score (v2.0)', 'LTV %', 'Equity_Dollars'])
+    tiers = assign_tier(grid['APS_Score (v2.0)'], grid['LTV %'], grid['Equity_Dollars'])
+    assert list(tiers) == rows(grid).apply(rowwise_tier, axis=1).tolist()
+
+def test_normalize_batch_matches_rowwise():
+    values = ['500000', '$1,250,000', '0', '', 'n/a', '350000', '200000', '1000000', '425,000.50']
+    balances = ['100000', '$250,000', '50000', '10000', '5000', '700000', '', '0', '212500.25']
+    dates = ['2024-01-15', '2019-06-30', '', 'not a date', '2001-02-03', '2023-11-01', '1999-12-31',
+             '2021-07-04', '2016-03-09']
+    df = pd.DataFrame(list(itertools.product(values, balances, dates)),
+                      columns=['EstValue', 'TotalLoanBal', 'LastLoanDate'])
+    reference = rowwise_normalize(df)
+    frame = normalize_batch(df.copy(), today=TODAY).frame
+    for col in ['LTV %', 'Equity %', 'Loan_Age_Mo', 'APS_Score (v2.0)', 'CCI']:
+        assert_same(frame[col], reference[col])
+    assert frame['Equity_Dollars'].equals(reference['Equity_Dollars'])  # NaN where the value is missing
+    assert frame['APS_Tier'].astype(str).tolist() == reference['APS_Tier'].tolist()
+    # zero property value, missing values and LTV > 100 all covered
+    assert (frame['LTV %'] == 100).any() and (frame['LTV %'] == 0).any()
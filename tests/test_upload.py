@@ -0,0 +1,47 @@
+# test_upload.py - Streamed upload reading
+import io
+import threading
+import time
+from aps_upload import Prefetch, open_upload
+
+class StalledStream(io.RawIOBase):
+    """A request body whose client sends one block, then nothing until released"""
+
+    def __init__(self, first=b'a,b\n1,2\n'):
+        self.first = first
+        self.release = threading.Event()
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        if self.first:
+            block, self.first = self.first, b''
+            return block
+        self.release.wait()
+        return b''
+
+def test_close_does_not_wait_for_a_stalled_client():
+    stream = StalledStream()
+    prefetch = Prefetch(iter(lambda: stream.read(), b''))
+    prefetch.start()
+    blocks = iter(prefetch)
+    assert next(blocks) == b'a,b\n1,2\n'
+
+    started = time.monotonic()
+    prefetch.close()
+    assert time.monotonic() - started < 5
+    stream.release.set()
+
+def test_no_reader_thread_before_the_upload_is_scored():
+    stream = StalledStream(b'--x\r\nContent-Disposition: form-data; name="file"; filename="a.txt"\r\n\r\n'
+                           b'a,b\n1,2\n')
+    threads = threading.active_count()
+    upload = open_upload(stream, 'multipart/form-data', 'x')
+    assert upload.filename == 'a.txt'  # rejected by the caller before it is read
+    assert threading.active_count() == threads
+
+    started = time.monotonic()
+    upload.close()
+    assert time.monotonic() - started < 1
+    stream.release.set()